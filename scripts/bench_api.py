@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+"""
+Load-test and latency benchmark for the LexFabric API.
+
+Drives `src.api:app` in-process through httpx's ASGI transport (default) or
+a real uvicorn server on localhost (--uvicorn), sweeps concurrency levels
+and reports req/s with p50/p95/p99 latency per endpoint.
+
+Results are written to JSON and can be compared with a stored baseline; any
+regression beyond --tolerance makes the script exit non-zero.
+
+Dependencies:
+    pip install httpx
+
+Usage:
+    # in-process, default synthetic corpus
+    python scripts/bench_api.py --requests 200 --concurrency 1,8,32
+
+    # generated corpus, real server with 4 workers, compare with baseline
+    python scripts/bench_api.py --evidence-root /tmp/corpus --uvicorn --workers 4 \\
+        --baseline benchmarks/api_baseline.json
+
+    # record a new baseline
+    python scripts/bench_api.py --save-baseline benchmarks/api_baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional benchmark dependency
+    raise SystemExit("[ERROR] bench_api.py needs httpx: pip install httpx")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def discover_case_ids(root: Path) -> List[str]:
+    return [p.name for p in sorted(root.iterdir()) if p.is_dir()]
+
+
+def build_endpoints(case_ids: List[str], query: str) -> Dict[str, Tuple[str, str, Optional[List[Dict[str, Any]]]]]:
+    """name -> (method, path, list of JSON bodies cycled across requests)"""
+    return {
+        "GET /health": ("GET", "/health", None),
+        "POST /v1/agent/analyze": (
+            "POST",
+            "/v1/agent/analyze",
+            [{"case_id": cid} for cid in case_ids],
+        ),
+        "POST /v1/agent/analyze (query)": (
+            "POST",
+            "/v1/agent/analyze",
+            [{"case_id": cid, "query": query} for cid in case_ids],
+        ),
+    }
+
+
+async def run_level(
+    client: "httpx.AsyncClient",
+    method: str,
+    path: str,
+    bodies: Optional[List[Dict[str, Any]]],
+    n_requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    next_idx = 0
+
+    async def worker() -> None:
+        nonlocal next_idx, errors
+        while next_idx < n_requests:
+            i = next_idx
+            next_idx += 1
+            body = bodies[i % len(bodies)] if bodies else None
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, path, json=body)
+                ok = resp.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "rps": round(n_requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run_suite(
+    client: "httpx.AsyncClient",
+    endpoints: Dict[str, Tuple[str, str, Optional[List[Dict[str, Any]]]]],
+    levels: List[int],
+    n_requests: int,
+    warmup: int,
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, (method, path, bodies) in endpoints.items():
+        if warmup:
+            await run_level(client, method, path, bodies, warmup, 1)
+        results[name] = {}
+        for level in levels:
+            stats = await run_level(client, method, path, bodies, n_requests, level)
+            results[name][str(level)] = stats
+            print(
+                f"  {name:<34} c={level:<4} {stats['rps']:>9.1f} req/s  "
+                f"p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms "
+                f"p99={stats['p99_ms']:.2f}ms errors={stats['errors']}"
+            )
+    return results
+
+
+def start_uvicorn(port: int, workers: int, env: Dict[str, str]) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "uvicorn", "src.api:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("[ERROR] uvicorn did not become healthy within 30s")
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    regressions: List[str] = []
+    for name, levels in results.items():
+        for level, stats in levels.items():
+            base = baseline.get(name, {}).get(level)
+            if not base:
+                continue
+            if base["p95_ms"] and stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{name} c={level}: p95 {stats['p95_ms']:.2f}ms > baseline {base['p95_ms']:.2f}ms"
+                )
+            if base["rps"] and stats["rps"] < base["rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{name} c={level}: {stats['rps']:.1f} req/s < baseline {base['rps']:.1f} req/s"
+                )
+            if stats["errors"] > base.get("errors", 0):
+                regressions.append(
+                    f"{name} c={level}: {stats['errors']} error(s) vs {base.get('errors', 0)} in baseline"
+                )
+    return regressions
+
+
+async def amain(args: argparse.Namespace) -> Dict[str, Any]:
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    evidence_root = Path(args.evidence_root).resolve()
+    case_ids = args.cases.split(",") if args.cases else discover_case_ids(evidence_root)
+    if not case_ids:
+        raise SystemExit(f"[ERROR] No cases found under {evidence_root}")
+    endpoints = build_endpoints(case_ids, args.query)
+
+    env = os.environ.copy()
+    env["LEXFABRIC_EVIDENCE_ROOT"] = str(evidence_root)
+
+    mode = "uvicorn" if args.uvicorn else "asgi"
+    print(f"[INFO] mode={mode} cases={len(case_ids)} levels={levels} requests/level={args.requests}")
+
+    proc = None
+    try:
+        if args.uvicorn:
+            proc = start_uvicorn(args.port, args.workers, env)
+            limits = httpx.Limits(max_connections=max(levels))
+            client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60)
+        else:
+            os.environ["LEXFABRIC_EVIDENCE_ROOT"] = str(evidence_root)
+            sys.path.insert(0, str(REPO_ROOT))
+            from src.api import app
+
+            # Per-request INFO logs would dominate the in-process numbers.
+            logging.getLogger().setLevel(logging.WARNING)
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+
+        async with client:
+            results = await run_suite(client, endpoints, levels, args.requests, args.warmup)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    return {
+        "meta": {
+            "mode": mode,
+            "workers": args.workers if args.uvicorn else 1,
+            "evidence_root": str(evidence_root),
+            "cases": len(case_ids),
+            "requests_per_level": args.requests,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark LexFabric API throughput and tail latency.")
+    parser.add_argument("--evidence-root", default=str(REPO_ROOT / "capstone" / "synthetic_evidence"))
+    parser.add_argument("--cases", default=None, help="Comma-separated case_ids (default: all under the root).")
+    parser.add_argument("--query", default="What is the earliest event in this case?")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint per level.")
+    parser.add_argument("--warmup", type=int, default=10, help="Warm-up requests per endpoint.")
+    parser.add_argument("--uvicorn", action="store_true", help="Benchmark a real uvicorn server on localhost.")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="Also write the results as a new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(amain(args))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[OK] Results written to {args.output}")
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[OK] Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(report["results"], baseline.get("results", {}), args.tolerance)
+        if regressions:
+            print(f"\n[FAIL] {len(regressions)} regression(s) vs {args.baseline}:")
+            for line in regressions:
+                print(f"  - {line}")
+            raise SystemExit(1)
+        print(f"[OK] No regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
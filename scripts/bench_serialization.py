@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Encode-cost benchmark for /v1/agent/analyze responses.
+
+Builds an analyze result with N synthetic timeline events and times the
+ways the API can turn it into bytes:
+
+    response_model   what FastAPI does for a returned dict: validate into
+                     AnalysisResponse, dump to JSON-compatible data, then
+                     json.dumps (JSONResponse)
+    fast_stdlib      the fast path's single stdlib json.dumps pass
+    fast_orjson      the fast path with orjson (skipped if not installed)
+    fast_page        fast path with ?limit=<page-size>&fields=date
+
+Usage:
+    python scripts/bench_serialization.py                 # 10k and 100k events
+    python scripts/bench_serialization.py --events 1000,50000 --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from src.api import AnalysisResponse  # noqa: E402
+from src.capstone import serialization  # noqa: E402
+
+
+def make_result(n_events: int) -> Dict[str, Any]:
+    timeline = [
+        {
+            "date": f"{i:06d}_hearing_scheduled",
+            "event": f"CC0001 – hearing scheduled on 2024-03-{i % 28 + 1:02d} involving Dana Whitfield (claimant)",
+        }
+        for i in range(n_events)
+    ]
+    return {
+        "case_id": "CC0001",
+        "status": "success",
+        "steps": ["Resolved project root", "Found case directory", f"Timeline built from {n_events} event file(s)"],
+        "timeline": timeline,
+        "final_answer": None,
+        "spans": [
+            {"stage": "resolve_case", "items": None, "cache": None, "completed": True,
+             "start_ms": 0.0, "duration_ms": 0.1},
+            {"stage": "session", "items": None, "cache": "hit", "completed": True,
+             "start_ms": 0.1, "duration_ms": 0.2},
+        ],
+        "truncated": False,
+        "timeline_version": 1,
+        "timeline_total": n_events,
+        "next_cursor": None,
+    }
+
+
+def encoders(page_size: int) -> Dict[str, Callable[[Dict[str, Any]], bytes]]:
+    adapter = TypeAdapter(AnalysisResponse)
+
+    def response_model(result: Dict[str, Any]) -> bytes:
+        data = adapter.dump_python(adapter.validate_python(result), mode="json")
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None,
+                          separators=(",", ":")).encode("utf-8")
+
+    def fast_stdlib(result: Dict[str, Any]) -> bytes:
+        return json.dumps(result, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    def fast_page(result: Dict[str, Any]) -> bytes:
+        page, next_cursor = serialization.paginate_timeline(
+            result["timeline"], version=result["timeline_version"], fields=["date"], limit=page_size,
+        )
+        return serialization.dumps({**result, "timeline": page, "next_cursor": next_cursor})
+
+    out = {"response_model": response_model, "fast_stdlib": fast_stdlib}
+    if serialization.HAS_ORJSON:
+        out["fast_orjson"] = serialization.dumps
+    out[f"fast_page_{page_size}"] = fast_page
+    return out
+
+
+def bench(fn: Callable[[Dict[str, Any]], bytes], result: Dict[str, Any], repeat: int) -> Dict[str, float]:
+    timings: List[float] = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn(result))
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(timings), "median_ms": statistics.median(timings), "bytes": size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark analyze response encoding.")
+    parser.add_argument("--events", default="10000,100000", help="Comma-separated timeline sizes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per encoder and size.")
+    parser.add_argument("--page-size", type=int, default=500, help="Page size for the paged encoder.")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON.")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for n in [int(x) for x in args.events.split(",") if x.strip()]:
+        result = make_result(n)
+        results[str(n)] = {}
+        baseline = None
+        print(f"\n{n:,} events")
+        print(f"  {'encoder':<18} {'min ms':>10} {'median ms':>10} {'bytes':>12} {'speedup':>8}")
+        for name, fn in encoders(args.page_size).items():
+            row = bench(fn, result, args.repeat)
+            baseline = baseline or row["min_ms"]
+            results[str(n)][name] = row
+            print(
+                f"  {name:<18} {row['min_ms']:>10.1f} {row['median_ms']:>10.1f} "
+                f"{row['bytes']:>12,} {baseline / row['min_ms']:>7.1f}x"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n[OK] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
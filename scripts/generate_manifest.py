@@ -4,17 +4,41 @@
 Generate a simple evidence manifest for synthetic cases.
 
 - Scans capstone/synthetic_evidence/<CASE_ID> directories
-- Emits capstone/synthetic_evidence/manifest.json
+- Emits capstone/synthetic_evidence/manifest.jsonl (one record per line),
+  or the legacy manifest.json array with --format json
+
+Incremental mode (the default when a previous manifest exists) keeps a
+sidecar `<manifest>.dirs.json` with each directory's mtime. Directories whose
+mtime is unchanged reuse their previous records without listing or stat-ing
+any files; only changed directories are re-listed, and their files are
+stat-ed in parallel on a thread pool. Cases are processed one at a time and
+records are streamed to disk, so memory stays bounded by the largest case.
+
+Note that editing a file in place does not change its directory's mtime;
+use --full to force a complete rescan.
 """
 
+import argparse
 import json
+import os
+import sys
+import textwrap
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
+from itertools import groupby
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+# One manifest reader, shared with the server's index builder.
+from capstone.manifest_index import iter_manifest_records as iter_manifest  # noqa: E402
 
 EVIDENCE_ROOT = Path("capstone/synthetic_evidence")
 MANIFEST_PATH = EVIDENCE_ROOT / "manifest.json"
+JSONL_MANIFEST_PATH = EVIDENCE_ROOT / "manifest.jsonl"
 
 
 @dataclass
@@ -26,6 +50,7 @@ class ManifestRecord:
     title: str
     ext: str
     size_bytes: int
+    mtime_ns: int = 0
 
 
 def discover_case_dirs(root: Path) -> List[Path]:
@@ -34,47 +59,198 @@ def discover_case_dirs(root: Path) -> List[Path]:
     return [p for p in sorted(root.iterdir()) if p.is_dir()]
 
 
-def build_manifest() -> List[ManifestRecord]:
-    records: List[ManifestRecord] = []
+def state_path_for(manifest_path: Path) -> Path:
+    return manifest_path.with_name(manifest_path.name + ".dirs.json")
+
+
+def _make_record(case_id: str, root: Path, case_dir: Path, path: str, st: os.stat_result) -> Dict[str, Any]:
+    file_path = Path(path)
+    rel_case = file_path.relative_to(case_dir)
+    rel_global = file_path.relative_to(root)
+
+    parts = rel_case.parts
+    if len(parts) > 1:
+        category = parts[0]
+    else:
+        category = "uncategorized"
+
+    return asdict(ManifestRecord(
+        id=f"{case_id}/{rel_case.as_posix()}",
+        case_id=case_id,
+        relative_path=rel_global.as_posix(),
+        category=category,
+        title=file_path.stem,
+        ext=file_path.suffix.lower(),
+        size_bytes=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+    ))
+
+
+class _PreviousManifest:
+    """Cursor over a previous manifest whose records are grouped by case_id."""
+
+    def __init__(self, path: Optional[Path]):
+        self._groups = None
+        self._current: Optional[Tuple[str, List[Dict[str, Any]]]] = None
+        if path is not None and path.exists():
+            self._groups = groupby(iter_manifest(path), key=lambda r: r["case_id"])
+            self._advance()
+
+    def _advance(self) -> None:
+        try:
+            case_id, group = next(self._groups)
+            self._current = (case_id, list(group))
+        except StopIteration:
+            self._current = None
+
+    def records_for(self, case_id: str) -> List[Dict[str, Any]]:
+        # Both sides are sorted by case_id, so skip anything before it.
+        while self._current is not None and self._current[0] < case_id:
+            self._advance()
+        if self._current is not None and self._current[0] == case_id:
+            records = self._current[1]
+            self._advance()
+            return records
+        return []
+
 
-    for case_dir in discover_case_dirs(EVIDENCE_ROOT):
-        case_id = case_dir.name
+def scan_case(
+    root: Path,
+    case_dir: Path,
+    prev_records: List[Dict[str, Any]],
+    prev_dirs: Dict[str, int],
+    new_dirs: Dict[str, int],
+    pool: ThreadPoolExecutor,
+    counters: Dict[str, int],
+) -> List[Dict[str, Any]]:
+    case_id = case_dir.name
 
-        for file_path in case_dir.rglob("*"):
-            if not file_path.is_file():
-                continue
+    prev_by_dir: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for rec in prev_records:
+        prev_by_dir[rec["relative_path"].rpartition("/")[0]].append(rec)
 
-            rel_case = file_path.relative_to(case_dir)
-            rel_global = file_path.relative_to(EVIDENCE_ROOT)
+    prev_children: Dict[str, List[str]] = defaultdict(list)
+    for rel_dir in prev_dirs:
+        if rel_dir.startswith(case_id + "/") or rel_dir == case_id:
+            prev_children[rel_dir.rpartition("/")[0]].append(rel_dir)
 
-            parts = rel_case.parts
-            if len(parts) > 1:
-                category = parts[0]
-            else:
-                category = "uncategorized"
+    out: List[Dict[str, Any]] = []
+    to_stat: List[str] = []
+    stack = [case_dir]
 
-            record = ManifestRecord(
-                id=f"{case_id}/{rel_case}",
-                case_id=case_id,
-                relative_path=str(rel_global),
-                category=category,
-                title=file_path.stem,
-                ext=file_path.suffix.lower(),
-                size_bytes=file_path.stat().st_size,
-            )
-            records.append(record)
+    while stack:
+        d = stack.pop()
+        rel_dir = d.relative_to(root).as_posix()
+        mtime = d.stat().st_mtime_ns
+        new_dirs[rel_dir] = mtime
 
-    return records
+        if prev_dirs.get(rel_dir) == mtime:
+            counters["dirs_reused"] += 1
+            out.extend(prev_by_dir.get(rel_dir, []))
+            stack.extend(root / child for child in prev_children.get(rel_dir, []))
+            continue
+
+        counters["dirs_scanned"] += 1
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_dir():
+                    stack.append(Path(entry.path))
+                elif entry.is_file():
+                    to_stat.append(entry.path)
+
+    for path, st in zip(to_stat, pool.map(os.stat, to_stat)):
+        out.append(_make_record(case_id, root, case_dir, path, st))
+    counters["files_stated"] += len(to_stat)
+
+    out.sort(key=lambda r: r["id"])
+    return out
+
+
+def iter_manifest_records(
+    root: Path = EVIDENCE_ROOT,
+    previous: Optional[Path] = None,
+    prev_dirs: Optional[Dict[str, int]] = None,
+    new_dirs: Optional[Dict[str, int]] = None,
+    workers: int = 8,
+    counters: Optional[Dict[str, int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield manifest records case by case, reusing `previous` where directory
+    mtimes in `prev_dirs` still match.
+    """
+    prev = _PreviousManifest(previous if prev_dirs else None)
+    prev_dirs = prev_dirs or {}
+    new_dirs = new_dirs if new_dirs is not None else {}
+    counters = counters if counters is not None else defaultdict(int)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for case_dir in discover_case_dirs(root):
+            prev_records = prev.records_for(case_dir.name)
+            yield from scan_case(root, case_dir, prev_records, prev_dirs, new_dirs, pool, counters)
+
+
+def build_manifest() -> List[ManifestRecord]:
+    return [ManifestRecord(**rec) for rec in iter_manifest_records(EVIDENCE_ROOT)]
+
+
+def write_manifest(records: Iterator[Dict[str, Any]], path: Path, fmt: str = "jsonl") -> int:
+    """Stream `records` to `path` atomically; returns the record count."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}")
+    n = 0
+    with tmp_path.open("w", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+                n += 1
+        else:
+            # Same layout as json.dumps(list, indent=2), one record at a time.
+            f.write("[")
+            for rec in records:
+                f.write(",\n" if n else "\n")
+                f.write(textwrap.indent(json.dumps(rec, indent=2), "  "))
+                n += 1
+            f.write("\n]" if n else "]")
+    os.replace(tmp_path, path)
+    return n
 
 
 def main() -> None:
-    records = build_manifest()
-    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    parser = argparse.ArgumentParser(description="Generate the evidence manifest.")
+    parser.add_argument("--root", type=Path, default=EVIDENCE_ROOT, help="Evidence root directory.")
+    parser.add_argument("--output", type=Path, default=None, help="Manifest path (default depends on --format).")
+    parser.add_argument("--format", choices=["jsonl", "json"], default="jsonl")
+    parser.add_argument("--full", action="store_true", help="Ignore the previous manifest and rescan everything.")
+    parser.add_argument("--workers", type=int, default=8, help="Threads used to stat files.")
+    args = parser.parse_args()
+
+    default_name = JSONL_MANIFEST_PATH.name if args.format == "jsonl" else MANIFEST_PATH.name
+    output = args.output or (args.root / default_name)
+    state_path = state_path_for(output)
+
+    prev_dirs: Dict[str, int] = {}
+    if not args.full and output.exists() and state_path.exists():
+        prev_dirs = json.loads(state_path.read_text(encoding="utf-8"))
 
-    data = [asdict(r) for r in records]
-    MANIFEST_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    new_dirs: Dict[str, int] = {}
+    counters: Dict[str, int] = defaultdict(int)
+    records = iter_manifest_records(
+        args.root,
+        previous=output,
+        prev_dirs=prev_dirs,
+        new_dirs=new_dirs,
+        workers=args.workers,
+        counters=counters,
+    )
+    n = write_manifest(records, output, args.format)
+    state_path.write_text(json.dumps(new_dirs, sort_keys=True), encoding="utf-8")
 
-    print(f"[OK] Wrote manifest with {len(records)} records to {MANIFEST_PATH}")
+    print(
+        f"[OK] Wrote manifest with {n} records to {output} "
+        f"({counters['dirs_scanned']} dir(s) scanned, {counters['dirs_reused']} reused, "
+        f"{counters['files_stated']} file(s) stat-ed)"
+    )
 
 
 if __name__ == "__main__":
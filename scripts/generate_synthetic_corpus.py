@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+Generate a deterministic synthetic evidence corpus for benchmarking.
+
+Creates N cases laid out like capstone/synthetic_evidence:
+
+    <out>/<CASE_ID>/
+      note.txt                         (uncategorized)
+      timeline/NNNN_<slug>.txt         (one event per file, flat, as the API expects)
+      emails/<sub dirs...>/*.eml       (RFC 822 headers + body, with reply threads)
+      filings/<sub dirs...>/*.txt      (dated filings mentioning parties)
+      logs/<sub dirs...>/*.log         (ISO-timestamped operational log lines)
+
+File counts, directory depth, category mix, file sizes (log-normal), dates
+and entities are all drawn from a seeded RNG, so the same arguments always
+produce byte-identical files. A matching manifest.jsonl is written with
+scripts/generate_manifest.py.
+
+Usage:
+    python scripts/generate_synthetic_corpus.py --out /tmp/corpus --cases 200 \\
+        --files-per-case 250 --depth 2 --mix emails=4,filings=1,timeline=2,logs=3
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from generate_manifest import iter_manifest_records, state_path_for, write_manifest  # noqa: E402
+
+CASE_PREFIXES = ["CC", "RH"]
+CATEGORY_EXT = {"emails": ".eml", "filings": ".txt", "timeline": ".txt", "logs": ".log"}
+
+PEOPLE = [
+    ("Dana Whitfield", "claimant"),
+    ("Marcus Lee", "operations manager"),
+    ("Priya Raman", "counsel"),
+    ("Tom Okafor", "HR director"),
+    ("Elena Petrova", "compliance officer"),
+    ("Sam Castillo", "site supervisor"),
+    ("Grace Kim", "respondent"),
+    ("Victor Hale", "auditor"),
+]
+ORGS = ["Northwind Logistics", "Acme Fabrication", "Harbor Health", "Bluefield Energy"]
+EVENT_KINDS = [
+    "incident occurs", "complaint submitted", "investigation opened", "initial filing",
+    "witness interview", "policy revised", "settlement offer", "hearing scheduled",
+    "document request", "escalation to management", "response deadline", "final ruling",
+]
+SUBJECTS = [
+    "Follow-up on incident", "Schedule change", "Request for documents", "Shift coverage",
+    "Complaint acknowledgement", "Meeting notes", "Policy update", "Settlement discussion",
+]
+FILLER = (
+    "the parties reviewed the record and noted the outstanding items for follow up "
+    "including staffing shift reports access logs and the prior written warnings"
+).split()
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix: List[Tuple[str, float]] = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in CATEGORY_EXT:
+            raise SystemExit(f"[ERROR] Unknown category '{name}' (choose from {', '.join(CATEGORY_EXT)})")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def filler_text(rng: random.Random, n_bytes: int) -> str:
+    words: List[str] = []
+    size = 0
+    while size < n_bytes:
+        w = rng.choice(FILLER)
+        words.append(w)
+        size += len(w) + 1
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "\n".join(lines)
+
+
+def sub_dir(rng: random.Random, depth: int) -> Path:
+    parts = [f"{chr(ord('a') + rng.randrange(4))}{rng.randrange(10)}" for _ in range(rng.randint(0, depth))]
+    return Path(*parts) if parts else Path()
+
+
+def fmt_email_date(dt: datetime) -> str:
+    return dt.strftime("%a, %d %b %Y %H:%M:%S +0000")
+
+
+class CaseWriter:
+    def __init__(self, case_id: str, case_dir: Path, rng: random.Random, args: argparse.Namespace):
+        self.case_id = case_id
+        self.case_dir = case_dir
+        self.rng = rng
+        self.args = args
+        self.start = datetime.fromisoformat(args.start_date) + timedelta(days=rng.randrange(args.span_days))
+        self.org = rng.choice(ORGS)
+        self.cast = rng.sample(PEOPLE, k=min(4, len(PEOPLE)))
+        self.message_ids: List[str] = []
+        self.counters: Dict[str, int] = {}
+
+    def _date(self) -> datetime:
+        offset = self.rng.uniform(0, self.args.case_span_days * 86400)
+        return self.start + timedelta(seconds=int(offset))
+
+    def _size(self) -> int:
+        return max(64, int(self.rng.lognormvariate(0, self.args.size_sigma) * self.args.size_mean))
+
+    def _next(self, category: str) -> int:
+        self.counters[category] = self.counters.get(category, 0) + 1
+        return self.counters[category]
+
+    def write(self, category: str) -> int:
+        n = self._next(category)
+        when = self._date()
+        actor, role = self.rng.choice(self.cast)
+        size = self._size()
+
+        if category == "timeline":
+            kind = self.rng.choice(EVENT_KINDS)
+            path = self.case_dir / "timeline" / f"{n:04d}_{kind.replace(' ', '_')}.txt"
+            body = f"{self.case_id} – {kind} on {when.date().isoformat()} involving {actor} ({role}) at {self.org}"
+        elif category == "emails":
+            path = self.case_dir / "emails" / sub_dir(self.rng, self.args.depth) / f"msg_{n:05d}.eml"
+            to_actor, _ = self.rng.choice(self.cast)
+            msg_id = f"<{self.case_id.lower()}.{n}@{self.org.split()[0].lower()}.example>"
+            headers = [
+                f"Date: {fmt_email_date(when)}",
+                f"From: {actor} <{actor.split()[0].lower()}@{self.org.split()[0].lower()}.example>",
+                f"To: {to_actor} <{to_actor.split()[0].lower()}@{self.org.split()[0].lower()}.example>",
+                f"Subject: {self.rng.choice(SUBJECTS)}",
+                f"Message-ID: {msg_id}",
+            ]
+            if self.message_ids and self.rng.random() < 0.4:
+                headers.append(f"In-Reply-To: {self.rng.choice(self.message_ids)}")
+            self.message_ids.append(msg_id)
+            body = "\n".join(headers) + f"\n\nHi {to_actor.split()[0]},\n\n" + filler_text(self.rng, size)
+        elif category == "filings":
+            path = self.case_dir / "filings" / sub_dir(self.rng, self.args.depth) / f"filing_{n:04d}.txt"
+            body = (
+                f"Case {self.case_id} – Filed: {when.date().isoformat()}\n"
+                f"Party: {actor} ({role}), {self.org}\n\n" + filler_text(self.rng, size)
+            )
+        else:  # logs
+            path = self.case_dir / "logs" / sub_dir(self.rng, self.args.depth) / f"ops_{n:04d}.log"
+            lines = []
+            written = 0
+            t = when
+            while written < size:
+                t += timedelta(seconds=self.rng.randrange(1, 3600))
+                line = f"{t.isoformat()} INFO {actor} ({role}) {self.rng.choice(FILLER)} {self.rng.choice(FILLER)}"
+                lines.append(line)
+                written += len(line) + 1
+            body = "\n".join(lines)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = (body + "\n").encode("utf-8")
+        path.write_bytes(data)
+        return len(data)
+
+
+def generate(args: argparse.Namespace) -> Tuple[int, int]:
+    out: Path = args.out
+    if out.exists() and any(out.iterdir()):
+        raise SystemExit(f"[ERROR] Output directory is not empty: {out}")
+    out.mkdir(parents=True, exist_ok=True)
+
+    mix = parse_mix(args.mix)
+    names = [m[0] for m in mix]
+    weights = [m[1] for m in mix]
+
+    total_files = 0
+    total_bytes = 0
+    for i in range(args.cases):
+        case_id = f"{CASE_PREFIXES[i % len(CASE_PREFIXES)]}{i:04d}"
+        case_dir = out / case_id
+        rng = random.Random(f"{args.seed}:{case_id}")
+        writer = CaseWriter(case_id, case_dir, rng, args)
+
+        case_dir.mkdir()
+        (case_dir / "note.txt").write_text("sample evidence file\n", encoding="utf-8")
+        total_files += 1
+
+        n_files = max(1, int(rng.gauss(args.files_per_case, args.files_per_case * 0.2)))
+        categories = rng.choices(names, weights=weights, k=n_files)
+        if "timeline" in names and "timeline" not in categories:
+            categories[0] = "timeline"  # the API needs a timeline/ folder per case
+        for category in categories:
+            total_bytes += writer.write(category)
+            total_files += 1
+
+    return total_files, total_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic evidence corpus.")
+    parser.add_argument("--out", type=Path, required=True, help="Output root (must be empty or missing).")
+    parser.add_argument("--cases", type=int, default=10)
+    parser.add_argument("--files-per-case", type=int, default=50, help="Mean files per case (±20%%).")
+    parser.add_argument("--depth", type=int, default=2, help="Max sub-directory depth inside a category.")
+    parser.add_argument("--mix", default="emails=4,filings=1,timeline=2,logs=3",
+                        help="Category weights, e.g. emails=4,filings=1,timeline=2,logs=3")
+    parser.add_argument("--size-mean", type=int, default=2048, help="Median file size in bytes.")
+    parser.add_argument("--size-sigma", type=float, default=1.0, help="Log-normal sigma of file sizes.")
+    parser.add_argument("--start-date", default="2019-01-01")
+    parser.add_argument("--span-days", type=int, default=1460, help="Spread of case start dates.")
+    parser.add_argument("--case-span-days", type=int, default=180, help="Duration of each case.")
+    parser.add_argument("--seed", default="lexfabric")
+    parser.add_argument("--no-manifest", action="store_true", help="Skip writing manifest.jsonl.")
+    args = parser.parse_args()
+
+    files, n_bytes = generate(args)
+    print(f"[OK] Generated {args.cases} case(s), {files} file(s), {n_bytes / 1e6:.1f} MB under {args.out}")
+
+    if not args.no_manifest:
+        manifest = args.out / "manifest.jsonl"
+        dirs: Dict[str, int] = {}
+        n = write_manifest(iter_manifest_records(args.out, new_dirs=dirs), manifest)
+        state_path_for(manifest).write_text(json.dumps(dirs, sort_keys=True), encoding="utf-8")
+        print(f"[OK] Wrote manifest with {n} records to {manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Ingest case mailboxes (emails/**/*.eml) into the versioned timelines.
+
+Only message headers are read; large batches are parsed on a process pool
+(--workers, default: CPU count). The result is the same timeline state the
+API builds on first use, so running this ahead of time keeps the first
+analyze request for a large mailbox fast. Re-runs only re-parse messages
+whose size or mtime changed.
+
+Usage:
+    python scripts/ingest_emails.py --root capstone/synthetic_evidence
+    python scripts/ingest_emails.py --root /tmp/corpus --cases CC0000,RH0001 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest .eml headers into case timelines.")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT / "capstone" / "synthetic_evidence")
+    parser.add_argument("--cases", default=None, help="Comma-separated case_ids (default: all).")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count).")
+    args = parser.parse_args()
+
+    if not args.root.exists():
+        raise SystemExit(f"[ERROR] Evidence root does not exist: {args.root}")
+    os.environ["LEXFABRIC_EVIDENCE_ROOT"] = str(args.root)
+    if args.workers is not None:
+        os.environ["LEXFABRIC_EMAIL_WORKERS"] = str(args.workers)
+
+    from capstone import demo
+    from capstone.instrumentation import INSTRUMENTATION
+
+    INSTRUMENTATION.enabled = True
+    wanted = set(args.cases.split(",")) if args.cases else None
+    cases = [c for c in demo.discover_cases(args.root) if wanted is None or c.case_id in wanted]
+
+    start = time.perf_counter()
+    for case in cases:
+        before = INSTRUMENTATION.snapshot()["counters"].get("timeline.emails_parsed", 0)
+        case_start = time.perf_counter()
+        try:
+            timeline = demo._refresh_case_timeline(case.case_id)
+        except FileNotFoundError as e:
+            print(f"  {case.case_id:<12} skipped: {e}")
+            continue
+        parsed = INSTRUMENTATION.snapshot()["counters"].get("timeline.emails_parsed", 0) - before
+        print(
+            f"  {case.case_id:<12} events={len(timeline.events()):<7} emails_parsed={parsed:<7} "
+            f"version={timeline.version:<4} {time.perf_counter() - case_start:.2f}s"
+        )
+    elapsed = time.perf_counter() - start
+
+    total = INSTRUMENTATION.snapshot()["counters"].get("timeline.emails_parsed", 0)
+    rate = total / elapsed if elapsed else 0.0
+    print(f"[OK] Parsed {total} message header(s) across {len(cases)} case(s) in {elapsed:.2f}s ({rate:,.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
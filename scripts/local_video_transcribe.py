@@ -4,43 +4,280 @@ Transcribe a local video file and produce:
   - transcript.txt
   - transcript.srt
 
+Audio is streamed from ffmpeg (mono 16 kHz PCM on a pipe, never written to
+disk) and cut into fixed-length, overlapping chunks. Chunks are transcribed
+in parallel on a process pool, their segments are shifted by the chunk's
+offset and stitched at the middle of each overlap, and both files are
+written as soon as the next chunk in order finishes. Memory stays at a few
+chunks regardless of the recording's length.
+
+The transcriber is pluggable (--transcriber):
+    whisper             openai-whisper, --model-size (default)
+    stub                offline stand-in that reports non-silent windows
+    package.module:fn   fn(model_size=..., language=...) returning an object
+                        with .transcribe(audio) -> [{"start", "end", "text"}]
+                        (audio: float32 NumPy array at 16 kHz; times in seconds)
+
+Every worker process loads its own model, so --workers multiplies model memory.
+
 Dependencies:
     pip install openai-whisper
     ffmpeg must be installed (e.g., brew install ffmpeg)
 
 Usage:
     python local_video_transcribe.py --input /path/to/video.mp4 --out-dir transcripts
+    python local_video_transcribe.py --input deposition.mp4 --workers 4 --chunk-seconds 30 --overlap-seconds 2
+    python local_video_transcribe.py --input deposition.mp4 --transcriber stub
 """
 
 import argparse
+import importlib
+import multiprocessing
+import os
 import subprocess
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
-import whisper
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # s16le
+READ_BLOCK_BYTES = 64 * 1024
+
+Segment = Dict[str, Any]
+# (index, offset in seconds, s16le PCM, is_last)
+Chunk = Tuple[int, float, bytes, bool]
+
 
+# --------------------------------------------------------------------------- #
+# Audio
+# --------------------------------------------------------------------------- #
 
-def extract_audio(input_file: Path, output_audio: Path):
+def stream_audio(input_file: Path, block_bytes: int = READ_BLOCK_BYTES) -> Iterator[bytes]:
     """
-    Extract audio track from video using ffmpeg.
-    Output is mono 16kHz WAV for Whisper.
+    Decode the audio track with ffmpeg and yield it as mono 16 kHz s16le
+    PCM blocks read from its stdout.
     """
     cmd = [
         "ffmpeg",
-        "-y",
+        "-nostdin",
+        "-loglevel", "error",
         "-i", str(input_file),
         "-vn",
+        "-f", "s16le",
         "-acodec", "pcm_s16le",
-        "-ar", "16000",
+        "-ar", str(SAMPLE_RATE),
         "-ac", "1",
-        str(output_audio),
+        "pipe:1",
     ]
-    subprocess.run(cmd, check=True)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        while True:
+            block = proc.stdout.read(block_bytes)
+            if not block:
+                break
+            yield block
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+def iter_chunks(blocks: Iterable[bytes], chunk_seconds: float, overlap_seconds: float) -> Iterator[Chunk]:
+    """
+    Cut a PCM stream into `chunk_seconds` chunks starting every
+    `chunk_seconds - overlap_seconds`. The final chunk may be shorter and is
+    flagged `is_last`; a chunk is only emitted if it holds audio not already
+    covered by the previous one.
+    """
+    chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    step_bytes = chunk_bytes - int(overlap_seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    if step_bytes <= 0:
+        raise ValueError("overlap must be shorter than the chunk")
+
+    buf = bytearray()
+    consumed = 0  # bytes dropped from the front of buf
+    index = 0
+    for block in blocks:
+        buf += block
+        # Strictly longer: more audio follows, so this chunk is not the last.
+        while len(buf) > chunk_bytes:
+            yield index, consumed / BYTES_PER_SAMPLE / SAMPLE_RATE, bytes(buf[:chunk_bytes]), False
+            del buf[:step_bytes]
+            consumed += step_bytes
+            index += 1
+    if buf:
+        yield index, consumed / BYTES_PER_SAMPLE / SAMPLE_RATE, bytes(buf), True
+
+
+def pcm_to_float(pcm: bytes) -> np.ndarray:
+    """s16le PCM -> float32 samples in [-1, 1), the input Whisper expects."""
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+# --------------------------------------------------------------------------- #
+# Transcribers
+# --------------------------------------------------------------------------- #
+
+class WhisperTranscriber:
+    """openai-whisper model; imported only when selected."""
+
+    def __init__(self, model_size: str = "small", language: str = "en", threads: Optional[int] = None):
+        import whisper
+
+        if threads:
+            import torch
+
+            torch.set_num_threads(threads)
+        self.language = language
+        self.model = whisper.load_model(model_size)
+
+    def transcribe(self, audio: np.ndarray) -> List[Segment]:
+        result = self.model.transcribe(audio, language=self.language)
+        return [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in result.get("segments", [])]
+
+
+class StubTranscriber:
+    """
+    Offline stand-in for tests and dry runs: one segment per `window`
+    seconds of non-silent audio, labelled with its level.
+    """
+
+    def __init__(self, model_size: str = "", language: str = "en", threads: Optional[int] = None,
+                 window: float = 2.0, threshold: float = 0.01):
+        self.window = window
+        self.threshold = threshold
+
+    def transcribe(self, audio: np.ndarray) -> List[Segment]:
+        size = int(self.window * SAMPLE_RATE)
+        segments = []
+        for start in range(0, len(audio), size):
+            frame = audio[start:start + size]
+            rms = float(np.sqrt(np.mean(frame * frame))) if len(frame) else 0.0
+            if rms >= self.threshold:
+                segments.append({
+                    "start": start / SAMPLE_RATE,
+                    "end": (start + len(frame)) / SAMPLE_RATE,
+                    "text": f"[speech, level {rms:.2f}]",
+                })
+        return segments
+
+
+TRANSCRIBERS = {"whisper": WhisperTranscriber, "stub": StubTranscriber}
+
+
+def load_transcriber(spec: str, model_size: str, language: str, threads: Optional[int] = None):
+    """Build the transcriber named by `spec` (see module docstring)."""
+    if spec in TRANSCRIBERS:
+        return TRANSCRIBERS[spec](model_size=model_size, language=language, threads=threads)
+    module_name, sep, attr = spec.partition(":")
+    if not sep:
+        raise SystemExit(f"Unknown transcriber {spec!r}; use whisper, stub or package.module:factory")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory(model_size=model_size, language=language)
+
+
+_TRANSCRIBER = None
+
+
+def _init_worker(spec: str, model_size: str, language: str, threads: Optional[int]) -> None:
+    """Pool initializer: load the model once per worker process."""
+    global _TRANSCRIBER
+    _TRANSCRIBER = load_transcriber(spec, model_size, language, threads)
+
+
+def _transcribe_chunk(chunk: Chunk) -> Tuple[int, float, bool, List[Segment]]:
+    index, offset, pcm, is_last = chunk
+    return index, offset, is_last, _TRANSCRIBER.transcribe(pcm_to_float(pcm))
+
+
+# --------------------------------------------------------------------------- #
+# Pipeline
+# --------------------------------------------------------------------------- #
+
+def transcribe_chunks(
+    chunks: Iterable[Chunk],
+    spec: str,
+    model_size: str,
+    language: str,
+    workers: int,
+) -> Iterator[Tuple[int, float, bool, List[Segment]]]:
+    """
+    Transcribe `chunks` on `workers` processes, yielding results in chunk
+    order as soon as each one and all before it are done. At most two
+    chunks per worker are in flight, which bounds memory.
+    """
+    if workers <= 1:
+        _init_worker(spec, model_size, language, None)
+        for chunk in chunks:
+            yield _transcribe_chunk(chunk)
+        return
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn: model libraries do not survive fork reliably.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(spec, model_size, language, threads),
+    ) as pool:
+        chunk_iter = iter(chunks)
+        in_flight: List[Future] = []
+        done_by_index: Dict[int, Tuple[int, float, bool, List[Segment]]] = {}
+        next_index = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < 2 * workers:
+                chunk = next(chunk_iter, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                in_flight.append(pool.submit(_transcribe_chunk, chunk))
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                in_flight.remove(fut)
+                result = fut.result()
+                done_by_index[result[0]] = result
+            while next_index in done_by_index:
+                yield done_by_index.pop(next_index)
+                next_index += 1
+
+
+def stitch(
+    results: Iterable[Tuple[int, float, bool, List[Segment]]],
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> Iterator[Segment]:
+    """
+    Shift each chunk's segments by its offset and keep, from every overlap,
+    the segments whose midpoint falls on this chunk's side of the overlap's
+    middle, so each stretch of audio is transcribed once.
+    """
+    step = chunk_seconds - overlap_seconds
+    last_end = 0.0
+    for index, offset, is_last, segments in results:
+        lo = offset + overlap_seconds / 2 if index > 0 else float("-inf")
+        hi = offset + step + overlap_seconds / 2 if not is_last else float("inf")
+        for seg in segments:
+            start, end = offset + seg["start"], offset + seg["end"]
+            if not lo <= (start + end) / 2 < hi:
+                continue
+            # Keep cues ordered and non-overlapping across chunk seams.
+            start = max(start, last_end)
+            end = max(end, start)
+            last_end = end
+            yield {"start": round(start, 3), "end": round(end, 3), "text": seg["text"]}
 
 
 def srt_timestamp(seconds: float) -> str:
     """
     Convert seconds → SRT timestamp: HH:MM:SS,mmm
     """
-    millis = int(seconds * 1000)
+    millis = int(round(seconds * 1000))
     hrs = millis // 3_600_000
     millis %= 3_600_000
     mins = millis // 60_000
@@ -50,16 +287,21 @@ def srt_timestamp(seconds: float) -> str:
     return f"{hrs:02d}:{mins:02d}:{secs:02d},{millis:03d}"
 
 
-def write_srt(segments, output_path: Path):
+def format_srt_entry(index: int, seg: Segment) -> str:
+    return f"{index}\n{srt_timestamp(seg['start'])} --> {srt_timestamp(seg['end'])}\n{seg['text'].strip()}\n\n"
+
+
+def write_srt(segments: Iterable[Segment], output_path: Path) -> int:
     """
-    Write Whisper segments → .srt
+    Write segments → .srt as they arrive (`segments` may be a generator),
+    flushing each cue; returns the number of cues written.
     """
+    count = 0
     with output_path.open("w", encoding="utf-8") as f:
-        for i, seg in enumerate(segments, 1):
-            start = srt_timestamp(seg["start"])
-            end = srt_timestamp(seg["end"])
-            text = seg["text"].strip()
-            f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
+        for count, seg in enumerate(segments, 1):
+            f.write(format_srt_entry(count, seg))
+            f.flush()
+    return count
 
 
 def main():
@@ -81,37 +323,59 @@ def main():
         default="small",
         help="Whisper model size (tiny, base, small, medium, large).",
     )
+    parser.add_argument("--language", default="en", help="Spoken language passed to the model.")
+    parser.add_argument(
+        "--transcriber",
+        default="whisper",
+        help="whisper, stub, or package.module:factory (see module docstring).",
+    )
+    parser.add_argument("--chunk-seconds", type=float, default=30.0, help="Chunk length (Whisper's window is 30 s).")
+    parser.add_argument("--overlap-seconds", type=float, default=2.0, help="Overlap between consecutive chunks.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Transcriber processes, each with its own model (default: 1, in-process).",
+    )
     args = parser.parse_args()
 
     input_path = Path(args.input).expanduser().resolve()
     if not input_path.exists():
         raise SystemExit(f"Input file not found: {input_path}")
+    if not 0 <= args.overlap_seconds < args.chunk_seconds:
+        raise SystemExit("--overlap-seconds must be at least 0 and shorter than --chunk-seconds")
 
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    audio_path = out_dir / "audio.wav"
     txt_path = out_dir / "transcript.txt"
     srt_path = out_dir / "transcript.srt"
 
-    print(f"[INFO] Extracting audio from: {input_path}")
-    extract_audio(input_path, audio_path)
+    print(f"[INFO] Streaming audio from: {input_path}")
+    print(
+        f"[INFO] Transcribing with {args.transcriber} ({args.model_size}) on {args.workers} worker(s), "
+        f"{args.chunk_seconds:g}s chunks, {args.overlap_seconds:g}s overlap..."
+    )
+    chunks = iter_chunks(stream_audio(input_path), args.chunk_seconds, args.overlap_seconds)
+    results = transcribe_chunks(chunks, args.transcriber, args.model_size, args.language, args.workers)
 
-    print(f"[INFO] Loading Whisper model: {args.model_size}")
-    model = whisper.load_model(args.model_size)
+    with txt_path.open("w", encoding="utf-8") as txt:
+        def segments() -> Iterator[Segment]:
+            # transcript.txt grows alongside transcript.srt.
+            separator = ""
+            for seg in stitch(results, args.chunk_seconds, args.overlap_seconds):
+                text = seg["text"].strip()
+                if text:
+                    txt.write(separator + text)
+                    txt.flush()
+                    separator = " "
+                yield seg
 
-    print("[INFO] Transcribing...")
-    result = model.transcribe(str(audio_path), language="en")
+        cues = write_srt(segments(), srt_path)
+        txt.write("\n")
 
-    # Save text transcript
-    full_text = result.get("text", "").strip()
-    txt_path.write_text(full_text + "\n", encoding="utf-8")
     print(f"[OK] Transcript saved → {txt_path}")
-
-    # Save SRT
-    segments = result.get("segments", [])
-    write_srt(segments, srt_path)
-    print(f"[OK] Subtitles saved → {srt_path}")
+    print(f"[OK] Subtitles saved → {srt_path} ({cues} cue(s))")
 
     print("\nDone.")
 
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Local stub model server for offline testing and benchmarking of ModelClient.
+
+Speaks the JSON protocol used by `capstone.agents.model_client.HTTPBackend`:
+
+    POST /v1/generate  {"model": "...", "prompts": [...]}  ->  {"outputs": [...]}
+
+Usage:
+    # serve on localhost:8765 with 20 ms per batch and 5% transient failures
+    python scripts/stub_model_server.py --latency-ms 20 --fail-rate 0.05
+
+    # start the server in-process and benchmark the full client path
+    python scripts/stub_model_server.py --bench 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from capstone.agents.model_client import HTTPBackend, ModelClient, stub_output  # noqa: E402
+
+
+def make_handler(latency: float, fail_rate: float):
+    class StubModelHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/v1/generate":
+                self.send_error(404)
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            prompts = payload.get("prompts") or []
+
+            if latency:
+                time.sleep(latency)
+            if fail_rate and random.random() < fail_rate:
+                self.send_error(503, "stub failure")
+                return
+
+            body = json.dumps({"outputs": [stub_output(p) for p in prompts]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # keep benchmarks quiet
+            pass
+
+    return StubModelHandler
+
+
+def start_server(host: str, port: int, latency: float, fail_rate: float) -> Tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer((host, port), make_handler(latency, fail_rate))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://{host}:{server.server_address[1]}/v1/generate"
+    return server, url
+
+
+async def run_bench(url: str, n: int, distinct: int, batch_size: int, concurrency: int) -> None:
+    client = ModelClient(
+        HTTPBackend(url),
+        max_batch_size=batch_size,
+        max_concurrency=concurrency,
+    )
+    prompts = [f"Summarize evidence record #{i % distinct}" for i in range(n)]
+
+    start = time.perf_counter()
+    await client.complete_many(prompts)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await client.complete_many(prompts)
+    warm = time.perf_counter() - start
+
+    print(f"[OK] {n} prompts ({distinct} distinct), batch={batch_size}, concurrency={concurrency}")
+    print(f"     cold: {cold:.3f}s ({n / cold:,.0f} prompts/s)")
+    print(f"     warm: {warm:.3f}s ({n / warm:,.0f} prompts/s, cache only)")
+    print(f"     stats: {client.stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub model server for offline ModelClient tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latency per batch request.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--bench", type=int, default=0, help="Run a client benchmark with N prompts and exit.")
+    parser.add_argument("--distinct", type=int, default=500, help="Distinct prompts in the benchmark.")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    port = 0 if args.bench else args.port
+    server, url = start_server(args.host, port, args.latency_ms / 1000.0, args.fail_rate)
+
+    if args.bench:
+        try:
+            asyncio.run(run_bench(url, args.bench, args.distinct, args.batch_size, args.concurrency))
+        finally:
+            server.shutdown()
+        return
+
+    print(f"[INFO] Stub model server listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
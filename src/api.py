@@ -1,10 +1,39 @@
+from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
 from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, status
+import asyncio
+import hmac
+import os
+from contextlib import asynccontextmanager
+import threading
+import time
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import logging
 
-from .capstone.demo import analyze_case
+from .capstone.admission import AdmissionController, ClientRateLimiter, Overloaded, QueueTimeout, retry_after_header
+from .capstone.compression import CompressionMiddleware
+from .capstone.deadline import CancellableDeadline, Deadline, remaining
+from .capstone.demo import (
+    HAS_EVENT_STORE,
+    HAS_ROUTER,
+    _get_access_log,
+    _get_job_store,
+    analyze_case,
+    case_exists,
+    case_last_modified,
+    query_events,
+    timeline_diff,
+    truncated_result,
+)
+from .capstone.instrumentation import INSTRUMENTATION, PROFILER, STAGE_METRICS, ProfileCapture, SpanRecorder
+from .capstone.jobs import FINAL_STATUSES, JobNotFound, JobRunner
+from .capstone.serialization import CursorError, StaleCursorError, dumps, paginate_timeline, parse_fields
+from .capstone.warmup import Warmup
 
 
 
@@ -12,11 +41,62 @@ from .capstone.demo import analyze_case
 logging.basicConfig(level=logging.INFO)
 
 
+# --- Startup / shutdown ---
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the background job runner and warm this process up (see
+    capstone/warmup.py). Warm-up runs in the background: /health/live answers
+    at once, /health/ready only once warm-up has finished.
+    """
+    global _JOB_RUNNER
+    _get_job_runner()
+    warmup_task = None
+    if WARMUP_ENABLED:
+        WARMUP.access_log = _get_access_log()
+        warmup_task = asyncio.create_task(_warm_up())
+    else:
+        WARMUP.mark_ready()
+    try:
+        yield
+    finally:
+        if warmup_task is not None and not warmup_task.done():
+            logging.warning("[API] Shutting down before warm-up finished")
+        with _JOB_RUNNER_LOCK:
+            runner, _JOB_RUNNER = _JOB_RUNNER, None
+        if runner is not None:
+            await run_in_threadpool(runner.stop, 5.0)
+        await run_in_threadpool(_get_access_log().flush)
+
+
+async def _warm_up() -> None:
+    logging.info(f"[API] Warm-up started (hot cases: {WARMUP.hot_cases})")
+    await run_in_threadpool(WARMUP.run)
+    summary = WARMUP.status()
+    timings = ", ".join(f"{s['stage']}={s['duration_ms']:.0f}ms" for s in summary["steps"])
+    if WARMUP.ready:
+        logging.info(
+            f"[API] Warm-up finished ({timings}); preloaded {len(summary['preloaded'])} case(s)"
+            + (f", skipped {len(summary['skipped'])}" if summary["skipped"] else "")
+        )
+    else:
+        logging.error(f"[API] Warm-up failed: {summary['error']}")
+
+
 # --- FastAPI app ---
 app = FastAPI(
     title="LexFabric Reasoning Engine",
     description="Multi-agent microservice for evidence analysis and timeline reconstruction.",
     version="1.0.0",
+    lifespan=lifespan,
+)
+
+# Negotiated gzip/zstd for responses of at least LEXFABRIC_COMPRESSION_MIN_BYTES
+# (see capstone/compression.py).
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("LEXFABRIC_COMPRESSION_MIN_BYTES", "1024") or 1024),
 )
 
 
@@ -28,11 +108,63 @@ class AnalysisRequest(BaseModel):
         None,
         description="Optional natural language question to pass into the Q&A stage."
     )
+    deadline_ms: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Time budget in milliseconds; stages still running when it expires are "
+                    "abandoned and a partial, truncated response is returned.",
+    )
 
 
-class TimelineEvent(BaseModel):
-    date: str
+class CaseEvent(BaseModel):
+    case_id: str
+    category: str = Field(..., description="Event kind, e.g. 'incident_occurs'.")
+    title: str
+    date: Optional[str] = Field(None, description="ISO date parsed from the event, if any.")
     event: str
+    id: str
+
+
+class EventQueryResponse(BaseModel):
+    total: int = Field(..., description="Events matching the filters.")
+    offset: int
+    limit: int
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, or null on the last page.")
+    events: List[CaseEvent]
+
+
+class InstrumentationSettings(BaseModel):
+    counters_enabled: Optional[bool] = Field(None, description="Toggle hot-path counters and timers.")
+    profile_header_enabled: Optional[bool] = Field(
+        None,
+        description="Honour the X-LexFabric-Profile request header.",
+    )
+    profile_sample_rate: Optional[float] = Field(
+        None, ge=0.0, le=1.0,
+        description="Fraction of analyze requests profiled at random.",
+    )
+    reset_counters: bool = Field(False, description="Clear accumulated counters and timers.")
+
+
+class TimelineEvent(BaseModel):
+    date: Optional[str] = Field(None, description="Always set; omitted only when not listed in `fields=`.")
+    event: Optional[str] = Field(None, description="Always set; omitted only when not listed in `fields=`.")
+    message_id: Optional[str] = Field(None, description="Email events only: the message's Message-ID.")
+    in_reply_to: Optional[str] = Field(None, description="Email events only: Message-ID this replies to.")
+    thread_id: Optional[str] = Field(
+        None,
+        description="Email events only: root Message-ID of the thread (References, else In-Reply-To).",
+    )
+
+
+class StageSpan(BaseModel):
+    stage: str
+    start_ms: float = Field(..., description="Offset from the start of the request.")
+    duration_ms: float
+    items: Optional[int] = Field(None, description="Records/events handled by the stage.")
+    cache: Optional[str] = Field(None, description="'hit' or 'miss' for cached stages.")
+    completed: bool = Field(True, description="False if the stage was cut short by the deadline.")
+    depth: int = Field(0, description="Nesting level; 0 for top-level stages.")
 
 
 class AnalysisResponse(BaseModel):
@@ -41,6 +173,175 @@ class AnalysisResponse(BaseModel):
     steps: List[str]
     timeline: List[TimelineEvent]
     final_answer: Optional[str] = None
+    spans: List[StageSpan] = []
+    truncated: bool = Field(False, description="True when the deadline expired before every stage finished.")
+    timeline_version: Optional[int] = Field(
+        None,
+        description="Version of the returned timeline; poll /v1/cases/{case_id}/timeline?since=<version> for changes.",
+    )
+    timeline_total: int = Field(0, description="Events in the full timeline, across all pages.")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as `cursor=` to fetch the next timeline page; null on the last page.",
+    )
+
+
+class VersionedTimelineEvent(TimelineEvent):
+    id: str = Field(..., description="Stable event id (the source file it came from).")
+    date: str
+    event: str
+
+
+class TimelineDiffResponse(BaseModel):
+    case_id: str
+    from_version: Optional[int]
+    to_version: int
+    reset: bool = Field(..., description="True when `added` is the full timeline rather than a delta.")
+    added: List[VersionedTimelineEvent]
+    removed: List[str] = Field(..., description="Ids of events to drop; apply before `added`.")
+
+
+class JobRequest(AnalysisRequest):
+    priority: int = Field(0, ge=-100, le=100, description="Higher runs first; equal priorities run oldest first.")
+
+
+class JobStatus(BaseModel):
+    id: str
+    case_id: str
+    query: Optional[str] = None
+    deadline_ms: Optional[int] = None
+    priority: int
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled.")
+    created_at: float = Field(..., description="Epoch seconds.")
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancel_requested: bool = False
+    error: Optional[str] = None
+    deduplicated: bool = Field(False, description="True when an identical queued or running job was returned.")
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for data that is already in its response-model shape.
+
+    Returning it from an endpoint skips FastAPI's response-model validation
+    and jsonable_encoder pass; the content is encoded once (orjson when
+    installed). Only use it for trusted, pre-shaped output.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+PROFILE_HEADER = "X-LexFabric-Profile"
+
+# /v1/admin/* requires `Authorization: Bearer <LEXFABRIC_ADMIN_TOKEN>`. Without a
+# token configured, only loopback clients may use it.
+ADMIN_TOKEN = os.environ.get("LEXFABRIC_ADMIN_TOKEN", "")
+LOOPBACK_HOSTS = frozenset({"127.0.0.1", "::1", "localhost"})
+
+# Server-side deadline applied when a request does not set deadline_ms (0 = none).
+DEFAULT_DEADLINE_MS = int(os.environ.get("LEXFABRIC_DEFAULT_DEADLINE_MS", "0") or 0)
+
+# Cache-Control for GET /v1/cases/{case_id}/analysis. The default lets shared
+# caches store results but revalidate (If-Modified-Since) before every reuse.
+CACHE_CONTROL = os.environ.get("LEXFABRIC_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+
+# Per-client rate limits are keyed on the peer address. This header is only a
+# label for logs: clients choose it, so keying buckets on it would let a caller
+# mint a fresh bucket per request.
+CLIENT_ID_HEADER = "X-Client-Id"
+
+# Per-worker admission control for /v1/agent/analyze (see capstone/admission.py).
+ADMISSION = AdmissionController(
+    max_in_flight=int(os.environ.get("LEXFABRIC_MAX_IN_FLIGHT", "8") or 8),
+    max_queue=int(os.environ.get("LEXFABRIC_MAX_QUEUE", "64") or 0),
+    queue_timeout=float(os.environ.get("LEXFABRIC_QUEUE_TIMEOUT_S", "5") or 0),
+)
+RATE_LIMITER = ClientRateLimiter(
+    rate=float(os.environ.get("LEXFABRIC_RATE_LIMIT_RPS", "0") or 0),
+    burst=float(os.environ.get("LEXFABRIC_RATE_LIMIT_BURST", "10") or 10),
+)
+
+
+# Background job threads in this process; 0 only queues jobs for other processes.
+JOB_WORKERS = int(os.environ.get("LEXFABRIC_JOB_WORKERS", "2") or 0)
+
+# Seconds between status checks of GET /v1/jobs/{job_id}/events.
+JOB_EVENTS_INTERVAL_S = 0.5
+
+_JOB_RUNNER: Optional[JobRunner] = None
+_JOB_RUNNER_LOCK = threading.Lock()
+
+
+# Startup warm-up (LEXFABRIC_WARMUP=0 disables it): preload the
+# LEXFABRIC_WARMUP_CASES most requested cases, for at most
+# LEXFABRIC_WARMUP_TIMEOUT_S seconds.
+WARMUP_ENABLED = os.environ.get("LEXFABRIC_WARMUP", "1").lower() not in ("0", "false", "no")
+WARMUP = Warmup(
+    hot_cases=int(os.environ.get("LEXFABRIC_WARMUP_CASES", "8") or 0),
+    timeout=float(os.environ.get("LEXFABRIC_WARMUP_TIMEOUT_S", "60") or 0) or None,
+)
+
+
+def _run_job(job: dict, deadline: CancellableDeadline) -> dict:
+    """JobRunner callback: one analyze_case run, shaped like AnalysisResponse."""
+    spans = SpanRecorder()
+    result_data = analyze_case(job["case_id"], job["query"], spans=spans, deadline=deadline)
+    _get_access_log().record(job["case_id"])
+    STAGE_METRICS.observe_spans(spans.spans)
+    if HAS_ROUTER:
+        result_data = AnalysisResponse.model_validate(result_data).model_dump(mode="json")
+    return result_data
+
+
+def _get_job_runner() -> JobRunner:
+    """Job runner for this process, started by the lifespan hook (or on first use)."""
+    global _JOB_RUNNER
+    with _JOB_RUNNER_LOCK:
+        if _JOB_RUNNER is None:
+            _JOB_RUNNER = JobRunner(_get_job_store(), _run_job, workers=JOB_WORKERS)
+            if JOB_WORKERS > 0:
+                _JOB_RUNNER.start()
+        return _JOB_RUNNER
+
+
+def _client_key(request: Request) -> str:
+    """Rate-limit bucket for `request`: the peer address, never a client-supplied header."""
+    return request.client.host if request.client else "anonymous"
+
+
+def _client_label(request: Request) -> str:
+    client_id = request.headers.get(CLIENT_ID_HEADER)
+    key = _client_key(request)
+    return f"{key} ({client_id})" if client_id else key
+
+
+def _check_rate_limit(request: Request) -> None:
+    """Raise 429 with Retry-After when the caller's bucket is empty."""
+    wait = RATE_LIMITER.check(_client_key(request))
+    if wait:
+        logging.warning(f"[API] Rate limit exceeded for client={_client_label(request)}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded for this client.",
+            headers={"Retry-After": retry_after_header(wait)},
+        )
+
+
+def _analyze_profiled(
+    payload: AnalysisRequest,
+    requested: bool,
+    spans: SpanRecorder,
+    deadline: Optional[Deadline],
+):
+    """Run analyze_case in the calling (worker) thread, profiling it if asked."""
+    with PROFILER.maybe_profile(requested=requested, label=payload.case_id) as capture:
+        result_data = analyze_case(payload.case_id, payload.query, spans=spans, deadline=deadline)
+    _get_access_log().record(payload.case_id)
+    return result_data, capture
 
 
 # --- Endpoints ---
@@ -55,27 +356,208 @@ async def root():
 
 
 @app.get("/health", status_code=200)
+@app.get("/health/live", status_code=200)
 async def health_check():
-    """Simple liveness probe."""
-    return {"status": "operational", "service": "LexFabric"}
+    """
+    Liveness probe: the process is up, whether or not it has warmed up.
+    Also reports this worker's admission queue so a load balancer can route
+    around saturated workers.
+    """
+    return {
+        "status": "operational",
+        "service": "LexFabric",
+        "ready": WARMUP.ready,
+        "admission": ADMISSION.stats(),
+        "rate_limit": RATE_LIMITER.stats(),
+    }
+
+
+@app.get("/health/ready", status_code=200)
+async def readiness_check():
+    """
+    Readiness probe: 200 once start-up warm-up has finished, 503 while it is
+    still running (or if it failed), so cold workers are not sent traffic.
+    """
+    return JSONResponse(
+        {"status": WARMUP.state, "warmup": WARMUP.status()},
+        status_code=status.HTTP_200_OK if WARMUP.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
 
 
 @app.post("/v1/agent/analyze", response_model=AnalysisResponse, status_code=200)
-async def run_analysis(payload: AnalysisRequest):
+async def run_analysis(
+    payload: AnalysisRequest,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated timeline event fields to return, e.g. 'date'."),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum timeline events per response."),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page."),
+):
     """
     Triggers the LexFabric multi-agent (or fallback) analysis pipeline:
 
     1. Locates synthetic evidence for {case_id}
     2. Reconstructs a deterministic timeline
     3. Optionally processes {query} to compute an answer
+
+    Send `X-LexFabric-Profile: 1` (when enabled) to capture a cProfile dump
+    for this request; its file name is returned in the same header.
+
+    With `deadline_ms`, work still running when the deadline expires is
+    cancelled and the finished stages are returned with `truncated: true`.
+
+    Requests over the per-client rate limit get 429, and requests that cannot
+    be admitted (queue full, or no free slot within the queue timeout) get
+    503; both carry a `Retry-After` header. A request whose `deadline_ms`
+    runs out while it waits for a slot gets the usual truncated response.
+
+    The timeline can be paged with `limit` and `cursor` and trimmed with
+    `fields`; a cursor from an older timeline version gets 409.
+
+    Responses are `no-cache`; use GET /v1/cases/{case_id}/analysis for
+    conditional, cacheable requests with `Last-Modified`.
+    """
+    return await _analyze_request(payload, request, fields, limit, cursor, cacheable=False)
+
+
+@app.get("/v1/cases/{case_id}/analysis", response_model=AnalysisResponse, status_code=200)
+async def get_analysis(
+    case_id: str,
+    request: Request,
+    query: Optional[str] = Query(None, description="Optional question for the Q&A stage."),
+    deadline_ms: Optional[int] = Query(None, gt=0, description="Time budget in milliseconds."),
+    fields: Optional[str] = Query(None, description="Comma-separated timeline event fields to return, e.g. 'date'."),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum timeline events per response."),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page."),
+):
     """
+    Cacheable form of POST /v1/agent/analyze with the same response.
+
+    Send `If-Modified-Since` with an earlier `Last-Modified` value to get
+    304 Not Modified, without running the pipeline, while the case is
+    unchanged. Partial (truncated) results are never cached.
+    """
+    payload = AnalysisRequest(case_id=case_id, query=query, deadline_ms=deadline_ms)
+    return await _analyze_request(payload, request, fields, limit, cursor, cacheable=True)
+
+
+def _cache_headers(last_modified: Optional[int], cacheable: bool, truncated: bool = False) -> dict:
+    if truncated:
+        cache_control = "no-store"
+    elif cacheable:
+        cache_control = CACHE_CONTROL
+    else:
+        cache_control = "no-cache"
+    headers = {"Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+def _not_modified(request: Request, last_modified: int) -> bool:
+    since = request.headers.get("If-Modified-Since")
+    if not since:
+        return False
+    try:
+        return last_modified <= int(parsedate_to_datetime(since).timestamp())
+    except (TypeError, ValueError):
+        return False
+
+
+def _page_timeline(
+    result_data: dict,
+    timeline_fields: Optional[List[str]],
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> None:
+    """Replace the result's timeline with the requested page, in place."""
+    timeline = result_data["timeline"]
+    result_data["timeline_total"] = len(timeline)
+    result_data["timeline"], result_data["next_cursor"] = paginate_timeline(
+        timeline,
+        version=result_data.get("timeline_version"),
+        fields=timeline_fields,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+async def _analyze_request(
+    payload: AnalysisRequest,
+    request: Request,
+    fields: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    cacheable: bool,
+) -> Response:
+    try:
+        timeline_fields = parse_fields(fields)
+    except CursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    _check_rate_limit(request)
+
     try:
         logging.info(f"[API] Analysis request received for case_id={payload.case_id}")
 
-        result_data = analyze_case(payload.case_id, payload.query)
+        # Only the cacheable GET needs it. Taken before the pipeline runs, so
+        # a change made meanwhile makes the next conditional request miss.
+        last_modified = None
+        if cacheable:
+            last_modified = await run_in_threadpool(case_last_modified, payload.case_id)
+        if last_modified is not None and _not_modified(request, last_modified):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=_cache_headers(last_modified, cacheable),
+            )
+
+        requested = request.headers.get(PROFILE_HEADER, "").lower() in {"1", "true", "yes"}
+        spans = SpanRecorder()
+        deadline = Deadline.from_ms(payload.deadline_ms or DEFAULT_DEADLINE_MS)
+        start = time.perf_counter()
+        budget = remaining(deadline)
+        try:
+            async with ADMISSION.admit(timeout=budget):
+                result_data, capture = await run_in_threadpool(
+                    _analyze_profiled, payload, requested, spans, deadline
+                )
+        except QueueTimeout:
+            if budget is None or budget > ADMISSION.queue_timeout:
+                raise
+            # The request's own deadline ran out in the queue: answer like any
+            # other expired deadline, with a truncated result.
+            result_data = await run_in_threadpool(truncated_result, payload.case_id, "admission", deadline, spans)
+            capture = ProfileCapture()
+        STAGE_METRICS.observe_spans(spans.spans)
+        STAGE_METRICS.observe("request", time.perf_counter() - start)
+
+        if HAS_ROUTER:
+            # A plugged-in Router's output is not guaranteed to be pre-shaped.
+            result_data = AnalysisResponse.model_validate(result_data).model_dump(mode="json")
+
+        _page_timeline(result_data, timeline_fields, limit, cursor)
+        response = FastJSONResponse(
+            result_data,
+            headers=_cache_headers(last_modified, cacheable, bool(result_data.get("truncated"))),
+        )
+        if capture.path is not None:
+            logging.info(f"[API] Profile for case_id={payload.case_id} written to {capture.path}")
+            response.headers[PROFILE_HEADER] = capture.path.name
+        if result_data.get("truncated"):
+            logging.warning(f"[API] Deadline exceeded for case_id={payload.case_id}; returning partial result")
 
-        return result_data
+        return response
 
+    except StaleCursorError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except CursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Overloaded as e:
+        logging.warning(f"[API] Shedding case_id={payload.case_id}: {e.reason}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.reason,
+            headers={"Retry-After": retry_after_header(e.retry_after)},
+        )
     except FileNotFoundError as e:
         logging.warning(f"[API] Case not found: {e}")
         raise HTTPException(
@@ -88,3 +570,224 @@ async def run_analysis(payload: AnalysisRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal pipeline error. See server logs for details.",
         )
+
+
+@app.get("/v1/cases/{case_id}/timeline", response_model=TimelineDiffResponse)
+async def get_timeline_diff(case_id: str, since: Optional[int] = None):
+    """
+    Timeline changes since version `since` (the `timeline_version` of an
+    earlier response), or the full timeline when omitted. Only timeline
+    files changed since the last refresh are re-read.
+    """
+    try:
+        return await run_in_threadpool(timeline_diff, case_id, since)
+    except FileNotFoundError as e:
+        logging.warning(f"[API] Case not found: {e}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@app.post("/v1/jobs", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(payload: JobRequest, request: Request, response: Response):
+    """
+    Queue an analysis to run in the background and return its job id at once.
+
+    Submitting the same case_id, query and deadline_ms while an identical
+    job is still queued or running returns that job (`deduplicated: true`),
+    raising its priority if this submission's is higher. Poll
+    GET /v1/jobs/{job_id} or stream /v1/jobs/{job_id}/events, then fetch
+    /v1/jobs/{job_id}/result.
+    """
+    _check_rate_limit(request)
+    if not await run_in_threadpool(case_exists, payload.case_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Case {payload.case_id} not found")
+
+    runner = _get_job_runner()
+    job, deduplicated = await run_in_threadpool(
+        runner.store.submit,
+        payload.case_id,
+        payload.query,
+        payload.deadline_ms or DEFAULT_DEADLINE_MS or None,
+        payload.priority,
+    )
+    runner.notify()
+    logging.info(
+        f"[API] Job {job['id']} for case_id={payload.case_id} "
+        f"{'deduplicated' if deduplicated else 'queued'} (priority {job['priority']})"
+    )
+    response.headers["Location"] = f"/v1/jobs/{job['id']}"
+    return {**job, "deduplicated": deduplicated}
+
+
+async def _job_or_404(job_id: str) -> dict:
+    try:
+        return await run_in_threadpool(_get_job_runner().store.get, job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+
+
+@app.get("/v1/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Current status of a job."""
+    return await _job_or_404(job_id)
+
+
+@app.delete("/v1/jobs/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    """
+    Cancel a job. A queued job is cancelled immediately; a running job
+    stops at its next stage check and keeps the partial result it reached.
+    Finished jobs are returned unchanged.
+    """
+    try:
+        return await run_in_threadpool(_get_job_runner().store.cancel, job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+
+
+@app.get("/v1/jobs/{job_id}/result", response_model=AnalysisResponse)
+async def get_job_result(
+    job_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated timeline event fields to return, e.g. 'date'."),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum timeline events per response."),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page."),
+):
+    """
+    Result of a finished job, in the same shape (and with the same paging)
+    as POST /v1/agent/analyze.
+
+    Returns 202 with `Retry-After` while the job is queued or running, and
+    409 for a failed job or one cancelled before it produced anything. A job
+    cancelled while running returns its partial result (`truncated: true`).
+    """
+    job = await _job_or_404(job_id)
+    if job["status"] not in FINAL_STATUSES:
+        return FastJSONResponse(
+            {**job, "deduplicated": False},
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Retry-After": "1"},
+        )
+    result_data = await run_in_threadpool(_get_job_runner().store.result, job_id)
+    if result_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} {job['status']} without a result" + (f": {job['error']}" if job["error"] else ""),
+        )
+    try:
+        _page_timeline(result_data, parse_fields(fields), limit, cursor)
+    except StaleCursorError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except CursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # A finished job's result never changes.
+    return FastJSONResponse(result_data, headers={"Cache-Control": "private, max-age=3600"})
+
+
+@app.get("/v1/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Server-sent events with the job's status: one `status` event now and one
+    per change, ending after the job reaches succeeded, failed or cancelled.
+    """
+    job = await _job_or_404(job_id)
+    store = _get_job_runner().store
+
+    async def events():
+        current = job
+        last = None
+        while True:
+            snapshot = (current["status"], current["cancel_requested"], current["priority"])
+            if snapshot != last:
+                last = snapshot
+                yield b"event: status\ndata: " + dumps({**current, "deduplicated": False}) + b"\n\n"
+            if current["status"] in FINAL_STATUSES:
+                return
+            await asyncio.sleep(JOB_EVENTS_INTERVAL_S)
+            current = await run_in_threadpool(store.get, job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/v1/events", response_model=EventQueryResponse)
+async def search_events(
+    start: Optional[date] = Query(None, description="Earliest event date (inclusive)."),
+    end: Optional[date] = Query(None, description="Latest event date (inclusive)."),
+    case_prefix: Optional[str] = Query(None, description="Only cases whose case_id starts with this, e.g. 'RH'."),
+    category: Optional[List[str]] = Query(None, description="Event categories; repeat for several."),
+    q: Optional[str] = Query(None, description="Case-insensitive substring of the event title."),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Cross-case timeline search backed by a columnar event store, e.g.
+    `/v1/events?start=2024-03-01&end=2024-03-31&case_prefix=RH&category=incident_occurs`.
+    Date filters exclude events without a parsable date.
+    """
+    if not HAS_EVENT_STORE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event search requires NumPy on the server.",
+        )
+    return await run_in_threadpool(
+        query_events,
+        start=start,
+        end=end,
+        case_prefix=case_prefix,
+        categories=category,
+        title_contains=q,
+        offset=offset,
+        limit=limit,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage latency histograms in Prometheus text exposition format."""
+    return PlainTextResponse(
+        STAGE_METRICS.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def _require_admin(request: Request) -> None:
+    """Admin endpoints: bearer token if configured, else loopback clients only."""
+    if ADMIN_TOKEN:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Admin token required.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return
+    host = request.client.host if request.client else None
+    if host not in LOOPBACK_HOSTS:
+        logging.warning(f"[API] Refused admin request from {host}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are limited to localhost unless LEXFABRIC_ADMIN_TOKEN is set.",
+        )
+
+
+@app.get("/v1/admin/instrumentation", dependencies=[Depends(_require_admin)])
+async def get_instrumentation():
+    """Current profiling settings plus hot-path counters and timers."""
+    return {"profiler": PROFILER.config(), **INSTRUMENTATION.snapshot()}
+
+
+@app.put("/v1/admin/instrumentation", dependencies=[Depends(_require_admin)])
+async def update_instrumentation(settings: InstrumentationSettings):
+    """Toggle counters and profiling at runtime, without a restart."""
+    if settings.counters_enabled is not None:
+        INSTRUMENTATION.enabled = settings.counters_enabled
+    if settings.profile_header_enabled is not None:
+        PROFILER.header_enabled = settings.profile_header_enabled
+    if settings.profile_sample_rate is not None:
+        PROFILER.sample_rate = settings.profile_sample_rate
+    if settings.reset_counters:
+        INSTRUMENTATION.reset()
+    logging.info(f"[API] Instrumentation updated: {settings.model_dump(exclude_none=True)}")
+    return {"profiler": PROFILER.config(), **INSTRUMENTATION.snapshot()}
@@ -0,0 +1,228 @@
+"""
+Admission control and load shedding for the analysis endpoint.
+
+`analyze_case` is expensive, so accepting every request during a burst only
+makes all of them time out together. Each worker process therefore keeps:
+
+- an `AdmissionController`: at most `max_in_flight` analyses run at once,
+  up to `max_queue` more wait (for at most `queue_timeout` seconds) in FIFO
+  order, and anything beyond that is rejected immediately with `Overloaded`;
+- a `ClientRateLimiter`: one token bucket per client key, so a single noisy
+  client cannot take all of the capacity.
+
+Both report a retry-after estimate so the API can answer 503/429 with a
+`Retry-After` header instead of holding the connection.
+
+The controller is asyncio-based and must be used from the worker's event
+loop; the rate limiter is thread-safe.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; carries a retry-after hint."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class QueueTimeout(Overloaded):
+    """Raised when no slot freed up within the wait limit."""
+
+
+def retry_after_header(seconds: float) -> str:
+    """`Retry-After` value: whole seconds, at least 1."""
+    return str(max(1, math.ceil(seconds)))
+
+
+class AdmissionController:
+    """
+    Bounded in-flight limit with a bounded FIFO wait queue.
+
+    A finishing request hands its slot directly to the oldest waiter, so
+    queued requests are served in arrival order and cannot be overtaken by
+    newcomers.
+    """
+
+    def __init__(self, max_in_flight: int = 8, max_queue: int = 64, queue_timeout: float = 5.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Exponentially weighted mean service time, used for Retry-After.
+        self._avg_service_s = 0.1
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def saturated(self) -> bool:
+        return self._in_flight >= self.max_in_flight and len(self._waiters) >= self.max_queue
+
+    def retry_after(self) -> float:
+        """Rough time until a new request would be admitted."""
+        backlog = len(self._waiters) + 1
+        return self._avg_service_s * backlog / self.max_in_flight
+
+    @asynccontextmanager
+    async def admit(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Hold one in-flight slot for the body of the `async with`.
+
+        Waits in the queue for at most min(`timeout`, `queue_timeout`)
+        seconds; raises Overloaded when the queue is full, or its subclass
+        QueueTimeout when the wait times out.
+        """
+        await self._acquire(timeout)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._avg_service_s = 0.8 * self._avg_service_s + 0.2 * elapsed
+            self._release()
+
+    async def _acquire(self, timeout: Optional[float]) -> None:
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("Server is at capacity; request queue is full", self.retry_after())
+
+        wait = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(fut, wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over just as we gave up: pass it on.
+                self._release()
+            else:
+                self._remove_waiter(fut)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.timed_out += 1
+            raise QueueTimeout("Timed out waiting for a free analysis slot", self.retry_after()) from None
+        self.admitted += 1
+
+    def _release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # slot moves to the waiter; in-flight unchanged
+                return
+        self._in_flight -= 1
+
+    def _remove_waiter(self, fut: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "saturated": self.saturated(),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, at most `burst` stored."""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Consume one token; returns 0.0, or the seconds until one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class ClientRateLimiter:
+    """
+    Per-client token buckets, keyed by an arbitrary client string.
+
+    At most `max_clients` buckets are kept (least recently seen dropped
+    first). A `rate` of 0 disables limiting.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: float = 10.0,
+        max_clients: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_clients = max_clients
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def check(self, client: str) -> float:
+        """0.0 if `client` may proceed, otherwise the seconds to wait."""
+        if not self.enabled:
+            return 0.0
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            wait = bucket.take(now)
+            if wait:
+                self.limited += 1
+            return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "rate_per_s": self.rate,
+                "burst": self.burst,
+                "clients": len(self._buckets),
+                "limited": self.limited,
+            }
@@ -3,6 +3,16 @@ from .evidence_agent import EvidenceAgent
 from .timeline_agent import TimelineAgent
 from .qa_agent import QnAAgent
 from .router import RouterAgent
+from .model_client import (
+    HTTPBackend,
+    ModelBackend,
+    ModelClient,
+    ModelClientError,
+    ResponseCache,
+    StubBackend,
+)
+from .session_pool import CaseSession, SessionPool
+from .snapshot import Snapshot, SnapshotError, load_snapshot, save_snapshot
 
 __all__ = [
     "Memory",
@@ -10,4 +20,16 @@ __all__ = [
     "TimelineAgent",
     "QnAAgent",
     "RouterAgent",
+    "ModelClient",
+    "ModelClientError",
+    "ModelBackend",
+    "StubBackend",
+    "HTTPBackend",
+    "ResponseCache",
+    "CaseSession",
+    "SessionPool",
+    "Snapshot",
+    "SnapshotError",
+    "load_snapshot",
+    "save_snapshot",
 ]
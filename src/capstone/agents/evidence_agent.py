@@ -1,6 +1,8 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import Dict, Any, Iterable, Optional
 
 from .memory import Memory
+from .model_client import ModelClient
 
 
 class EvidenceAgent:
@@ -11,25 +13,127 @@ class EvidenceAgent:
       - Feed it the evidence_records from demo.py
       - Have it call an LLM (Gemini, etc.)
       - Store summaries in Memory under 'evidence_summary'
+
+    Per-category counts are kept per case in Memory under 'evidence_counts',
+    so adding or removing a handful of records only touches those records
+    (and the counts survive a Memory snapshot).
+
+    With a `model` client, `asummarize` also asks the model for a short
+    narrative over the category counts and stores it under 'evidence_notes'.
     """
 
-    def __init__(self, memory: Memory):
+    def __init__(self, memory: Memory, model: Optional[ModelClient] = None):
         self.memory = memory
+        self.model = model
+
+    # ------------------------------------------------------------------ #
+    # Running counters
+    # ------------------------------------------------------------------ #
+
+    def _case_counts(self, case_id: str) -> Dict[str, int]:
+        all_counts = self.memory.get("evidence_counts")
+        if all_counts is None:
+            all_counts = {}
+            self.memory.set("evidence_counts", all_counts)
+        return all_counts.setdefault(case_id, {})
+
+    def reset(self, case_id: str) -> None:
+        self._case_counts(case_id).clear()
+
+    def add_records(self, case_id: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Fold `records` (any iterable, consumed once) into the case counters."""
+        counts = self._case_counts(case_id)
+        n = 0
+        for rec in records:
+            cat = rec.get("category", "unknown")
+            counts[cat] = counts.get(cat, 0) + 1
+            n += 1
+        return n
+
+    def remove_records(self, case_id: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Subtract `records` from the case counters; unknown categories are ignored."""
+        counts = self._case_counts(case_id)
+        n = 0
+        for rec in records:
+            cat = rec.get("category", "unknown")
+            current = counts.get(cat, 0)
+            if current <= 0:
+                continue
+            if current == 1:
+                del counts[cat]
+            else:
+                counts[cat] = current - 1
+            n += 1
+        return n
+
+    def counts(self, case_id: str) -> Dict[str, int]:
+        return dict(self._case_counts(case_id))
 
-    def summarize(self, case_id: str, records: List[Dict[str, Any]]) -> str:
+    # ------------------------------------------------------------------ #
+    # Summaries
+    # ------------------------------------------------------------------ #
+
+    def summarize(
+        self,
+        case_id: str,
+        records: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> str:
         """
         Stub implementation. Replace with an LLM call.
 
         For now, just count by category and store that summary.
+
+        When `records` is given the case counters are rebuilt from it in a
+        single pass (lists, generators and other iterators all work). When it
+        is omitted the summary is re-rendered from the current counters, e.g.
+        after `add_records` / `remove_records`.
         """
-        counts: Dict[str, int] = {}
-        for rec in records:
-            cat = rec.get("category", "unknown")
-            counts[cat] = counts.get(cat, 0) + 1
+        if records is not None:
+            self.reset(case_id)
+            self.add_records(case_id, records)
+        return self._render(case_id)
+
+    async def asummarize(
+        self,
+        case_id: str,
+        records: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Async variant used by RouterAgent.arun_case_pipeline.
+
+        Counting runs in a worker thread; the optional model call is awaited
+        on the event loop through the shared ModelClient.
+        """
+        summary = await asyncio.to_thread(self.summarize, case_id, records)
+        if self.model is None:
+            return summary
+
+        prompt = (
+            "Summarize this evidence inventory for a legal analyst in two sentences. "
+            "Only use the facts below.\n\n" + summary
+        )
+        notes = await self.model.complete(prompt)
+        self.memory.set("evidence_notes", notes)
+        self.memory.add_message(notes)
+        return summary
+
+    def apply_delta(
+        self,
+        case_id: str,
+        added: Iterable[Dict[str, Any]] = (),
+        removed: Iterable[Dict[str, Any]] = (),
+    ) -> str:
+        """Update the counters from an add/remove delta and re-render the summary."""
+        self.remove_records(case_id, removed)
+        self.add_records(case_id, added)
+        return self._render(case_id)
+
+    def _render(self, case_id: str) -> str:
+        counts = self._case_counts(case_id)
 
         lines = [
             f"[EvidenceAgent] Summary for case {case_id}:",
-            f"- Total records: {len(records)}",
+            f"- Total records: {sum(counts.values())}",
         ]
         if counts:
             lines.append("- By category:")
@@ -1,3 +1,4 @@
+import copy
 from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
@@ -23,3 +24,42 @@ class Memory:
 
     def history(self) -> List[str]:
         return list(self.messages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict view of the memory, used for snapshots."""
+        return {"slots": dict(self.slots), "messages": list(self.messages)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Memory":
+        return cls(
+            slots=dict(data.get("slots") or {}),
+            messages=list(data.get("messages") or []),
+        )
+
+
+class ScratchMemory(Memory):
+    """
+    Private overlay over a parent Memory, for agents whose work may be
+    abandoned (e.g. on a timeout). Reads fall through to the parent; a slot is
+    copied on first read, so in-place updates stay private as well. Nothing
+    reaches the parent until `merge()`.
+    """
+
+    def __init__(self, parent: Memory):
+        super().__init__()
+        self.parent = parent
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.slots:
+            if key not in self.parent.slots:
+                return default
+            self.slots[key] = copy.deepcopy(self.parent.slots[key])
+        return self.slots[key]
+
+    def history(self) -> List[str]:
+        return self.parent.history() + list(self.messages)
+
+    def merge(self) -> None:
+        """Publish the slots read or written here, and the new messages, to the parent."""
+        self.parent.slots.update(self.slots)
+        self.parent.messages.extend(self.messages)
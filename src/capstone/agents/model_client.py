@@ -0,0 +1,317 @@
+"""
+Model-client abstraction for model-backed agents.
+
+Agents call `await client.complete(prompt)` (or `complete_many`) and the
+client takes care of:
+
+  - a content-addressed response cache keyed on the SHA-256 of the prompt,
+  - coalescing identical in-flight prompts,
+  - micro-batching individual prompts into backend calls,
+  - a concurrency semaphore shared by everything using the same client,
+  - retries with exponential backoff and full jitter.
+
+Backends only implement `generate(prompts) -> outputs`. `StubBackend` runs
+in-process; `HTTPBackend` talks to any server speaking the small JSON
+protocol served by `scripts/stub_model_server.py`:
+
+    POST /v1/generate  {"model": "...", "prompts": [...]}  ->  {"outputs": [...]}
+"""
+
+import abc
+import asyncio
+import hashlib
+import json
+import random
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class ModelClientError(RuntimeError):
+    """Raised when a backend call fails after all retries."""
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+# --------------------------------------------------------------------------- #
+# Response cache
+# --------------------------------------------------------------------------- #
+
+class ResponseCache:
+    """
+    Content-addressed cache of model outputs.
+
+    Keeps up to `max_entries` outputs in memory (LRU) and, when `directory` is
+    set, also persists each output as `<directory>/<key[:2]>/<key>.txt` so
+    cached answers survive restarts. Disk reads and writes run in a worker
+    thread so they never block the event loop.
+    """
+
+    def __init__(self, max_entries: int = 10_000, directory: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.txt"
+
+    async def get(self, key: str) -> Optional[str]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if self.directory is not None:
+            value = await asyncio.to_thread(self._read, key)
+            if value is not None:
+                self._remember(key, value)
+                return value
+        return None
+
+    async def put(self, key: str, value: str) -> None:
+        await self.put_many([(key, value)])
+
+    async def put_many(self, items: List[Tuple[str, str]]) -> None:
+        """Remember `items` now; persist them with a single worker-thread hop."""
+        for key, value in items:
+            self._remember(key, value)
+        if self.directory is not None and items:
+            await asyncio.to_thread(self._write, items)
+
+    def _read(self, key: str) -> Optional[str]:
+        try:
+            return self._path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write(self, items: List[Tuple[str, str]]) -> None:
+        for key, value in items:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(value, encoding="utf-8")
+
+    def _remember(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# --------------------------------------------------------------------------- #
+# Backends
+# --------------------------------------------------------------------------- #
+
+class ModelBackend(abc.ABC):
+    """A backend turns a batch of prompts into a batch of outputs, in order."""
+
+    model = "base"
+
+    @abc.abstractmethod
+    async def generate(self, prompts: List[str]) -> List[str]:
+        """Outputs for `prompts`, one per prompt and in the same order."""
+
+
+class StubBackend(ModelBackend):
+    """
+    Deterministic offline backend for tests and benchmarks.
+
+    Each output echoes the first line of its prompt; `latency` seconds are
+    spent per batch, not per prompt, like a real batched model server.
+    """
+
+    model = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate(self, prompts: List[str]) -> List[str]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [stub_output(p) for p in prompts]
+
+
+def stub_output(prompt: str) -> str:
+    first_line = (prompt.strip().splitlines() or [""])[0]
+    return f"[stub] {first_line[:200]}"
+
+
+class HTTPBackend(ModelBackend):
+    """JSON-over-HTTP backend (see the module docstring for the protocol)."""
+
+    def __init__(self, url: str, model: str = "stub", timeout: float = 30.0):
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+
+    def _post(self, prompts: List[str]) -> List[str]:
+        body = json.dumps({"model": self.model, "prompts": prompts}).encode("utf-8")
+        req = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            payload = json.loads(resp.read().decode("utf-8"))
+        return list(payload["outputs"])
+
+    async def generate(self, prompts: List[str]) -> List[str]:
+        return await asyncio.to_thread(self._post, prompts)
+
+
+# --------------------------------------------------------------------------- #
+# Client
+# --------------------------------------------------------------------------- #
+
+class ModelClient:
+    """
+    Batching, caching, rate-limited front door to a ModelBackend.
+
+    A client belongs to the event loop that first uses it. Share one client
+    across agents so `max_concurrency` bounds all outstanding backend calls.
+    """
+
+    def __init__(
+        self,
+        backend: ModelBackend,
+        cache: Optional[ResponseCache] = None,
+        max_batch_size: int = 16,
+        max_wait: float = 0.005,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 5.0,
+    ):
+        self.backend = backend
+        self.cache = cache if cache is not None else ResponseCache()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: List[Tuple[str, str, "asyncio.Future[str]"]] = []
+        self._inflight: Dict[str, "asyncio.Future[str]"] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "batches": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    async def complete(self, prompt: str) -> str:
+        self.stats["requests"] += 1
+        key = prompt_key(self.backend.model, prompt)
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.stats["coalesced"] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._inflight[key] = fut
+            self._pending.append((key, prompt, fut))
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        # Shield so one cancelled caller does not cancel a shared result.
+        return await asyncio.shield(fut)
+
+    async def complete_many(self, prompts: Iterable[str]) -> List[str]:
+        return list(await asyncio.gather(*(self.complete(p) for p in prompts)))
+
+    async def aclose(self) -> None:
+        """Flush pending prompts and wait for outstanding batches."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, str, "asyncio.Future[str]"]]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        prompts = [prompt for _, prompt, _ in batch]
+        try:
+            async with self._semaphore:
+                self.stats["batches"] += 1
+                outputs = await self._generate_with_retry(prompts)
+        except BaseException as e:
+            self.stats["failures"] += 1
+            for key, _, fut in batch:
+                self._inflight.pop(key, None)
+                if not fut.done():
+                    fut.set_exception(e if isinstance(e, ModelClientError) else ModelClientError(str(e)))
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+
+        for (key, _, fut), output in zip(batch, outputs):
+            self._inflight.pop(key, None)
+            if not fut.done():
+                fut.set_result(output)
+        # Waiters only resume once this task yields, and put_many caches the
+        # outputs in memory before its first await; only the disk write is
+        # left to the worker thread.
+        await self.cache.put_many([(key, output) for (key, _, _), output in zip(batch, outputs)])
+
+    async def _generate_with_retry(self, prompts: List[str]) -> List[str]:
+        attempt = 0
+        while True:
+            try:
+                outputs = await self.backend.generate(prompts)
+                if len(outputs) != len(prompts):
+                    raise ModelClientError(
+                        f"Backend returned {len(outputs)} outputs for {len(prompts)} prompts"
+                    )
+                return outputs
+            except (ModelClientError, OSError, urllib.error.URLError, ValueError, KeyError) as e:
+                if attempt >= self.max_retries:
+                    raise ModelClientError(
+                        f"Model backend failed after {attempt + 1} attempt(s): {e}"
+                    ) from e
+                # Exponential backoff with full jitter.
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                attempt += 1
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+
@@ -1,6 +1,81 @@
 # src/capstone/agents/qa_agent.py
 
-from typing import List, Dict, Any, Optional
+import re
+import threading
+from typing import List, Dict, Any, Optional, Pattern, Sequence, Tuple
+
+from ..instrumentation import INSTRUMENTATION
+
+# Known question patterns, in priority order: (intent, trigger phrases).
+# An intent is answered by QnAAgent._answer_<intent>; the first intent with a
+# phrase in the (lower-cased) question wins.
+INTENTS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("earliest_event", ("earliest event",)),
+    ("contradictions", ("emails contradict", "contradict the initial filing")),
+    ("actor_between_email_and_filing", ("between the first email and the filing",)),
+    ("missing_info", ("incomplete dates", "uncertain ordering")),
+    ("escalation", ("dispute escalation",)),
+    ("overview", ("4-sentence overview", "four-sentence overview")),
+    ("initial_filing_day", ("on the date of the initial filing",)),
+    ("operations_manager", ("operations manager",)),
+    ("gaps", ("logical gaps",)),
+    ("hash_provenance", ("hash of the file", "hash-provenance")),
+)
+
+
+class IntentMatcher:
+    """
+    Maps a question to the first matching intent of `intents`.
+
+    All trigger phrases are compiled into one alternation, so a question is
+    scanned once; the matched phrase is mapped back to its intent and the
+    highest-priority intent among the matches wins.
+    """
+
+    def __init__(self, intents: Sequence[Tuple[str, Sequence[str]]] = INTENTS):
+        self.intents = tuple((name, tuple(phrases)) for name, phrases in intents)
+        first: Dict[str, Tuple[int, str]] = {}
+        for rank, (name, phrases) in enumerate(self.intents):
+            for phrase in phrases:
+                first.setdefault(phrase, (rank, name))
+        # A match of a phrase is also a match of every phrase it starts with.
+        self._rank = {
+            phrase: min(found for other, found in first.items() if phrase.startswith(other))
+            for phrase in first
+        }
+        # Longest first, so a phrase that contains another still matches whole.
+        alternation = "|".join(re.escape(p) for p in sorted(self._rank, key=len, reverse=True))
+        self._pattern: Pattern[str] = re.compile(alternation)
+
+    def match(self, question: str) -> Optional[str]:
+        q_lower = (question or "").lower().strip()
+        best: Optional[Tuple[int, str]] = None
+        pos = 0
+        while True:
+            m = self._pattern.search(q_lower, pos)
+            if m is None:
+                break
+            found = self._rank[m.group(0)]
+            if best is None or found < best:
+                best = found
+                if found[0] == 0:
+                    break
+            pos = m.start() + 1
+        return best[1] if best else None
+
+
+_INTENT_MATCHER: Optional[IntentMatcher] = None
+_INTENT_MATCHER_LOCK = threading.Lock()
+
+
+def get_intent_matcher() -> IntentMatcher:
+    """Process-wide matcher for INTENTS, compiled on first use (or at warm-up)."""
+    global _INTENT_MATCHER
+    if _INTENT_MATCHER is None:
+        with _INTENT_MATCHER_LOCK:
+            if _INTENT_MATCHER is None:
+                _INTENT_MATCHER = IntentMatcher()
+    return _INTENT_MATCHER
 
 
 class QnAAgent:
@@ -36,50 +111,16 @@ class QnAAgent:
     # --------------------------------------------------------------------- #
 
     def answer(self, question: str) -> str:
-        q_lower = (question or "").lower().strip()
-
-        # 1) Earliest event
-        if "earliest event" in q_lower:
-            return self._answer_earliest_event(question)
-
-        # 2) Emails contradict filing?
-        if "emails contradict" in q_lower or "contradict the initial filing" in q_lower:
-            return self._answer_contradictions(question)
-
-        # 3) Actions between first email and filing
-        if "between the first email and the filing" in q_lower:
-            return self._answer_actor_between_email_and_filing(question)
-
-        # 4) Missing info / uncertain ordering
-        if "incomplete dates" in q_lower or "uncertain ordering" in q_lower:
-            return self._answer_missing_info(question)
-
-        # 5) Escalation reasoning
-        if "dispute escalation" in q_lower:
-            return self._answer_escalation(question)
-
-        # 6) 4-sentence overview
-        if "4-sentence overview" in q_lower or "four-sentence overview" in q_lower:
-            return self._answer_overview(question)
-
-        # 7) Everything on date of initial filing
-        if "on the date of the initial filing" in q_lower:
-            return self._answer_initial_filing_day(question)
-
-        # 8) Operations manager events
-        if "operations manager" in q_lower:
-            return self._answer_operations_manager(question)
-
-        # 9) Logical gaps + suggested evidence
-        if "logical gaps" in q_lower:
-            return self._answer_gaps(question)
-
-        # 10) Hash provenance
-        if "hash of the file" in q_lower or "hash-provenance" in q_lower:
-            return self._answer_hash_provenance(question)
-
-        # Fallback for arbitrary questions
-        return self._answer_default(question)
+        INSTRUMENTATION.incr("qna.questions")
+        with INSTRUMENTATION.timed("qna.dispatch"):
+            return self._dispatch(question)
+
+    def _dispatch(self, question: str) -> str:
+        intent = get_intent_matcher().match(question)
+        if intent is None:
+            # Fallback for arbitrary questions
+            return self._answer_default(question)
+        return getattr(self, f"_answer_{intent}")(question)
 
     # --------------------------------------------------------------------- #
     # Helpers to look up evidence / timeline
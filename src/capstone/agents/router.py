@@ -1,9 +1,15 @@
-from typing import List, Dict, Any
+import asyncio
+import copy
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional
 
-from .memory import Memory
+from .memory import Memory, ScratchMemory
 from .evidence_agent import EvidenceAgent
 from .timeline_agent import TimelineAgent
 from .qa_agent import QnAAgent
+from .model_client import ModelClient
+from .snapshot import Snapshot, load_snapshot, save_snapshot
 
 
 class RouterAgent:
@@ -18,22 +24,203 @@ class RouterAgent:
         router = RouterAgent()
         router.run_case_pipeline(case_id, evidence_records, timeline_events)
         print(router.answer("What is this case about?"))
+
+    From async code (e.g. a FastAPI handler) await the concurrent variant:
+
+        await router.arun_case_pipeline(case_id, evidence_records, timeline_events, timeout=2.0)
+
+    To survive restarts, persist and restore the router's state:
+
+        router.save_snapshot(path)
+        router = RouterAgent.from_snapshot(path)
     """
 
-    def __init__(self):
-        self.memory = Memory()
-        self.evidence_agent = EvidenceAgent(self.memory)
+    def __init__(self, memory: Optional[Memory] = None, model: Optional[ModelClient] = None):
+        self.memory = memory if memory is not None else Memory()
+        self.evidence_agent = EvidenceAgent(self.memory, model=model)
         self.timeline_agent = TimelineAgent(self.memory)
         self.qa_agent = QnAAgent(self.memory)
+        self.cases: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: Optional[Snapshot] = None
 
     def run_case_pipeline(
         self,
         case_id: str,
         evidence_records: List[Dict[str, Any]],
         timeline_events: List[Dict[str, Any]],
+        source_mtime_ns: Optional[int] = None,
     ) -> None:
         self.evidence_agent.summarize(case_id, evidence_records)
         self.timeline_agent.summarize(case_id, timeline_events)
+        self._store_case(case_id, evidence_records, timeline_events, source_mtime_ns)
+
+    async def arun_case_pipeline(
+        self,
+        case_id: str,
+        evidence_records: List[Dict[str, Any]],
+        timeline_events: List[Dict[str, Any]],
+        timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        source_mtime_ns: Optional[int] = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Run the independent agents concurrently and return their summaries.
+
+        Agents exposing an `asummarize` coroutine are awaited directly; plain
+        `summarize` methods run in a worker thread so they do not block the
+        event loop. `timeouts` maps agent name ("evidence", "timeline") to a
+        per-agent limit in seconds and falls back to `timeout`.
+
+        An agent that exceeds its limit is cancelled and yields None. Timing
+        and status for each agent are stored in Memory under 'agent_timings'.
+        Exceptions other than timeouts are re-raised once all agents finish.
+
+        A thread-backed agent cannot be interrupted mid-call, so every agent
+        runs against a private ScratchMemory that is merged into `self.memory`
+        only when the agent finishes in time ("ok"). Work still running in a
+        thread after a timeout therefore never reaches shared Memory.
+        """
+        timeouts = timeouts or {}
+        scratches = {name: ScratchMemory(self.memory) for name in ("evidence", "timeline")}
+        evidence_agent = self._with_memory(self.evidence_agent, scratches["evidence"])
+        timeline_agent = self._with_memory(self.timeline_agent, scratches["timeline"])
+        jobs: Dict[str, Callable[[], Any]] = {
+            "evidence": lambda: self._call_agent(evidence_agent, case_id, evidence_records),
+            "timeline": lambda: self._call_agent(timeline_agent, case_id, timeline_events),
+        }
+
+        timings: Dict[str, Dict[str, Any]] = {}
+        outcomes = await asyncio.gather(
+            *(
+                self._timed(name, job, timeouts.get(name, timeout), timings)
+                for name, job in jobs.items()
+            ),
+            return_exceptions=True,
+        )
+        for name, scratch in scratches.items():
+            if timings.get(name, {}).get("status") == "ok":
+                scratch.merge()
+        self.memory.set("agent_timings", timings)
+
+        results: Dict[str, Optional[str]] = {}
+        error: Optional[BaseException] = None
+        for name, outcome in zip(jobs, outcomes):
+            if isinstance(outcome, BaseException):
+                error = error or outcome
+                results[name] = None
+            else:
+                results[name] = outcome
+        if error is not None:
+            raise error
+
+        self._store_case(case_id, evidence_records, timeline_events, source_mtime_ns)
+        return results
+
+    def _store_case(
+        self,
+        case_id: str,
+        evidence_records: List[Dict[str, Any]],
+        timeline_events: List[Dict[str, Any]],
+        source_mtime_ns: Optional[int],
+    ) -> None:
+        state: Dict[str, Any] = {"evidence": evidence_records, "timeline": timeline_events}
+        if source_mtime_ns is not None:
+            state["source_mtime_ns"] = source_mtime_ns
+        self.cases[case_id] = state
+
+    @staticmethod
+    def _with_memory(agent: Any, memory: Memory) -> Any:
+        """Shallow copy of `agent` that reads and writes `memory`."""
+        clone = copy.copy(agent)
+        clone.memory = memory
+        return clone
+
+    @staticmethod
+    def _call_agent(agent: Any, case_id: str, payload: List[Dict[str, Any]]) -> Any:
+        asummarize = getattr(agent, "asummarize", None)
+        if asummarize is not None:
+            return asummarize(case_id, payload)
+        return asyncio.to_thread(agent.summarize, case_id, payload)
+
+    @staticmethod
+    async def _timed(
+        name: str,
+        job: Callable[[], Any],
+        timeout: Optional[float],
+        timings: Dict[str, Dict[str, Any]],
+    ) -> Optional[str]:
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            return await asyncio.wait_for(job(), timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            return None
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            timings[name] = {
+                "status": status,
+                "seconds": round(time.perf_counter() - start, 6),
+            }
 
     def answer(self, question: str) -> str:
         return self.qa_agent.answer(question)
+
+    # ------------------------------------------------------------------ #
+    # Snapshot / warm restore
+    # ------------------------------------------------------------------ #
+
+    def case_state(self, case_id: str, source_mtime_ns: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Derived state for `case_id`, from this process or the restored snapshot.
+
+        Snapshot sections are decoded on first access and then kept in
+        `self.cases`. With `source_mtime_ns` (the case's current modification
+        time), state recorded for a different time is stale and None is
+        returned, as it is for state saved without one.
+        """
+        state = self.cases.get(case_id)
+        if state is None and self._snapshot is not None:
+            state = self._snapshot.case_state(case_id)
+            if state is not None:
+                self.cases[case_id] = state
+        if state is None:
+            return None
+        if source_mtime_ns is not None and state.get("source_mtime_ns") != source_mtime_ns:
+            return None
+        return state
+
+    def save_snapshot(self, path: Path, compress: bool = True) -> Path:
+        cases = dict(self.cases)
+        if self._snapshot is not None:
+            for case_id in self._snapshot.case_ids():
+                if case_id not in cases:
+                    cases[case_id] = self._snapshot.case_state(case_id)
+        return save_snapshot(path, self.memory, cases, compress=compress)
+
+    @classmethod
+    def from_snapshot(cls, path: Path, model: Optional[ModelClient] = None) -> "RouterAgent":
+        """
+        Build a router whose Memory is restored from `path`.
+
+        Case state stays on disk until `case_state()` asks for it.
+        """
+        snapshot = load_snapshot(path)
+        try:
+            router = cls(memory=snapshot.memory(), model=model)
+        except Exception:
+            snapshot.close()
+            raise
+        router._snapshot = snapshot
+        return router
+
+    def close(self) -> None:
+        """Release the restored snapshot's file mapping; its unread cases are dropped."""
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
@@ -0,0 +1,209 @@
+"""
+Case-scoped pool of warm agent sessions.
+
+A server answering several questions about the same case should not reload
+evidence, re-derive the timeline and rebuild every agent per request. The
+pool keeps one `CaseSession` per case_id and evicts by LRU order, idle TTL
+and an approximate memory budget.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .qa_agent import QnAAgent
+from .router import RouterAgent
+
+
+@dataclass
+class CaseSession:
+    """Warm, precomputed agent state for one case."""
+    case_id: str
+    router: RouterAgent
+    qna: QnAAgent
+    state: Dict[str, Any] = field(default_factory=dict)
+    size_bytes: int = 0
+    last_used: float = 0.0
+    hits: int = 0
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Rough deep size of plain containers (dict/list/tuple/str/numbers), in bytes."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += estimate_size(k, seen) + estimate_size(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, seen)
+    return size
+
+
+def estimate_session_size(session: CaseSession) -> int:
+    seen: set = set()
+    return (
+        estimate_size(session.router.memory.to_dict(), seen)
+        + estimate_size(session.router.cases, seen)
+        + estimate_size(session.qna.evidence, seen)
+        + estimate_size(session.qna.timeline, seen)
+        + estimate_size(session.state, seen)
+    )
+
+
+class SessionPool:
+    """
+    LRU + idle-TTL + memory-budget cache of CaseSession objects.
+
+    `get(case_id, factory)` returns the warm session or builds one with
+    `factory(case_id)`. Concurrent misses for the same case wait for a single
+    build instead of all loading the case at once.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 32,
+        idle_ttl: Optional[float] = 900.0,
+        memory_budget_bytes: Optional[int] = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.memory_budget_bytes = memory_budget_bytes
+        self._clock = clock
+        self._sessions: "OrderedDict[str, CaseSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def get(
+        self,
+        case_id: str,
+        factory: Callable[[str], CaseSession],
+        timeout: Optional[float] = None,
+    ) -> CaseSession:
+        """
+        Warm session for `case_id`, building it with `factory` on a miss.
+
+        `timeout` bounds how long to wait for another thread's build of the
+        same case; TimeoutError is raised when it runs out.
+        """
+        session = self._lookup(case_id)
+        if session is not None:
+            return session
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(case_id, threading.Lock())
+
+        if not build_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"Timed out waiting for the session build of case {case_id}")
+        try:
+            # Another thread may have finished the build while we waited.
+            session = self._lookup(case_id)
+            if session is not None:
+                return session
+
+            try:
+                session = factory(case_id)
+                session.size_bytes = estimate_session_size(session)
+                session.last_used = self._clock()
+                with self._lock:
+                    self.misses += 1
+                    self._sessions[case_id] = session
+                    self._sessions.move_to_end(case_id)
+                    self._evict_locked(keep=case_id)
+            finally:
+                with self._lock:
+                    self._build_locks.pop(case_id, None)
+            return session
+        finally:
+            build_lock.release()
+
+    def peek(self, case_id: str) -> Optional[CaseSession]:
+        """Return the session without touching LRU order or counters."""
+        with self._lock:
+            return self._sessions.get(case_id)
+
+    def invalidate(self, case_id: str, session: Optional[CaseSession] = None) -> bool:
+        """
+        Drop the session of `case_id`. With `session`, only drop it if it is
+        still the pooled one (another thread may already have replaced it).
+        """
+        with self._lock:
+            current = self._sessions.get(case_id)
+            if current is None or (session is not None and current is not session):
+                return False
+            del self._sessions[case_id]
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def case_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": sum(s.size_bytes for s in self._sessions.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _lookup(self, case_id: str) -> Optional[CaseSession]:
+        with self._lock:
+            self._expire_locked()
+            session = self._sessions.get(case_id)
+            if session is None:
+                return None
+            self._sessions.move_to_end(case_id)
+            session.last_used = self._clock()
+            session.hits += 1
+            self.hits += 1
+            return session
+
+    def _expire_locked(self) -> None:
+        if self.idle_ttl is None:
+            return
+        cutoff = self._clock() - self.idle_ttl
+        # OrderedDict is in LRU order, so idle sessions sit at the front.
+        while self._sessions:
+            case_id, session = next(iter(self._sessions.items()))
+            if session.last_used > cutoff:
+                break
+            del self._sessions[case_id]
+            self.evictions += 1
+
+    def _evict_locked(self, keep: str) -> None:
+        self._expire_locked()
+        total = sum(s.size_bytes for s in self._sessions.values())
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions
+            or (self.memory_budget_bytes is not None and total > self.memory_budget_bytes)
+        ):
+            case_id = next(iter(self._sessions))
+            if case_id == keep:
+                break
+            total -= self._sessions.pop(case_id).size_bytes
+            self.evictions += 1
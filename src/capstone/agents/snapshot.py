@@ -0,0 +1,213 @@
+"""
+Binary snapshots of agent Memory and derived case state.
+
+A snapshot lets a restarted process come up warm instead of re-walking the
+evidence store and re-running every agent. The file layout is:
+
+    header   : magic (4s) | version (H) | flags (H) | section count (I)
+    table    : per section -> name length (H) | name | offset (Q) | length (Q) | crc32 (I)
+    payload  : one JSON blob per section, optionally zlib-compressed
+
+Sections are independent, so restoring only the Memory (or a single case)
+never decodes the rest of the file. Reads go through mmap.
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .memory import Memory
+
+MAGIC = b"LXSN"
+FORMAT_VERSION = 1
+
+FLAG_ZLIB = 0x1
+
+# Memory messages kept in a snapshot (the newest ones); they would otherwise
+# grow with every run that restores and saves the same file.
+MAX_MESSAGES = 1000
+
+MEMORY_SECTION = "memory"
+CASE_SECTION_PREFIX = "case:"
+
+_HEADER = struct.Struct("<4sHHI")
+_NAME_LEN = struct.Struct("<H")
+_ENTRY = struct.Struct("<QQI")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is missing, corrupt, or of an unknown version."""
+
+
+def _encode(obj: Any, compress: bool) -> bytes:
+    raw = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return zlib.compress(raw, 6) if compress else raw
+
+
+def save_snapshot(
+    path: Path,
+    memory: Memory,
+    cases: Optional[Dict[str, Dict[str, Any]]] = None,
+    compress: bool = True,
+    max_messages: int = MAX_MESSAGES,
+) -> Path:
+    """
+    Write `memory` and per-case derived state to `path`.
+
+    `cases` maps case_id -> JSON-serializable state (e.g. evidence records and
+    timeline events). Only the last `max_messages` Memory messages are kept.
+    The file is written to a temporary sibling and renamed into place, so
+    readers never observe a half-written snapshot.
+    """
+    path = Path(path)
+    flags = FLAG_ZLIB if compress else 0
+
+    memory_state = memory.to_dict()
+    memory_state["messages"] = memory_state["messages"][-max_messages:] if max_messages > 0 else []
+    sections: List[Tuple[str, bytes]] = [(MEMORY_SECTION, _encode(memory_state, compress))]
+    for case_id, state in sorted((cases or {}).items()):
+        sections.append((f"{CASE_SECTION_PREFIX}{case_id}", _encode(state, compress)))
+
+    encoded_names = [name.encode("utf-8") for name, _ in sections]
+    table_size = sum(_NAME_LEN.size + len(n) + _ENTRY.size for n in encoded_names)
+    offset = _HEADER.size + table_size
+
+    table = bytearray()
+    for name_bytes, (_, blob) in zip(encoded_names, sections):
+        table += _NAME_LEN.pack(len(name_bytes)) + name_bytes
+        table += _ENTRY.pack(offset, len(blob), zlib.crc32(blob))
+        offset += len(blob)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(sections)))
+        f.write(table)
+        for _, blob in sections:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+class Snapshot:
+    """
+    Lazily-decoded view over a snapshot file.
+
+    Opening a snapshot only parses the header and section table; each section
+    is decompressed and decoded the first time it is requested.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            self._file = self.path.open("rb")
+        except OSError as e:
+            raise SnapshotError(f"Cannot open snapshot {self.path}: {e}") from e
+
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # empty file
+            self._file.close()
+            raise SnapshotError(f"Snapshot {self.path} is empty") from e
+
+        self._sections: Dict[str, Tuple[int, int, int]] = {}
+        self._decoded: Dict[str, Any] = {}
+        try:
+            self._read_table()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_table(self) -> None:
+        if len(self._buf) < _HEADER.size:
+            raise SnapshotError(f"Snapshot {self.path} is truncated")
+
+        magic, version, flags, count = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a LexFabric snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(
+                f"Unsupported snapshot version {version} in {self.path} "
+                f"(expected {FORMAT_VERSION})"
+            )
+        self.version = version
+        self.compressed = bool(flags & FLAG_ZLIB)
+
+        pos = _HEADER.size
+        try:
+            for _ in range(count):
+                (name_len,) = _NAME_LEN.unpack_from(self._buf, pos)
+                pos += _NAME_LEN.size
+                name = bytes(self._buf[pos:pos + name_len]).decode("utf-8")
+                pos += name_len
+                offset, length, crc = _ENTRY.unpack_from(self._buf, pos)
+                pos += _ENTRY.size
+                if offset + length > len(self._buf):
+                    raise SnapshotError(f"Section '{name}' overruns snapshot {self.path}")
+                self._sections[name] = (offset, length, crc)
+        except struct.error as e:
+            raise SnapshotError(f"Snapshot {self.path} has a truncated section table") from e
+
+    def _section(self, name: str) -> Any:
+        if name in self._decoded:
+            return self._decoded[name]
+        if name not in self._sections:
+            raise KeyError(name)
+
+        offset, length, crc = self._sections[name]
+        blob = self._buf[offset:offset + length]
+        if zlib.crc32(blob) != crc:
+            raise SnapshotError(f"Checksum mismatch for section '{name}' in {self.path}")
+        if self.compressed:
+            blob = zlib.decompress(blob)
+
+        value = json.loads(blob.decode("utf-8"))
+        self._decoded[name] = value
+        return value
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def memory(self) -> Memory:
+        """Return a fresh Memory restored from the snapshot."""
+        return Memory.from_dict(self._section(MEMORY_SECTION))
+
+    def case_ids(self) -> List[str]:
+        return [
+            name[len(CASE_SECTION_PREFIX):]
+            for name in self._sections
+            if name.startswith(CASE_SECTION_PREFIX)
+        ]
+
+    def has_case(self, case_id: str) -> bool:
+        return f"{CASE_SECTION_PREFIX}{case_id}" in self._sections
+
+    def case_state(self, case_id: str) -> Optional[Dict[str, Any]]:
+        if not self.has_case(case_id):
+            return None
+        return self._section(f"{CASE_SECTION_PREFIX}{case_id}")
+
+    def iter_cases(self) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        for case_id in self.case_ids():
+            yield case_id, self._section(f"{CASE_SECTION_PREFIX}{case_id}")
+
+    def close(self) -> None:
+        self._decoded.clear()
+        self._buf.close()
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def load_snapshot(path: Path) -> Snapshot:
+    """Open `path` for lazy restore. Raises SnapshotError if it is unusable."""
+    return Snapshot(path)
@@ -1,20 +1,72 @@
-from typing import List, Dict, Any
+import heapq
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 from .memory import Memory
 
 
+def _event_date(ev: Dict[str, Any]) -> Optional[str]:
+    """
+    Date key for ordering. ISO-8601 strings compare chronologically as text;
+    date/datetime objects are normalized to that form.
+    """
+    ts = ev.get("timestamp") or ev.get("date")
+    if ts is None:
+        return None
+    if hasattr(ts, "isoformat"):
+        return ts.isoformat()
+    return str(ts)
+
+
 class TimelineAgent:
     """
     Agent responsible for deriving and summarizing a timeline for a case.
 
     In the demo, it receives simple 'events' derived from files.
+
+    The summary previews the `preview_size` earliest events. They are picked
+    with a bounded heap in the same single pass that computes the aggregate
+    stats, so the full timeline is never sorted or materialized.
     """
 
-    def __init__(self, memory: Memory):
+    def __init__(self, memory: Memory, preview_size: int = 5):
         self.memory = memory
+        self.preview_size = preview_size
+
+    def summarize(
+        self,
+        case_id: str,
+        events: Iterable[Dict[str, Any]],
+        k: Optional[int] = None,
+    ) -> str:
+        k = self.preview_size if k is None else k
+        stats = {"total": 0, "dated": 0, "undated": 0, "earliest": None, "latest": None}
+
+        def keyed() -> Iterator[Tuple[Tuple[int, str, int], Dict[str, Any]]]:
+            # Dated events sort first by date; undated ones follow in input order.
+            for seq, ev in enumerate(events):
+                stats["total"] += 1
+                date = _event_date(ev)
+                if date is None:
+                    stats["undated"] += 1
+                    yield (1, "", seq), ev
+                    continue
+                stats["dated"] += 1
+                if stats["earliest"] is None or date < stats["earliest"]:
+                    stats["earliest"] = date
+                if stats["latest"] is None or date > stats["latest"]:
+                    stats["latest"] = date
+                yield (0, date, seq), ev
+
+        preview: List[Dict[str, Any]] = []
+        if k > 0:
+            preview = [ev for _, ev in heapq.nsmallest(k, keyed(), key=lambda item: item[0])]
+        else:
+            for _ in keyed():  # still collect the stats
+                pass
+
+        self.memory.set("timeline_stats", dict(stats, case_id=case_id))
 
-    def summarize(self, case_id: str, events: List[Dict[str, Any]]) -> str:
-        if not events:
+        if not stats["total"]:
             summary = f"[TimelineAgent] No timeline events for case {case_id}."
             self.memory.set("timeline_summary", summary)
             self.memory.add_message(summary)
@@ -22,15 +74,18 @@ class TimelineAgent:
 
         lines = [
             f"[TimelineAgent] Timeline summary for case {case_id}:",
-            f"- Total events: {len(events)}",
+            f"- Total events: {stats['total']}",
+            f"- Dated: {stats['dated']}, undated: {stats['undated']}",
         ]
+        if stats["dated"]:
+            lines.append(f"- Date span: {stats['earliest']} → {stats['latest']}")
 
-        preview = events[:5]
-        lines.append("- First events:")
-        for ev in preview:
-            ts = ev.get("timestamp") or ev.get("date") or "unknown-date"
-            title = ev.get("title") or "Untitled event"
-            lines.append(f"  • {ts}: {title}")
+        if preview:
+            lines.append("- Earliest events:")
+            for ev in preview:
+                ts = ev.get("timestamp") or ev.get("date") or "unknown-date"
+                title = ev.get("title") or "Untitled event"
+                lines.append(f"  • {ts}: {title}")
 
         summary = "\n".join(lines)
         self.memory.set("timeline_summary", summary)
@@ -0,0 +1,339 @@
+"""
+Content-addressed evidence store with cross-case deduplication.
+
+The same exhibits (contracts, email threads) appear in many cases. Instead of
+keeping, reading and hashing every copy, evidence is ingested into a store
+keyed by SHA-256:
+
+    <store>/blobs/<aa>/<sha256>            raw bytes, written once per unique content
+    <store>/derived/<aa>/<sha256>.json     extracted text, dates and entity postings,
+                                           computed once per unique blob
+    <store>/cases/<case_id>.jsonl          per-case manifest: one record per file
+                                           {rel_path, category, title, ext, size_bytes,
+                                            mtime_ns, sha256}
+
+Re-ingesting a case only re-reads files whose size or mtime changed since
+its previous manifest, so storage and ingest CPU scale with unique, changed
+content rather than with copies.
+
+    store = BlobStore(Path("/data/blobstore"))
+    stats = store.ingest_case("CC02", Path("capstone/synthetic_evidence/CC02"))
+    store.hash_manifest("CC02", case_path)   # {evidence path: sha256}
+    store.derived(digest)                     # {"text", "dates", "entities"}
+
+`demo.derive_timeline_events` reads event dates and entities from the
+derived artifacts of each timeline file's blob, so a file shared by many
+cases is parsed once.
+"""
+
+import email.utils
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .case_archive import is_case_archive, open_case_archive
+
+CHUNK_SIZE = 1024 * 1024
+
+_ISO_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+_DATE_HEADER = re.compile(r"^Date:\s*(.+)$", re.MULTILINE)
+_ENTITY = re.compile(r"\b([A-Z][a-z]+(?: [A-Z][a-z]+)+)\b")
+
+
+class BlobStoreError(ValueError):
+    """Raised for unknown blobs or unreadable case manifests."""
+
+
+@dataclass
+class IngestStats:
+    files: int = 0
+    bytes: int = 0
+    unchanged: int = 0        # reused from the previous manifest without reading
+    new_blobs: int = 0
+    new_bytes: int = 0
+    deduplicated: int = 0     # content already present (same or another case)
+    derived_computed: int = 0
+
+
+# --------------------------------------------------------------------------- #
+# Derived artifacts
+# --------------------------------------------------------------------------- #
+
+def extract_text(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def extract_dates(text: str) -> List[str]:
+    """ISO dates (YYYY-MM-DD) in the text plus any RFC 2822 `Date:` header."""
+    dates = set(_ISO_DATE.findall(text))
+    for raw in _DATE_HEADER.findall(text):
+        try:
+            dates.add(email.utils.parsedate_to_datetime(raw.strip()).date().isoformat())
+        except (TypeError, ValueError):
+            continue
+    return sorted(dates)
+
+
+def extract_entities(text: str) -> Dict[str, int]:
+    """Postings for capitalised multi-word names ("Dana Whitfield" -> count)."""
+    return dict(Counter(_ENTITY.findall(text)))
+
+
+def derive_artifacts(data: bytes) -> Dict[str, Any]:
+    text = extract_text(data)
+    return {
+        "text": text,
+        "dates": extract_dates(text),
+        "entities": extract_entities(text),
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Store
+# --------------------------------------------------------------------------- #
+
+class BlobStore:
+    """Filesystem-backed content-addressed store; safe to share across processes."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blobs_dir = self.root / "blobs"
+        self.derived_dir = self.root / "derived"
+        self.cases_dir = self.root / "cases"
+        self.tmp_dir = self.root / "tmp"
+        for d in (self.blobs_dir, self.derived_dir, self.cases_dir, self.tmp_dir):
+            d.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------ #
+    # Blobs
+    # ------------------------------------------------------------------ #
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self.blob_path(digest).exists()
+
+    def put_stream(self, stream: BinaryIO) -> Tuple[str, int, bool]:
+        """Hash and store a stream in one pass; returns (sha256, size, created)."""
+        h = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                    h.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        digest = h.hexdigest()
+        if self.has(digest):
+            os.unlink(tmp)
+            return digest, size, False
+        return digest, size, self._commit(tmp, digest)
+
+    def _commit(self, tmp: str, digest: str) -> bool:
+        target = self.blob_path(digest)
+        target.parent.mkdir(exist_ok=True)
+        if target.exists():  # another writer won the race
+            os.unlink(tmp)
+            return False
+        os.replace(tmp, target)
+        return True
+
+    def read_bytes(self, digest: str) -> bytes:
+        try:
+            return self.blob_path(digest).read_bytes()
+        except FileNotFoundError:
+            raise BlobStoreError(f"Unknown blob {digest}") from None
+
+    # ------------------------------------------------------------------ #
+    # Derived artifacts
+    # ------------------------------------------------------------------ #
+
+    def _derived_path(self, digest: str) -> Path:
+        return self.derived_dir / digest[:2] / f"{digest}.json"
+
+    def derived(self, digest: str) -> Dict[str, Any]:
+        """Derived artifacts of a blob, computed and persisted on first use."""
+        try:
+            with self._derived_path(digest).open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Missing (ingested with derive=False) or a torn write: recompute.
+            return self._compute_derived(digest)
+
+    def ensure_derived(self, digest: str) -> bool:
+        """Compute and persist derived artifacts if missing; True if computed."""
+        if self._derived_path(digest).exists():
+            return False
+        self._compute_derived(digest)
+        return True
+
+    def _compute_derived(self, digest: str) -> Dict[str, Any]:
+        artifacts = derive_artifacts(self.read_bytes(digest))
+        path = self._derived_path(digest)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.tmp_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(artifacts, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return artifacts
+
+    # ------------------------------------------------------------------ #
+    # Cases
+    # ------------------------------------------------------------------ #
+
+    def _case_manifest_path(self, case_id: str) -> Path:
+        return self.cases_dir / f"{case_id}.jsonl"
+
+    def case_ids(self) -> List[str]:
+        return sorted(p.stem for p in self.cases_dir.glob("*.jsonl"))
+
+    def case_manifest(self, case_id: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._case_manifest_path(case_id)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except ValueError as e:
+            raise BlobStoreError(f"Corrupt case manifest {path}: {e}") from e
+
+    def hash_manifest(self, case_id: str, case_path: Path) -> Dict[str, str]:
+        """
+        {evidence path: sha256} for a case, keyed like evidence records' "path".
+
+        Entries whose file no longer has the size and mtime recorded at
+        ingest are left out: their hash would describe content that is gone.
+        Only the files the manifest lists are stat'ed (an archive once), so
+        the cost does not grow with files added since the ingest.
+        """
+        records = self.case_manifest(case_id) or []
+        if is_case_archive(case_path):
+            try:
+                archive_mtime = case_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                return {}
+            return {
+                str(case_path / rec["rel_path"]): rec["sha256"]
+                for rec in records
+                if rec["mtime_ns"] == archive_mtime
+            }
+
+        hashes: Dict[str, str] = {}
+        for rec in records:
+            path = case_path / rec["rel_path"]
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if (st.st_size, st.st_mtime_ns) == (rec["size_bytes"], rec["mtime_ns"]):
+                hashes[str(path)] = rec["sha256"]
+        return hashes
+
+    def ingest_case(self, case_id: str, source: Path, derive: bool = True) -> IngestStats:
+        """
+        Ingest a case directory or zip/tar archive and write its manifest.
+
+        Files whose size and mtime match the previous manifest are not read
+        again. Derived artifacts are computed only for blobs that lack them.
+        """
+        stats = IngestStats()
+        previous = {rec["rel_path"]: rec for rec in (self.case_manifest(case_id) or [])}
+        records: List[Dict[str, Any]] = []
+
+        for rel, size, mtime_ns, opener in _iter_case_files(source):
+            stats.files += 1
+            stats.bytes += size
+            prev = previous.get(rel)
+            if prev and prev["size_bytes"] == size and prev["mtime_ns"] == mtime_ns and self.has(prev["sha256"]):
+                digest = prev["sha256"]
+                stats.unchanged += 1
+            else:
+                with opener() as stream:
+                    digest, size, created = self.put_stream(stream)
+                if created:
+                    stats.new_blobs += 1
+                    stats.new_bytes += size
+                else:
+                    stats.deduplicated += 1
+
+            if derive and self.ensure_derived(digest):
+                stats.derived_computed += 1
+
+            posix = PurePosixPath(rel)
+            records.append({
+                "rel_path": rel,
+                "category": posix.parts[0] if len(posix.parts) > 1 else "uncategorized",
+                "title": posix.stem,
+                "ext": posix.suffix.lower(),
+                "size_bytes": size,
+                "mtime_ns": mtime_ns,
+                "sha256": digest,
+            })
+
+        self._write_case_manifest(case_id, records)
+        return stats
+
+    def _write_case_manifest(self, case_id: str, records: List[Dict[str, Any]]) -> None:
+        path = self._case_manifest_path(case_id)
+        fd, tmp = tempfile.mkstemp(dir=self.tmp_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+        os.replace(tmp, path)
+
+    def stats(self) -> Dict[str, Any]:
+        blobs = list(self.blobs_dir.glob("*/*"))
+        referenced = 0
+        for case_id in self.case_ids():
+            referenced += sum(rec["size_bytes"] for rec in self.case_manifest(case_id) or [])
+        stored = sum(p.stat().st_size for p in blobs)
+        return {
+            "cases": len(self.case_ids()),
+            "blobs": len(blobs),
+            "stored_bytes": stored,
+            "referenced_bytes": referenced,
+            "dedup_ratio": round(referenced / stored, 3) if stored else 0.0,
+        }
+
+
+def _iter_case_files(source: Path) -> Iterator[Tuple[str, int, int, Any]]:
+    """(case-relative POSIX path, size, mtime_ns, opener) for every file in a case."""
+    if is_case_archive(source):
+        archive = open_case_archive(source)
+        archive_mtime = source.stat().st_mtime_ns
+        for member in archive.members():
+            yield member, archive.size(member), archive_mtime, _archive_opener(archive, member)
+        return
+
+    for path in sorted(p for p in source.rglob("*") if p.is_file()):
+        st = path.stat()
+        yield path.relative_to(source).as_posix(), st.st_size, st.st_mtime_ns, _file_opener(path)
+
+
+def _file_opener(path: Path):
+    return lambda: path.open("rb")
+
+
+def _archive_opener(archive, member: str):
+    return lambda: io.BytesIO(archive.read_bytes(member))
+
+
+def open_blob_store(root: Optional[str]) -> Optional[BlobStore]:
+    """BlobStore at `root`, or None when no store is configured."""
+    if not root:
+        return None
+    return BlobStore(Path(root).expanduser())
+
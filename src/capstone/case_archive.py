@@ -0,0 +1,211 @@
+"""
+Zip / tar case archives read in place, without extraction.
+
+An archive placed in the evidence root (e.g. `CC07.zip`, `RH12.tar.gz`) is
+treated like the case directory of the same name:
+
+    capstone/synthetic_evidence/
+      CC02/            <- directory case
+      CC07.zip         <- archive case "CC07"
+
+The member index (zip central directory, or one pass over the tar headers)
+is read once per archive and cached; members are then read on demand. Zip
+and uncompressed tar members are read with random access. A compressed tar
+(.tar.gz, .tgz, .tar.bz2, .tar.xz) has no seekable offsets: reading a member
+decompresses the stream from the start up to it, so each read costs
+O(archive) and reading many members is quadratic. Prefer zip (or plain
+tar) for large cases. If every member sits under a single top-level folder
+named after the case (`CC07/timeline/...`), that folder is stripped so paths
+match what the directory layout would give.
+
+Evidence paths for archive members are reported as `<archive>/<member>`, the
+same convention zipimport and `zipfile.Path` use.
+"""
+
+import tarfile
+import threading
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Archives kept in the cache per process; each holds an open file handle.
+MAX_OPEN_ARCHIVES = 64
+
+
+def archive_suffix(path: Path) -> Optional[str]:
+    """The archive suffix of `path` (e.g. '.tar.gz'), or None."""
+    name = path.name.lower()
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return suffix
+    return None
+
+
+def is_case_archive(path: Path) -> bool:
+    return path.is_file() and archive_suffix(path) is not None
+
+
+def archive_case_id(path: Path) -> str:
+    """Case id of an archive: its file name without the archive suffix."""
+    suffix = archive_suffix(path) or ""
+    return path.name[:len(path.name) - len(suffix)]
+
+
+def find_case_archive(evidence_root: Path, case_id: str) -> Optional[Path]:
+    for suffix in ARCHIVE_SUFFIXES:
+        candidate = evidence_root / f"{case_id}{suffix}"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+class CaseArchiveError(ValueError):
+    """Raised when an archive cannot be opened or a member is missing."""
+
+
+class CaseArchive:
+    """
+    Read-only view over one zip or tar case archive.
+
+    `members()` lists regular files (case-relative POSIX paths, sorted);
+    `read_bytes()` / `read_text()` fetch one member and `open()` streams
+    one. Reads are serialised with a lock because zip and tar readers share
+    one file handle.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.case_id = archive_case_id(self.path)
+        self._lock = threading.Lock()
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        # case-relative member path -> (archive member name, size)
+        self._members: Dict[str, Tuple[str, int]] = {}
+        self._tar_infos: Dict[str, tarfile.TarInfo] = {}
+
+        try:
+            if zipfile.is_zipfile(self.path):
+                self._zip = zipfile.ZipFile(self.path)
+                entries = [(i.filename, i.file_size) for i in self._zip.infolist() if not i.is_dir()]
+            else:
+                # Mode "r:*" detects compression. For a plain tar, later reads
+                # seek to the member offset; for a compressed one, a seek
+                # backwards restarts decompression (see the module docstring).
+                self._tar = tarfile.open(self.path, mode="r:*")
+                entries = []
+                for info in self._tar.getmembers():
+                    if info.isfile():
+                        self._tar_infos[info.name] = info
+                        entries.append((info.name, info.size))
+        except (OSError, tarfile.TarError, zipfile.BadZipFile) as e:
+            self.close()
+            raise CaseArchiveError(f"Cannot read case archive {self.path}: {e}") from e
+
+        self._index(entries)
+
+    def _index(self, entries: List[Tuple[str, int]]) -> None:
+        names = [PurePosixPath(name[2:] if name.startswith("./") else name) for name, _ in entries]
+        prefix = self.case_id
+        strip = bool(names) and all(len(n.parts) > 1 and n.parts[0] == prefix for n in names)
+        for (name, size), posix in zip(entries, names):
+            rel = PurePosixPath(*posix.parts[1:]) if strip else posix
+            self._members[rel.as_posix()] = (name, size)
+        self._members = dict(sorted(self._members.items()))
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def members(self, prefix: str = "") -> List[str]:
+        """Case-relative paths of regular files, optionally under `prefix/`."""
+        if not prefix:
+            return list(self._members)
+        prefix = prefix.rstrip("/") + "/"
+        return [m for m in self._members if m.startswith(prefix)]
+
+    def size(self, member: str) -> int:
+        return self._entry(member)[1]
+
+    def read_bytes(self, member: str) -> bytes:
+        with self.open(member) as f:
+            return f.read()
+
+    @contextmanager
+    def open(self, member: str) -> Iterator[IO[bytes]]:
+        """
+        Binary stream over one member, for reading only part of it. The
+        archive stays locked until the stream is closed, so keep it short.
+        """
+        name, _ = self._entry(member)
+        with self._lock:
+            if self._zip is not None:
+                f = self._zip.open(name)
+            else:
+                f = self._tar.extractfile(self._tar_infos[name])
+                if f is None:
+                    raise CaseArchiveError(f"{member} in {self.path} is not a regular file")
+            with f:
+                yield f
+
+    def read_text(self, member: str, encoding: str = "utf-8") -> str:
+        return self.read_bytes(member).decode(encoding)
+
+    def member_path(self, member: str) -> Path:
+        """Display path of a member: `<archive>/<member>`."""
+        return self.path / member
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+    def __del__(self) -> None:
+        # Archives evicted from the cache are closed here, once unreferenced.
+        self.close()
+
+    def _entry(self, member: str) -> Tuple[str, int]:
+        try:
+            return self._members[member]
+        except KeyError:
+            raise CaseArchiveError(f"No member {member!r} in {self.path}") from None
+
+
+_CACHE: "OrderedDict[Tuple[str, int, int], CaseArchive]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def open_case_archive(path: Path) -> CaseArchive:
+    """
+    Cached CaseArchive for `path`. The cache key includes the file's size and
+    mtime, so a replaced archive is re-indexed on the next call.
+
+    Archives dropped from the cache (LRU eviction, or replaced on disk) are
+    not closed here: other threads may still be reading them. Their file
+    handles are released when the last reference goes away.
+    """
+    st = path.stat()
+    key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    with _CACHE_LOCK:
+        archive = _CACHE.get(key)
+        if archive is not None:
+            _CACHE.move_to_end(key)
+            return archive
+
+    archive = CaseArchive(path)
+    with _CACHE_LOCK:
+        existing = _CACHE.get(key)
+        if existing is not None:
+            archive.close()
+            return existing
+        # Drop stale entries for the same file before caching the new one.
+        for old_key in [k for k in _CACHE if k[0] == key[0]]:
+            del _CACHE[old_key]
+        _CACHE[key] = archive
+        while len(_CACHE) > MAX_OPEN_ARCHIVES:
+            _CACHE.popitem(last=False)
+    return archive
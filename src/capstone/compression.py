@@ -0,0 +1,203 @@
+"""
+Negotiated response compression as a plain ASGI middleware.
+
+Analysis responses are mostly repetitive timeline text and compress very
+well. `CompressionMiddleware` picks an encoding from the request's
+`Accept-Encoding` (q-values honoured, zstd preferred over gzip on ties)
+and compresses compressible content types:
+
+- single-message bodies smaller than `minimum_size` are sent as-is;
+- streamed bodies (`more_body`) are compressed chunk by chunk, each chunk
+  flushed to a block boundary so clients can decode it as soon as it
+  arrives.
+
+gzip is always available; zstd is used when the `zstandard` package (or
+the Python 3.14+ `compression.zstd` module) is installed.
+"""
+
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from compression import zstd as _stdlib_zstd  # Python 3.14+
+except ImportError:
+    _stdlib_zstd = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional encoder
+    zstandard = None  # type: ignore
+
+HAS_ZSTD = _stdlib_zstd is not None or zstandard is not None
+
+# Preference order when a client accepts several encodings with equal q.
+SUPPORTED_ENCODINGS = ("zstd", "gzip") if HAS_ZSTD else ("gzip",)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "text/",
+)
+
+Message = Dict[str, Any]
+Headers = List[Tuple[bytes, bytes]]
+
+
+def negotiate_encoding(accept_encoding: str, supported: Tuple[str, ...] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """Best supported encoding for an `Accept-Encoding` value, or None for identity."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best: Optional[str] = None
+    best_q = 0.0
+    for encoding in supported:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor with a flush-to-block-boundary step."""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31 = gzip container
+        elif _stdlib_zstd is not None:
+            self._obj = _stdlib_zstd.ZstdCompressor(level=zstd_level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush_block(self) -> bytes:
+        if self.encoding == "gzip":
+            return self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if _stdlib_zstd is not None:
+            return self._obj.flush(_stdlib_zstd.ZstdCompressor.FLUSH_BLOCK)
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def _header(headers: Headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _without(headers: Headers, *names: bytes) -> Headers:
+    return [(k, v) for k, v in headers if k.lower() not in names]
+
+
+def _add_vary(headers: Headers) -> Headers:
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower():
+        return headers
+    return _without(headers, b"vary") + [(b"vary", vary + b", Accept-Encoding")]
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with the negotiated encoding."""
+
+    def __init__(
+        self,
+        app: Callable[..., Awaitable[None]],
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = _header(scope.get("headers", []), b"accept-encoding")
+        encoding = negotiate_encoding(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(send, encoding, self)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """Wraps `send` for one response; decides on the first body message."""
+
+    def __init__(self, send: Callable, encoding: str, config: CompressionMiddleware):
+        self.send = send
+        self.encoding = encoding
+        self.config = config
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not self._should_compress(start, body, more_body):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding, self.config.gzip_level, self.config.zstd_level)
+            headers = _add_vary(_without(list(start.get("headers", [])), b"content-length"))
+            headers.append((b"content-encoding", self.encoding.encode("ascii")))
+            if not more_body:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers.append((b"content-length", str(len(body)).encode("ascii")))
+                await self.send({**start, "headers": headers})
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send({**start, "headers": headers})
+
+        if more_body:
+            chunk = self.compressor.compress(body) + self.compressor.flush_block()
+        else:
+            chunk = self.compressor.compress(body) + self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _should_compress(self, start: Message, body: bytes, more_body: bool) -> bool:
+        if start.get("status", 200) in (204, 206, 304):
+            return False
+        headers = start.get("headers", [])
+        if _header(headers, b"content-encoding") is not None:
+            return False
+        content_type = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        return more_body or len(body) >= self.config.minimum_size
@@ -0,0 +1,100 @@
+"""
+Per-request deadlines for the analysis pipeline.
+
+A `Deadline` is created once per request and passed down through every
+stage. Long-running loops call `check_deadline()` so outstanding work stops
+shortly after the deadline expires, and the caller can return whatever
+finished in time instead of holding the worker:
+
+    deadline = Deadline.from_ms(2000)
+    for path in files:
+        check_deadline(deadline, "read_timeline_files")
+        ...
+
+Cancellation is cooperative: a stage is only interrupted at its next check.
+A `CancellableDeadline` can also be expired early with `cancel()`, which is
+how background jobs are cancelled while they run.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised by `check_deadline` once the request deadline has passed.
+
+    `stage` names the stage that was cut short; `timeline` carries any
+    timeline events read before the deadline so they can still be returned.
+    """
+
+    def __init__(self, stage: str, timeline: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(f"Deadline exceeded during stage '{stage}'")
+        self.stage = stage
+        self.timeline = timeline
+
+
+class Deadline:
+    """Absolute point in time (on `clock`) after which work should stop."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.seconds = seconds
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    @classmethod
+    def from_ms(cls, ms: Optional[float]) -> Optional["Deadline"]:
+        """Deadline `ms` milliseconds from now, or None when `ms` is unset/zero."""
+        if not ms:
+            return None
+        return cls(ms / 1000.0)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def check(self, stage: str) -> None:
+        if self.expired():
+            raise DeadlineExceeded(stage)
+
+
+class CancellableDeadline(Deadline):
+    """
+    Deadline that also expires as soon as `cancel()` is called. With no
+    time limit (`seconds=None`) it only ever expires through `cancel()`.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        super().__init__(math.inf if seconds is None else seconds, clock)
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def remaining(self) -> float:
+        if self.cancelled:
+            return 0.0
+        # Bounded so it can be passed straight to lock/wait timeouts.
+        return min(super().remaining(), threading.TIMEOUT_MAX)
+
+    def expired(self) -> bool:
+        return self.cancelled or super().expired()
+
+
+def check_deadline(deadline: Optional[Deadline], stage: str) -> None:
+    """`deadline.check(stage)`, tolerating requests without a deadline."""
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def remaining(deadline: Optional[Deadline]) -> Optional[float]:
+    """Seconds left, or None (no limit) for requests without a deadline."""
+    return deadline.remaining() if deadline is not None else None
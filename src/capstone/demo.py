@@ -1,9 +1,12 @@
 # src/capstone/demo.py
 
 import argparse
+import hashlib
+import os
 from dataclasses import dataclass
-from pathlib import Path
-from typing import List, Dict, Any, Optional
+from datetime import date
+from pathlib import Path, PurePosixPath
+from typing import List, Dict, Any, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
@@ -23,6 +26,32 @@ except Exception:
     RouterAgent = None  # type: ignore
     HAS_ROUTER = False
 
+try:
+    from .agents.snapshot import SnapshotError
+except Exception:
+    SnapshotError = ValueError  # type: ignore
+
+try:
+    from .manifest_index import ManifestIndex, SharedManifestIndex, open_manifest_index
+except Exception:
+    ManifestIndex = SharedManifestIndex = None  # type: ignore
+    open_manifest_index = None  # type: ignore
+
+try:
+    from .agents.session_pool import CaseSession, SessionPool
+    HAS_SESSION_POOL = True
+except Exception:
+    CaseSession = SessionPool = None  # type: ignore
+    HAS_SESSION_POOL = False
+
+# The cross-case event store needs NumPy.
+try:
+    from .event_store import CrossCaseEventStore
+    HAS_EVENT_STORE = True
+except Exception:
+    CrossCaseEventStore = None  # type: ignore
+    HAS_EVENT_STORE = False
+
 # Try to import QnAAgent; fall back if not needed yet
 try:
     from .agents.qa_agent import QnAAgent  # relative import
@@ -31,6 +60,19 @@ except Exception:
     QnAAgent = None  # type: ignore
     HAS_QA = False
 
+from .blob_store import BlobStore, BlobStoreError, open_blob_store
+from .case_archive import (
+    CaseArchiveError,
+    archive_case_id,
+    find_case_archive,
+    is_case_archive,
+    open_case_archive,
+)
+from .deadline import Deadline, DeadlineExceeded, check_deadline, remaining
+from .instrumentation import INSTRUMENTATION, SpanRecorder
+from .jobs import DEFAULT_RETENTION_S, JobStore
+from .timeline_store import CaseTimeline, TimelineStore
+
 console = Console()
 
 
@@ -46,40 +88,90 @@ class CaseChoice:
 
 def discover_cases(root: Path) -> List[CaseChoice]:
     """
-    Discover cases as immediate subdirectories under `root`.
+    Discover cases as immediate subdirectories (or zip/tar archives) under `root`.
 
     Example:
         capstone/synthetic_evidence/
           CC02/
           RH10/
+          CC07.zip     <- read in place, see capstone/case_archive.py
+
+    A directory wins over an archive with the same case_id.
     """
     if not root.exists():
         console.print(f"[bold red][ERROR][/bold red] Evidence root does not exist: {root}")
         return []
 
-    subdirs = [p for p in sorted(root.iterdir()) if p.is_dir()]
+    entries = sorted(root.iterdir())
+    subdirs = [p for p in entries if p.is_dir()]
+    archives = [p for p in entries if is_case_archive(p)]
 
     # If no subdirs, treat root as a single pseudo-case
-    if not subdirs:
+    if not subdirs and not archives:
         return [CaseChoice(case_id="DEFAULT", path=root)]
 
-    cases: List[CaseChoice] = []
+    cases: Dict[str, CaseChoice] = {}
+    for p in archives:
+        cases.setdefault(archive_case_id(p), CaseChoice(case_id=archive_case_id(p), path=p))
     for p in subdirs:
-        cases.append(CaseChoice(case_id=p.name, path=p))
-    return cases
+        cases[p.name] = CaseChoice(case_id=p.name, path=p)
+    return [cases[cid] for cid in sorted(cases)]
+
+
+def resolve_case_path(evidence_root: Path, case_id: str) -> Optional[Path]:
+    """The case directory, or failing that a case archive, for `case_id`."""
+    case_dir = evidence_root / case_id
+    if case_dir.is_dir():
+        return case_dir
+    return find_case_archive(evidence_root, case_id)
 
 
-def load_evidence_for_case(case: CaseChoice) -> List[Dict[str, Any]]:
+def load_evidence_for_case(
+    case: CaseChoice,
+    index: Optional["ManifestIndex"] = None,
+) -> List[Dict[str, Any]]:
     """
     Walk the case directory and build a simple evidence record list.
 
     Category heuristic:
       - First path component under the case directory (e.g., 'pleadings', 'emails').
       - If files are directly under the case root, category='uncategorized'.
+
+    When a manifest `index` is given and it is fresh for this case, records
+    are read from the index instead of walking the directory.
     """
+    records, _source = _load_evidence_with_source(case, index)
+    return records
+
+
+def _load_evidence_with_source(
+    case: CaseChoice,
+    index: Optional["ManifestIndex"] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Like load_evidence_for_case, also reporting 'manifest' or 'walk'."""
+    if index is not None and case.path.name == case.case_id:
+        with INSTRUMENTATION.timed("evidence.manifest_lookup"):
+            indexed = index.records_for(case.case_id, case.path.parent)
+        if indexed is not None:
+            INSTRUMENTATION.incr("evidence.manifest_hits")
+            return indexed, "manifest"
+        INSTRUMENTATION.incr("evidence.manifest_misses")
+
+    with INSTRUMENTATION.timed("evidence.walk"):
+        records = _walk_case(case, deadline)
+    INSTRUMENTATION.incr("evidence.walk_files", len(records))
+    return records, "walk"
+
+
+def _walk_case(case: CaseChoice, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+    if is_case_archive(case.path):
+        return _walk_archive(case, deadline)
+
     records: List[Dict[str, Any]] = []
 
     for file_path in case.path.rglob("*"):
+        check_deadline(deadline, "load_evidence")
         if not file_path.is_file():
             continue
 
@@ -104,24 +196,68 @@ def load_evidence_for_case(case: CaseChoice) -> List[Dict[str, Any]]:
     return records
 
 
-def derive_timeline_events(evidence_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _walk_archive(case: CaseChoice, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+    """Evidence records from a case archive's member index (no extraction)."""
+    archive = open_case_archive(case.path)
+    records: List[Dict[str, Any]] = []
+
+    for member in archive.members():
+        check_deadline(deadline, "load_evidence")
+        rel = PurePosixPath(member)
+        parts = rel.parts
+
+        if len(parts) > 1:
+            category = parts[0]
+        else:
+            category = "uncategorized"
+
+        records.append({
+            "id": str(Path(*parts)),
+            "case_id": case.case_id,
+            "category": category,
+            "title": rel.stem,
+            "path": str(archive.member_path(member)),
+            "ext": rel.suffix.lower(),
+        })
+
+    return records
+
+
+def derive_timeline_events(
+    evidence_records: List[Dict[str, Any]],
+    hashes: Optional[Dict[str, str]] = None,
+    store: Optional[BlobStore] = None,
+) -> List[Dict[str, Any]]:
     """
     Simple heuristic:
 
     - Any evidence with category 'timeline' (case/timeline/...) becomes an event.
-    - We don't parse actual dates yet; just use filename as 'title'.
+    - The filename is the 'title'.
+    - With a blob `store` and the case's `hashes` ({path: sha256}), the event
+      takes its earliest date and its entity names from the derived artifacts
+      of the source blob, which are computed once per unique content;
+      otherwise 'timestamp' is None.
     """
     events: List[Dict[str, Any]] = []
-    for rec in evidence_records:
-        cat = (rec.get("category") or "").lower()
-        if cat == "timeline":
-            events.append(
-                {
+    with INSTRUMENTATION.timed("timeline.derive"):
+        for rec in evidence_records:
+            cat = (rec.get("category") or "").lower()
+            if cat == "timeline":
+                event = {
                     "title": rec.get("title", "<untitled>"),
                     "timestamp": None,
                     "source_path": rec.get("path"),
                 }
-            )
+                digest = (hashes or {}).get(rec.get("path"))
+                if store is not None and digest:
+                    try:
+                        artifacts = store.derived(digest)
+                    except BlobStoreError:
+                        artifacts = None
+                    if artifacts:
+                        event["timestamp"] = (artifacts.get("dates") or [None])[0]
+                        event["entities"] = sorted(artifacts.get("entities") or {})
+                events.append(event)
     return events
 
 
@@ -158,10 +294,25 @@ def interactive_choose_case(choices: List[CaseChoice]) -> Optional[CaseChoice]:
 # --- Core demo flow ---------------------------------------------------------
 
 
+def _restore_router(snapshot_path: Optional[Path]) -> Optional["RouterAgent"]:
+    """Warm-start a RouterAgent from `snapshot_path`, or None if unusable."""
+    if snapshot_path is None or not snapshot_path.exists():
+        return None
+    try:
+        router = RouterAgent.from_snapshot(snapshot_path)
+    except SnapshotError as e:
+        console.print(f"[yellow]Ignoring snapshot {snapshot_path}: {e}[/yellow]")
+        return None
+    console.print(f"[bold blue][INFO][/bold blue] Restored agent state from snapshot {snapshot_path}")
+    return router
+
+
 def run_interactive_demo(
     root: Path,
     case_id: Optional[str] = None,
     ask: Optional[str] = None,
+    snapshot_path: Optional[Path] = None,
+    use_manifest: bool = True,
 ) -> None:
     cases = discover_cases(root)
     if not cases:
@@ -188,9 +339,37 @@ def run_interactive_demo(
         border_style="cyan",
     ))
 
-    # 1) Load evidence records
-    evidence_records = load_evidence_for_case(chosen)
-    console.print(f"[bold blue][INFO][/bold blue] Loaded [bold]{len(evidence_records)}[/bold] evidence records for this case.")
+    router = _restore_router(snapshot_path)
+    try:
+        _run_demo_case(root, chosen, ask, router, snapshot_path, use_manifest)
+    finally:
+        if router is not None:
+            router.close()
+
+
+def _run_demo_case(
+    root: Path,
+    chosen: CaseChoice,
+    ask: Optional[str],
+    router: Optional["RouterAgent"],
+    snapshot_path: Optional[Path],
+    use_manifest: bool,
+) -> None:
+    # The snapshot's state for this case is only reused while the case's
+    # directories are unchanged since it was saved.
+    source_mtime_ns = _newest_dir_mtime_ns(chosen.path)
+    cached_state = router.case_state(chosen.case_id, source_mtime_ns) if router else None
+    if router is not None and cached_state is None and router.case_state(chosen.case_id) is not None:
+        console.print("[bold blue][INFO][/bold blue] Snapshot state for this case is stale; reloading.")
+
+    # 1) Load evidence records (from the snapshot when it already has this case)
+    if cached_state is not None:
+        evidence_records = cached_state["evidence"]
+        console.print(f"[bold blue][INFO][/bold blue] Reused [bold]{len(evidence_records)}[/bold] evidence records from snapshot.")
+    else:
+        index = open_manifest_index(root) if use_manifest and open_manifest_index else None
+        evidence_records = load_evidence_for_case(chosen, index)
+        console.print(f"[bold blue][INFO][/bold blue] Loaded [bold]{len(evidence_records)}[/bold] evidence records for this case.")
 
     if evidence_records:
         table = Table(show_header=True, header_style="bold magenta")
@@ -210,13 +389,18 @@ def run_interactive_demo(
         console.print(f"[yellow]No evidence files found under {chosen.path}[/yellow]")
 
     # 2) Derive timeline events
-    timeline_events = derive_timeline_events(evidence_records)
+    if cached_state is not None:
+        timeline_events = cached_state["timeline"]
+    else:
+        store = _get_blob_store()
+        timeline_events = derive_timeline_events(evidence_records, _case_hashes(chosen, store), store)
     console.print(f"\n[bold blue][INFO][/bold blue] Derived [bold]{len(timeline_events)}[/bold] timeline events.")
 
     # 3) Run multi-agent pipeline via RouterAgent
     console.print(Panel.fit("Running agent pipeline...", border_style="green"))
-    router = RouterAgent()
-    router.run_case_pipeline(chosen.case_id, evidence_records, timeline_events)
+    if router is None:
+        router = RouterAgent()
+    router.run_case_pipeline(chosen.case_id, evidence_records, timeline_events, source_mtime_ns)
 
     # 4) Show EvidenceAgent + TimelineAgent outputs from memory
     console.print(Panel.fit(
@@ -250,7 +434,7 @@ def run_interactive_demo(
 
     # Optional: try to get a hash manifest from the RouterAgent's memory.
     # If none is present, we fall back to an empty dict.
-    hash_manifest = router.memory.get("hash_manifest", {})
+    hash_manifest = router.memory.get("hash_manifest", {}) or _case_hashes(chosen, _get_blob_store())
 
     # Construct the rule-based QnAAgent directly from evidence + timeline.
     qna = QnAAgent(
@@ -262,6 +446,10 @@ def run_interactive_demo(
     answer = qna.answer(question)
     console.print(answer)
 
+    if snapshot_path is not None:
+        router.save_snapshot(snapshot_path)
+        console.print(f"[bold blue][INFO][/bold blue] Saved agent state snapshot to {snapshot_path}")
+
     console.print("\n[bold green][OK][/bold green] Demo completed.")
 
 
@@ -290,12 +478,25 @@ def main() -> None:
         default=None,
         help="Optional question to ask the QnAAgent after running the pipeline.",
     )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        default=None,
+        help="Optional snapshot file: restore agent state from it on start and save it on exit.",
+    )
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Always walk the case directory instead of reading the manifest index.",
+    )
     args = parser.parse_args()
 
     run_interactive_demo(
         root=args.root,
         case_id=args.case_id,
         ask=args.ask,
+        snapshot_path=args.snapshot,
+        use_manifest=not args.no_manifest,
     )
     
 from pathlib import Path
@@ -323,58 +524,319 @@ def _get_project_root() -> Path:
 def _get_evidence_root() -> Path:
     """
     Points to: <repo-root>/capstone/synthetic_evidence
+
+    Set LEXFABRIC_EVIDENCE_ROOT to serve another corpus (e.g. a generated
+    benchmark corpus) without moving files.
     """
+    override = os.environ.get("LEXFABRIC_EVIDENCE_ROOT")
+    if override:
+        return Path(override).expanduser().resolve()
     return _get_project_root() / "capstone" / "synthetic_evidence"
 
 
-def _build_naive_timeline(case_id: str) -> List[Dict[str, str]]:
+def _build_naive_timeline(case_id: str, deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
     """
     Minimal deterministic timeline from the synthetic text files,
     used as a fallback if we don't (yet) wire the real agents.
+
+    If `deadline` expires part-way, DeadlineExceeded carries the events
+    read so far. Archive cases are read member by member, without extraction.
+    """
+    return _refresh_case_timeline(case_id, deadline).public_events()
+
+
+def _get_timeline_store() -> TimelineStore:
+    """
+    Versioned timeline state for the current evidence root, persisted under
+    LEXFABRIC_TIMELINE_DIR (default: <repo>/.timelines/<evidence root digest>).
     """
+    global _TIMELINE_STORE
     evidence_root = _get_evidence_root()
-    case_dir = evidence_root / case_id / "timeline"
+    base = os.environ.get("LEXFABRIC_TIMELINE_DIR")
+    base_dir = Path(base).expanduser() if base else _get_project_root() / ".timelines"
+    directory = base_dir / hashlib.sha1(str(evidence_root).encode("utf-8")).hexdigest()[:12]
+    if _TIMELINE_STORE is None or _TIMELINE_STORE.directory != directory:
+        include_emails = os.environ.get("LEXFABRIC_EMAIL_EVENTS", "1").lower() not in ("0", "false", "no")
+        rescan = float(os.environ.get("LEXFABRIC_TIMELINE_RESCAN_S", "30") or 0)
+        _TIMELINE_STORE = TimelineStore(directory, include_emails=include_emails, rescan_interval=rescan)
+    return _TIMELINE_STORE
 
-    if not case_dir.exists():
-        raise FileNotFoundError(f"Timeline folder not found for case {case_id}: {case_dir}")
 
-    events: List[Dict[str, str]] = []
+def _refresh_case_timeline(case_id: str, deadline: Optional[Deadline] = None) -> CaseTimeline:
+    """
+    Bring the persisted timeline of `case_id` up to date, re-reading only
+    timeline files and email headers added or changed since the last refresh.
+    """
+    evidence_root = _get_evidence_root()
+    case_path = resolve_case_path(evidence_root, case_id) or evidence_root / case_id
+    try:
+        return _get_timeline_store().refresh(case_id, case_path, deadline)
+    except CaseArchiveError as e:
+        raise FileNotFoundError(str(e)) from e
 
-    for txt_file in sorted(case_dir.glob("*.txt")):
-        content = txt_file.read_text(encoding="utf-8").strip()
-        events.append({
-            "date": txt_file.stem,   # e.g. "01_initial_filing"
-            "event": content,
-        })
 
-    return events
+_TIMELINE_STORE: Optional[TimelineStore] = None
+
 
+def _list_case_ids() -> List[str]:
+    evidence_root = _get_evidence_root()
+    if not evidence_root.exists():
+        return []
+    return [c.case_id for c in discover_cases(evidence_root) if c.path != evidence_root]
+
+
+def _load_case_events(case_id: str) -> Tuple[int, List[Dict[str, str]]]:
+    case_timeline = _refresh_case_timeline(case_id)
+    return case_timeline.version, case_timeline.events()
+
+
+_EVENT_STORE: Optional["CrossCaseEventStore"] = None
+_EVENT_STORE_ROOT: Optional[Path] = None
+
+
+def _get_event_store() -> "CrossCaseEventStore":
+    """Process-wide cross-case event store for the current evidence root."""
+    global _EVENT_STORE, _EVENT_STORE_ROOT
+    if not HAS_EVENT_STORE:
+        raise RuntimeError("The cross-case event store requires NumPy (pip install numpy)")
+    evidence_root = _get_evidence_root()
+    if _EVENT_STORE is None or _EVENT_STORE_ROOT != evidence_root:
+        _EVENT_STORE = CrossCaseEventStore(_list_case_ids, _load_case_events)
+        _EVENT_STORE_ROOT = evidence_root
+    return _EVENT_STORE
+
+
+def query_events(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    case_prefix: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    title_contains: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Timeline events across all cases, filtered by inclusive date range, case_id
+    prefix, event category and title substring, in (date, case) order.
+    """
+    return _get_event_store().query(
+        start=start,
+        end=end,
+        case_prefix=case_prefix,
+        categories=categories,
+        title_contains=title_contains,
+        offset=offset,
+        limit=limit,
+    )
 
-def analyze_case(case_id: str, user_query: Optional[str] = None) -> Dict[str, Any]:
+
+_MANIFEST_INDEX: Optional["ManifestIndex"] = None
+_SHARED_INDEX: Optional["SharedManifestIndex"] = None
+
+
+def _shared_index_enabled() -> bool:
+    return os.environ.get("LEXFABRIC_SHARED_INDEX", "").lower() in ("1", "true", "yes")
+
+
+def _get_manifest_index() -> Optional["ManifestIndex"]:
+    """
+    Process-wide manifest index for the evidence root, reopened (and rebuilt
+    if needed) whenever the manifest or index on disk changes.
+
+    With LEXFABRIC_SHARED_INDEX=1 the index is published once per generation
+    and attached by every worker process (see SharedManifestIndex).
+    """
+    global _MANIFEST_INDEX, _SHARED_INDEX
+    if open_manifest_index is None:
+        return None
+
+    if _shared_index_enabled():
+        root = _get_evidence_root()
+        if _SHARED_INDEX is None or _SHARED_INDEX.evidence_root != root:
+            try:
+                _SHARED_INDEX = SharedManifestIndex(root)
+            except OSError:
+                # Read-only evidence root: fall back to the per-process index.
+                _SHARED_INDEX = None
+        if _SHARED_INDEX is not None:
+            return _SHARED_INDEX.current()
+
+    if _MANIFEST_INDEX is not None and _MANIFEST_INDEX.is_current():
+        return _MANIFEST_INDEX
+
+    old, _MANIFEST_INDEX = _MANIFEST_INDEX, open_manifest_index(_get_evidence_root())
+    if old is not None:
+        old.close()
+    return _MANIFEST_INDEX
+
+
+_BLOB_STORE: Optional[BlobStore] = None
+
+
+def _get_blob_store() -> Optional[BlobStore]:
+    """Content-addressed store named by LEXFABRIC_BLOB_STORE, if configured."""
+    global _BLOB_STORE
+    root = os.environ.get("LEXFABRIC_BLOB_STORE")
+    if not root:
+        return None
+    if _BLOB_STORE is None or _BLOB_STORE.root != Path(root).expanduser():
+        _BLOB_STORE = open_blob_store(root)
+    return _BLOB_STORE
+
+
+_JOB_STORE: Optional[JobStore] = None
+
+
+def _get_job_store() -> JobStore:
+    """
+    Durable job table at LEXFABRIC_JOB_DB (default: <repo>/.jobs/jobs.sqlite3),
+    shared by every worker process pointing at the same file.
+    """
+    global _JOB_STORE
+    override = os.environ.get("LEXFABRIC_JOB_DB")
+    path = Path(override).expanduser() if override else _get_project_root() / ".jobs" / "jobs.sqlite3"
+    if _JOB_STORE is None or _JOB_STORE.path != path:
+        retention = float(os.environ.get("LEXFABRIC_JOB_RETENTION_S", "0") or 0) or DEFAULT_RETENTION_S
+        _JOB_STORE = JobStore(path, retention_s=retention)
+    return _JOB_STORE
+
+
+_ACCESS_LOG: Optional["AccessLog"] = None
+
+
+def _get_access_log() -> "AccessLog":
+    """
+    Per-case access counts that pick the cases preloaded at startup, at
+    LEXFABRIC_ACCESS_LOG (default: <repo>/.warmup/access_log.sqlite3).
+    """
+    global _ACCESS_LOG
+    from .warmup import AccessLog  # warmup imports this module
+
+    override = os.environ.get("LEXFABRIC_ACCESS_LOG")
+    path = Path(override).expanduser() if override else _get_project_root() / ".warmup" / "access_log.sqlite3"
+    if _ACCESS_LOG is None or _ACCESS_LOG.path != path:
+        _ACCESS_LOG = AccessLog(path)
+    return _ACCESS_LOG
+
+
+def _case_hashes(case: CaseChoice, store: Optional[BlobStore]) -> Dict[str, str]:
+    """{evidence path: sha256} from the blob store's manifest for this case."""
+    if store is None:
+        return {}
+    try:
+        return store.hash_manifest(case.case_id, case.path)
+    except BlobStoreError as e:
+        console.print(f"[yellow]Ignoring blob store manifest for {case.case_id}: {e}[/yellow]")
+        return {}
+
+
+# Warm per-case sessions shared by analyze_case() calls in this process.
+SESSION_POOL = SessionPool() if HAS_SESSION_POOL else None
+
+
+def _build_case_session(
+    case_id: str,
+    spans: Optional[SpanRecorder] = None,
+    deadline: Optional[Deadline] = None,
+) -> "CaseSession":
+    """
+    Load, derive and run the agent pipeline once for `case_id`.
+
+    The result is cached in SESSION_POOL so follow-up requests for the same
+    case skip straight to the Q&A stage. Each stage is recorded in `spans`.
+    When `deadline` expires the build is abandoned (nothing is cached) and
+    DeadlineExceeded carries whatever timeline was read.
+    """
+    spans = spans or SpanRecorder()
+    evidence_root = _get_evidence_root()
+    case = CaseChoice(case_id=case_id, path=resolve_case_path(evidence_root, case_id) or evidence_root / case_id)
+
+    with spans.span("read_timeline_files") as sp:
+        case_timeline = _refresh_case_timeline(case_id, deadline)
+        naive_timeline = case_timeline.public_events()
+        sp["items"] = len(naive_timeline)
+    # Taken before the evidence is read, so a change made during the build
+    # makes the session stale rather than being missed.
+    source_mtime_ns = _case_source_mtime_ns(case_id, case_timeline)
+
+    try:
+        with spans.span("load_evidence") as sp:
+            check_deadline(deadline, "load_evidence")
+            evidence_records, source = _load_evidence_with_source(case, _get_manifest_index(), deadline)
+            sp["items"] = len(evidence_records)
+            sp["cache"] = "hit" if source == "manifest" else "miss"
+
+        with spans.span("derive_timeline") as sp:
+            check_deadline(deadline, "derive_timeline")
+            store = _get_blob_store()
+            hashes = _case_hashes(case, store)
+            timeline_events = derive_timeline_events(evidence_records, hashes, store)
+            sp["items"] = len(timeline_events)
+
+        with spans.span("agent_pipeline") as sp:
+            check_deadline(deadline, "agent_pipeline")
+            router = RouterAgent()
+            router.run_case_pipeline(case_id, evidence_records, timeline_events)
+            if hashes:
+                router.memory.set("hash_manifest", hashes)
+            qna = QnAAgent(
+                evidence=evidence_records,
+                timeline=timeline_events,
+                hashes=router.memory.get("hash_manifest", {}),
+            )
+            sp["items"] = len(evidence_records) + len(timeline_events)
+    except DeadlineExceeded as e:
+        e.timeline = naive_timeline
+        raise
+
+    return CaseSession(
+        case_id=case_id,
+        router=router,
+        qna=qna,
+        state={
+            "naive_timeline": naive_timeline,
+            "timeline_version": case_timeline.version,
+            "source_mtime_ns": source_mtime_ns,
+        },
+    )
+
+
+def analyze_case(
+    case_id: str,
+    user_query: Optional[str] = None,
+    spans: Optional[SpanRecorder] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
     """
     Refactored entry point for API usage.
     Returns a structured dictionary; NO prints, only data.
 
     It tries to use your Router (if present), otherwise falls back to
     a deterministic filesystem-based timeline using the synthetic evidence.
+
+    Every pipeline stage is timed; the spans (stage, start, duration, item
+    count, cache hit/miss) are returned under "spans".
+
+    With a `deadline`, stages still running when it expires are abandoned
+    and the stages that finished are returned with status "partial" and
+    "truncated" set.
     """
+    spans = spans or SpanRecorder()
     evidence_root = _get_evidence_root()
-    case_dir = evidence_root / case_id
 
-    if not case_dir.exists():
-        raise FileNotFoundError(f"Case {case_id} not found in synthetic store: {case_dir}")
+    with spans.span("resolve_case"):
+        case_dir = resolve_case_path(evidence_root, case_id)
+    if case_dir is None:
+        raise FileNotFoundError(f"Case {case_id} not found in synthetic store: {evidence_root / case_id}")
 
-    results: Dict[str, Any] = {
-        "case_id": case_id,
-        "status": "success",
-        "steps": [],
-        "timeline": [],
-        "final_answer": None,
-    }
+    results = _new_results(case_id, spans)
 
     results["steps"].append(f"Resolved project root at: {_get_project_root()}")
     results["steps"].append(f"Using evidence root: {evidence_root}")
-    results["steps"].append(f"Found case directory: {case_dir}")
+    if is_case_archive(case_dir):
+        results["steps"].append(f"Found case archive: {case_dir}")
+    else:
+        results["steps"].append(f"Found case directory: {case_dir}")
 
     # --- Preferred path: use your real multi-agent Router if available ---
     if HAS_ROUTER:
@@ -394,14 +856,267 @@ def analyze_case(case_id: str, user_query: Optional[str] = None) -> Dict[str, An
         return router_result
 
     # --- Fallback path: no Router wired yet, build a simple timeline from files ---
-    timeline = _build_naive_timeline(case_id)
-    results["timeline"] = timeline
+    try:
+        return _run_stages(case_id, user_query, spans, deadline, results)
+    except DeadlineExceeded as e:
+        return _truncate(results, e, deadline)
+    except TimeoutError:
+        if deadline is None:
+            raise
+        # Waiting on another request's session build outlived the deadline.
+        return _truncate(results, DeadlineExceeded("session"), deadline)
+
+
+def _new_results(case_id: str, spans: SpanRecorder) -> Dict[str, Any]:
+    return {
+        "case_id": case_id,
+        "status": "success",
+        "steps": [],
+        "timeline": [],
+        "final_answer": None,
+        "spans": spans.spans,
+        "truncated": False,
+        "timeline_version": None,
+    }
+
+
+def truncated_result(
+    case_id: str,
+    stage: str,
+    deadline: Optional[Deadline],
+    spans: Optional[SpanRecorder] = None,
+) -> Dict[str, Any]:
+    """
+    The partial analyze_case result for a request whose deadline expired
+    before `stage` could start, e.g. while it waited for an admission slot.
+    """
+    spans = spans or SpanRecorder()
+    evidence_root = _get_evidence_root()
+    if resolve_case_path(evidence_root, case_id) is None:
+        raise FileNotFoundError(f"Case {case_id} not found in synthetic store: {evidence_root / case_id}")
+    return _truncate(_new_results(case_id, spans), DeadlineExceeded(stage), deadline)
+
+
+def timeline_diff(case_id: str, since: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Timeline changes for `case_id` after version `since`.
+
+    Clients poll with the last `timeline_version` they saw and apply
+    "removed" then "added" (events carry a stable "id"). When `since` is
+    None, unknown or older than the retained history, "reset" is True and
+    "added" holds the full timeline.
+    """
+    if resolve_case_path(_get_evidence_root(), case_id) is None:
+        raise FileNotFoundError(f"Case {case_id} not found in synthetic store: {_get_evidence_root() / case_id}")
+
+    case_timeline = _refresh_case_timeline(case_id)
+    if since is None:
+        diff = {"from_version": None, "to_version": case_timeline.version, "reset": True,
+                "added": case_timeline.events(), "removed": []}
+    else:
+        diff = case_timeline.diff(since)
+    return {"case_id": case_id, **diff}
+
+
+def _newest_dir_mtime_ns(case_path: Path) -> int:
+    """
+    Newest mtime of a case directory and its subdirectories, which moves
+    when files are added, removed or renamed; an archive's own mtime.
+    """
+    latest = case_path.stat().st_mtime_ns
+    if is_case_archive(case_path):
+        return latest
+    stack = [case_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    latest = max(latest, entry.stat().st_mtime_ns)
+                    stack.append(Path(entry.path))
+    return latest
+
+
+def _case_dirs_mtime_ns(case_id: str, case_path: Path) -> int:
+    """
+    Newest mtime of a case directory and its subdirectories, which moves
+    when evidence files are added, removed or renamed; an archive's own
+    mtime. The subdirectories are taken from the manifest index when it
+    lists the case, so this is one stat per directory rather than a walk.
+    """
+    if is_case_archive(case_path):
+        return case_path.stat().st_mtime_ns
+    latest = case_path.stat().st_mtime_ns
+    index = _get_manifest_index()
+    rel_dirs = index.case_dirs(case_id) if index is not None else []
+    if not rel_dirs:
+        return max(latest, _newest_dir_mtime_ns(case_path))
+    evidence_root = _get_evidence_root()
+    for rel_dir in rel_dirs:
+        try:
+            latest = max(latest, (evidence_root / rel_dir).stat().st_mtime_ns)
+        except FileNotFoundError:
+            continue  # removed since: the parent's mtime moved too
+    return latest
+
+
+def _case_source_mtime_ns(case_id: str, case_timeline: CaseTimeline) -> int:
+    """
+    Newest mtime among a case's directories and its timeline files and
+    emails (edited in place or not, via the timeline store).
+    """
+    case_path = resolve_case_path(_get_evidence_root(), case_id)
+    dirs_ns = _case_dirs_mtime_ns(case_id, case_path) if case_path is not None else 0
+    return max(dirs_ns, case_timeline.last_modified_ns)
+
+
+def case_last_modified(case_id: str) -> int:
+    """
+    Last modification time of a case (epoch seconds), for HTTP caching.
+
+    For an archive this is the archive's mtime. For a directory it is the
+    newest mtime of the case directory, its subdirectories (files added,
+    removed or renamed) and its timeline files and emails (edited in place,
+    seen by the timeline store's next full scan). Other evidence files
+    edited in place without touching their directory are not seen, the same
+    trade-off as the manifest index.
+
+    Warm agent sessions are rebuilt when the same signal moves, so a new
+    Last-Modified always comes with content built from the new files.
+    """
+    evidence_root = _get_evidence_root()
+    case_path = resolve_case_path(evidence_root, case_id)
+    if case_path is None:
+        raise FileNotFoundError(f"Case {case_id} not found in synthetic store: {evidence_root / case_id}")
+    if is_case_archive(case_path):
+        return int(case_path.stat().st_mtime)
+    return _case_source_mtime_ns(case_id, _refresh_case_timeline(case_id)) // 1_000_000_000
+
+
+def case_exists(case_id: str) -> bool:
+    """True if `case_id` resolves to a case directory or archive."""
+    return resolve_case_path(_get_evidence_root(), case_id) is not None
+
+
+def load_case_index() -> List[str]:
+    """
+    Resolve the evidence root and open (or build) its manifest index ahead
+    of the first request; returns the case_ids found.
+    """
+    case_ids = _list_case_ids()
+    _get_manifest_index()
+    return case_ids
+
+
+def preload_case(case_id: str, deadline: Optional[Deadline] = None) -> int:
+    """
+    Bring the timeline of `case_id` up to date and, when sessions are
+    available, build its warm agent session; returns its timeline length.
+    """
+    if SESSION_POOL is None or not HAS_QA:
+        return len(_refresh_case_timeline(case_id, deadline).events())
+    session = SESSION_POOL.get(
+        case_id,
+        lambda cid: _build_case_session(cid, None, deadline),
+        timeout=remaining(deadline),
+    )
+    return len(session.state["naive_timeline"])
+
+
+def _truncate(
+    results: Dict[str, Any],
+    exc: DeadlineExceeded,
+    deadline: Optional[Deadline],
+) -> Dict[str, Any]:
+    """Mark `results` as a partial answer cut short by `exc`."""
+    if exc.timeline is not None and not results["timeline"]:
+        results["timeline"] = list(exc.timeline)
+    if getattr(deadline, "cancelled", False):
+        results["steps"].append(f"Cancelled during stage '{exc.stage}'; returning partial results")
+    else:
+        budget = f"{deadline.seconds * 1000:.0f} ms " if deadline is not None else ""
+        results["steps"].append(
+            f"Deadline {budget}exceeded during stage '{exc.stage}'; returning partial results"
+        )
+    results["status"] = "partial"
+    results["truncated"] = True
+    INSTRUMENTATION.incr("analyze.truncated")
+    return results
+
+
+def _get_case_session(
+    case_id: str,
+    spans: SpanRecorder,
+    deadline: Optional[Deadline],
+) -> "CaseSession":
+    with spans.span("session") as sp:
+        check_deadline(deadline, "session")
+        session = SESSION_POOL.get(
+            case_id,
+            lambda cid: _build_case_session(cid, spans, deadline),
+            timeout=remaining(deadline),
+        )
+        sp["cache"] = "hit" if session.hits else "miss"
+    return session
+
+
+def _run_stages(
+    case_id: str,
+    user_query: Optional[str],
+    spans: SpanRecorder,
+    deadline: Optional[Deadline],
+    results: Dict[str, Any],
+) -> Dict[str, Any]:
+    if SESSION_POOL is None or not HAS_QA:
+        with spans.span("read_timeline_files") as sp:
+            case_timeline = _refresh_case_timeline(case_id, deadline)
+            timeline = case_timeline.public_events()
+            sp["items"] = len(timeline)
+        results["timeline"] = timeline
+        results["timeline_version"] = case_timeline.version
+        results["steps"].append(f"Timeline built from {len(timeline)} event file(s)")
+
+        if user_query:
+            # Placeholder: you can later hook this into qa_agent.ask(...)
+            results["steps"].append(f"Query received but QA agent not yet wired: {user_query}")
+            results["final_answer"] = None
+        return results
+
+    session = _get_case_session(case_id, spans, deadline)
+    if session.hits:
+        results["steps"].append(f"Reused warm agent session for case {case_id}")
+    else:
+        results["steps"].append(f"Built agent session for case {case_id}")
+
+    if session.hits:
+        with spans.span("refresh_timeline") as sp:
+            case_timeline = _refresh_case_timeline(case_id, deadline)
+            timeline_stale = case_timeline.version != session.state["timeline_version"]
+            stale = timeline_stale or (
+                _case_source_mtime_ns(case_id, case_timeline) != session.state["source_mtime_ns"]
+            )
+            sp["cache"] = "miss" if stale else "hit"
+        if stale:
+            # Evidence, derived events and agent memory all came from the old
+            # files, so the whole session is rebuilt, not just the timeline.
+            SESSION_POOL.invalidate(case_id, session)
+            session = _get_case_session(case_id, spans, deadline)
+            if timeline_stale:
+                results["steps"].append(
+                    f"Timeline updated to version {session.state['timeline_version']}; rebuilt agent session"
+                )
+            else:
+                results["steps"].append("Case evidence changed; rebuilt agent session")
+
+    timeline = session.state["naive_timeline"]
+    results["timeline"] = list(timeline)
+    results["timeline_version"] = session.state["timeline_version"]
     results["steps"].append(f"Timeline built from {len(timeline)} event file(s)")
 
     if user_query:
-        # Placeholder: you can later hook this into qa_agent.ask(...)
-        results["steps"].append(f"Query received but QA agent not yet wired: {user_query}")
-        results["final_answer"] = None
+        with spans.span("qna"):
+            check_deadline(deadline, "qna")
+            results["final_answer"] = session.qna.answer(user_query)
+        results["steps"].append(f"Query answered by QnAAgent: {user_query}")
 
     return results
 
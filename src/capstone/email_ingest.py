@@ -0,0 +1,304 @@
+"""
+Header-only ingestion of `.eml` evidence into dated timeline events.
+
+Only the RFC 822 header block is read: each file is consumed line by line
+up to the first blank line (at most MAX_HEADER_BYTES), so bodies and
+attachments are never loaded. The headers kept are
+
+    Date, From, To, Subject, Message-ID, In-Reply-To, References
+
+and every message becomes one timeline event:
+
+    {"id": "emails/a1/msg_00007.eml", "date": "2021-03-08T20:19:55+00:00",
+     "event": "Email from Grace Kim to Tom Okafor: Meeting notes",
+     "category": "email", "title": "Meeting notes",
+     "message_id": "<cc0040.6@northwind.example>", "in_reply_to": null,
+     "thread_id": "<cc0040.6@northwind.example>"}
+
+`thread_id` is the first Message-ID in References, else In-Reply-To, else
+the message's own id. It is derived from the message's own headers, so
+incremental re-ingestion never has to revisit other messages;
+`resolve_thread_roots` then follows In-Reply-To chains across the case for
+mailers that do not send References.
+
+Large batches are parsed on a process pool (LEXFABRIC_EMAIL_WORKERS
+processes, default: CPU count) in chunks of paths, which keeps per-message
+IPC to a small dict. Small batches and archive members are parsed in-process.
+"""
+
+import email.utils
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timezone
+from email.header import decode_header, make_header
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .deadline import Deadline, remaining
+
+EMAIL_SUFFIX = ".eml"
+MAX_HEADER_BYTES = 256 * 1024
+
+# Batches smaller than this are not worth the pool's IPC.
+POOL_MIN_MESSAGES = 256
+CHUNK_SIZE = 512
+
+_WANTED = ("date", "from", "to", "subject", "message-id", "in-reply-to", "references")
+
+# (case-relative path, filesystem path or None, reader returning the file's
+#  text or at least its header block)
+EmailSource = Tuple[str, Optional[Path], Callable[[], str]]
+
+
+# --------------------------------------------------------------------------- #
+# Parsing
+# --------------------------------------------------------------------------- #
+
+def read_header_block(path: Path) -> str:
+    """The header block of an .eml file, read line by line; the body is never read."""
+    with open(path, "rb") as f:
+        return read_header_stream(f)
+
+
+def read_header_stream(f: BinaryIO) -> str:
+    """The header block from a binary stream positioned at the start of a message."""
+    lines: List[bytes] = []
+    size = 0
+    for line in f:
+        if line in (b"\n", b"\r\n"):
+            break
+        lines.append(line)
+        size += len(line)
+        if size > MAX_HEADER_BYTES:
+            break
+    return b"".join(lines).decode("utf-8", errors="replace")
+
+
+def header_block_from_text(text: str) -> str:
+    for sep in ("\r\n\r\n", "\n\n"):
+        end = text.find(sep)
+        if end != -1:
+            return text[:end]
+    return text[:MAX_HEADER_BYTES]
+
+
+def parse_header_block(block: str) -> Dict[str, str]:
+    """Wanted headers (lower-cased names) with folded lines joined; first occurrence wins."""
+    headers: Dict[str, str] = {}
+    name: Optional[str] = None
+    for line in block.splitlines():
+        if line[:1] in (" ", "\t"):
+            if name is not None:
+                headers[name] += " " + line.strip()
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            name = None
+            continue
+        name = key.strip().lower()
+        if name in _WANTED and name not in headers:
+            headers[name] = value.strip()
+        else:
+            name = None  # continuation lines of this header are ignored
+    return headers
+
+
+def _decode(value: Optional[str]) -> Optional[str]:
+    if value and "=?" in value:
+        try:
+            return str(make_header(decode_header(value)))
+        except (LookupError, ValueError):
+            return value
+    return value
+
+
+def _msg_ids(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    ids = [f"<{part.split('>', 1)[0].strip()}>" for part in value.split("<")[1:] if ">" in part]
+    return ids or [value.strip()]
+
+
+def _display_name(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    name, addr = email.utils.parseaddr(value)
+    return name or addr or value
+
+
+def message_fields(headers: Dict[str, str]) -> Dict[str, Any]:
+    """Normalised message metadata from parsed headers."""
+    timestamp = None
+    if headers.get("date"):
+        try:
+            sent = email.utils.parsedate_to_datetime(headers["date"])
+            # UTC, so that ISO strings sort chronologically.
+            timestamp = (sent.astimezone(timezone.utc) if sent.tzinfo else sent).isoformat()
+        except (TypeError, ValueError):
+            timestamp = None
+
+    message_id = (_msg_ids(headers.get("message-id")) or [None])[0]
+    in_reply_to = (_msg_ids(headers.get("in-reply-to")) or [None])[0]
+    references = _msg_ids(headers.get("references"))
+    return {
+        "timestamp": timestamp,
+        "from": _decode(headers.get("from")),
+        "to": _decode(headers.get("to")),
+        "subject": _decode(headers.get("subject")) or "",
+        "message_id": message_id,
+        "in_reply_to": in_reply_to,
+        "thread_id": (references[0] if references else None) or in_reply_to or message_id,
+    }
+
+
+def parse_eml_headers(path: Path) -> Dict[str, Any]:
+    return message_fields(parse_header_block(read_header_block(path)))
+
+
+def email_event(rel_path: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Timeline event for one message (see module docstring)."""
+    sender = _display_name(fields["from"]) or "unknown sender"
+    recipient = _display_name(fields["to"])
+    summary = f"Email from {sender}" + (f" to {recipient}" if recipient else "")
+    if fields["subject"]:
+        summary += f": {fields['subject']}"
+    return {
+        "id": rel_path,
+        "date": fields["timestamp"] or "",
+        "event": summary,
+        "category": "email",
+        "title": fields["subject"],
+        "message_id": fields["message_id"],
+        "in_reply_to": fields["in_reply_to"],
+        "thread_id": fields["thread_id"],
+    }
+
+
+def resolve_thread_roots(events: Sequence[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    {thread_id: root Message-ID} for email events, following In-Reply-To
+    links between messages of the same case up to the oldest known one.
+    """
+    parents = {ev["message_id"]: ev["in_reply_to"] for ev in events if ev.get("message_id")}
+    roots: Dict[str, str] = {}
+    for ev in events:
+        start = ev.get("thread_id")
+        if not start or start in roots:
+            continue
+        chain = [start]
+        node = start
+        while parents.get(node) and parents[node] not in chain and parents[node] not in roots:
+            node = parents[node]
+            chain.append(node)
+        root = roots.get(parents.get(node) or "", node)
+        for mid in chain:
+            roots[mid] = root
+    return roots
+
+
+# --------------------------------------------------------------------------- #
+# Batch ingestion
+# --------------------------------------------------------------------------- #
+
+def _parse_paths(paths: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+    """Pool task: parse a chunk of files; unreadable files give None."""
+    out: List[Optional[Dict[str, Any]]] = []
+    for path in paths:
+        try:
+            out.append(parse_eml_headers(Path(path)))
+        except OSError:
+            out.append(None)
+    return out
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _POOL
+    workers = int(os.environ.get("LEXFABRIC_EMAIL_WORKERS", "0") or 0) or (os.cpu_count() or 1)
+    if workers <= 1:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawn: forking a multi-threaded server process is unsafe.
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _POOL
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_on_pool(
+    pool: ProcessPoolExecutor,
+    on_disk: Sequence[Tuple[str, Path]],
+    deadline: Optional[Deadline],
+    results: Dict[str, Dict[str, Any]],
+) -> bool:
+    """Parse `on_disk` in chunks on `pool` into `results`; True if the deadline expired."""
+    pending: Dict[Future, List[str]] = {}
+    for i in range(0, len(on_disk), CHUNK_SIZE):
+        chunk = on_disk[i:i + CHUNK_SIZE]
+        pending[pool.submit(_parse_paths, [str(p) for _, p in chunk])] = [rel for rel, _ in chunk]
+    while pending:
+        done, _ = wait(pending, timeout=remaining(deadline), return_when=FIRST_COMPLETED)
+        if not done:
+            for fut in pending:
+                fut.cancel()
+            return True
+        for fut in done:
+            rels = pending.pop(fut)
+            for rel, fields in zip(rels, fut.result()):
+                if fields is not None:
+                    results[rel] = fields
+    return False
+
+
+def parse_many(
+    sources: Sequence[EmailSource],
+    deadline: Optional[Deadline] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+    """
+    Parse the headers of many messages; returns ({rel_path: fields}, expired).
+
+    Unreadable messages are skipped. When `deadline` expires, the messages
+    parsed so far are returned with `expired` True; chunks not yet started
+    are cancelled.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    on_disk = [(rel, path) for rel, path, _ in sources if path is not None]
+    in_memory = [(rel, read) for rel, path, read in sources if path is None]
+    paths = dict(on_disk)
+
+    pool = _get_pool() if len(on_disk) >= POOL_MIN_MESSAGES else None
+    if pool is not None:
+        try:
+            if _parse_on_pool(pool, on_disk, deadline, results):
+                return results, True
+            on_disk = []
+        except (BrokenProcessPool, RuntimeError):
+            # A worker died or processes cannot be started here: finish in-process.
+            _reset_pool(pool)
+            on_disk = [(rel, path) for rel, path in on_disk if rel not in results]
+    in_memory = [(rel, None) for rel, _ in on_disk] + in_memory
+
+    for rel, read in in_memory:
+        if deadline is not None and deadline.expired():
+            return results, True
+        try:
+            if read is None:
+                results[rel] = parse_eml_headers(paths[rel])
+            else:
+                results[rel] = message_fields(parse_header_block(header_block_from_text(read())))
+        except OSError:
+            continue
+    return results, False
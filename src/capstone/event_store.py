@@ -0,0 +1,239 @@
+"""
+Columnar, cross-case store of derived timeline events.
+
+Per-case analysis cannot answer "all incidents in March across RH* cases"
+without running `analyze_case` for every case. This store keeps every
+case's timeline events in one columnar layout:
+
+    dates       datetime64[D]   event date (NaT when none could be parsed)
+    case_codes  int32           -> case_dict      (dictionary-encoded case_id)
+    cat_codes   int32           -> category_dict  (event kind, e.g. "incident_occurs")
+    title_codes int32           -> title_dict     (source file stem)
+    ids, texts  object          event id and text, only touched for returned rows
+
+Rows are pre-sorted by (date, case, id) with undated events last, so a query
+is a handful of vectorised masks followed by a slice. Filters on case
+prefix, category or title substring are evaluated once per dictionary entry
+and then applied to the code columns with `np.isin`.
+
+The store is rebuilt from the per-case versioned timelines
+(timeline_store.py) only when one of them changed, and at most once per
+`max_staleness` seconds.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_ISO_DATE = re.compile(r"(?<!\d)(\d{4}-\d{2}-\d{2})(?!\d)")
+_ORDER_PREFIX = re.compile(r"^\d+[_\-\s]+")
+
+NAT = np.datetime64("NaT", "D")
+
+
+def parse_event_date(*texts: str) -> np.datetime64:
+    """First ISO date (YYYY-MM-DD) found in `texts`, or NaT."""
+    for text in texts:
+        for match in _ISO_DATE.findall(text or ""):
+            try:
+                return np.datetime64(date.fromisoformat(match), "D")
+            except ValueError:
+                continue
+    return NAT
+
+
+def event_category(title: str) -> str:
+    """Event kind from a timeline file stem: "01_initial_filing" -> "initial_filing"."""
+    return _ORDER_PREFIX.sub("", title) or title
+
+
+@dataclass
+class EventColumns:
+    """Immutable columnar snapshot of all cases' events."""
+
+    dates: np.ndarray
+    case_codes: np.ndarray
+    cat_codes: np.ndarray
+    title_codes: np.ndarray
+    ids: np.ndarray
+    texts: np.ndarray
+    case_dict: np.ndarray
+    category_dict: np.ndarray
+    title_dict: np.ndarray
+    versions: Dict[str, int]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def build(cls, rows: Sequence[Tuple[str, Dict[str, str]]], versions: Dict[str, int]) -> "EventColumns":
+        """Columns from (case_id, timeline event) rows."""
+        n = len(rows)
+        cases = np.array([case_id for case_id, _ in rows], dtype=object)
+        # Email events carry their own title/category and an ISO timestamp as
+        # "date"; timeline-file events derive both from the file stem.
+        titles = np.array([ev.get("title", ev["date"]) for _, ev in rows], dtype=object)
+        cats = np.array([ev.get("category") or event_category(ev["date"]) for _, ev in rows], dtype=object)
+        ids = np.array([ev["id"] for _, ev in rows], dtype=object)
+        texts = np.array([ev["event"] for _, ev in rows], dtype=object)
+        dates = np.array(
+            [parse_event_date(ev["date"]) if "category" in ev else parse_event_date(ev["event"], ev["date"])
+             for _, ev in rows],
+            dtype="datetime64[D]",
+        )
+
+        case_dict, case_codes = _encode(cases)
+        category_dict, cat_codes = _encode(cats)
+        title_dict, title_codes = _encode(titles)
+
+        # Sort by (date, case, id); NaT is mapped to the max so undated rows sort last.
+        day = dates.astype("int64")
+        day[np.isnat(dates)] = np.iinfo(np.int64).max
+        order = np.lexsort((ids, case_codes, day)) if n else np.arange(0)
+
+        return cls(
+            dates=dates[order],
+            case_codes=case_codes[order],
+            cat_codes=cat_codes[order],
+            title_codes=title_codes[order],
+            ids=ids[order],
+            texts=texts[order],
+            case_dict=case_dict,
+            category_dict=category_dict,
+            title_dict=title_dict,
+            versions=dict(versions),
+        )
+
+    def mask(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        case_prefix: Optional[str] = None,
+        categories: Optional[Sequence[str]] = None,
+        title_contains: Optional[str] = None,
+    ) -> np.ndarray:
+        """Boolean row mask; date bounds are inclusive and exclude undated rows."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.dates >= np.datetime64(start, "D")
+        if end is not None:
+            mask &= self.dates <= np.datetime64(end, "D")
+        if case_prefix:
+            codes = [i for i, c in enumerate(self.case_dict) if c.startswith(case_prefix)]
+            mask &= np.isin(self.case_codes, codes)
+        if categories:
+            wanted = set(categories)
+            codes = [i for i, c in enumerate(self.category_dict) if c in wanted]
+            mask &= np.isin(self.cat_codes, codes)
+        if title_contains:
+            needle = title_contains.lower()
+            codes = [i for i, t in enumerate(self.title_dict) if needle in t.lower()]
+            mask &= np.isin(self.title_codes, codes)
+        return mask
+
+    def rows(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for i in indices.tolist():
+            d = self.dates[i]
+            out.append({
+                "case_id": self.case_dict[self.case_codes[i]],
+                "category": self.category_dict[self.cat_codes[i]],
+                "title": self.title_dict[self.title_codes[i]],
+                "date": None if np.isnat(d) else str(d),
+                "event": self.texts[i],
+                "id": self.ids[i],
+            })
+        return out
+
+
+def _encode(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if not len(values):
+        return np.array([], dtype=object), np.array([], dtype=np.int32)
+    uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+    return uniques.astype(object), inverse.astype(np.int32)
+
+
+class CrossCaseEventStore:
+    """
+    Lazily (re)built EventColumns over every case.
+
+    `list_cases()` returns the case_ids to include and `load_case(case_id)`
+    returns (version, events) for one case, typically from the versioned
+    timeline store, so unchanged cases cost only a stat per timeline file.
+    """
+
+    def __init__(
+        self,
+        list_cases: Callable[[], List[str]],
+        load_case: Callable[[str], Tuple[int, List[Dict[str, str]]]],
+        max_staleness: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._list_cases = list_cases
+        self._load_case = load_case
+        self.max_staleness = max_staleness
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._columns: Optional[EventColumns] = None
+        self._checked_at = float("-inf")
+        self._case_rows: Dict[str, Tuple[int, List[Tuple[str, Dict[str, str]]]]] = {}
+
+    def columns(self) -> EventColumns:
+        with self._lock:
+            now = self._clock()
+            if self._columns is not None and now - self._checked_at < self.max_staleness:
+                return self._columns
+            self._checked_at = now
+
+            changed = False
+            case_ids = self._list_cases()
+            for case_id in [c for c in self._case_rows if c not in case_ids]:
+                del self._case_rows[case_id]
+                changed = True
+            for case_id in case_ids:
+                try:
+                    version, events = self._load_case(case_id)
+                except FileNotFoundError:
+                    version, events = -1, []
+                cached = self._case_rows.get(case_id)
+                if cached is None or cached[0] != version:
+                    self._case_rows[case_id] = (version, [(case_id, ev) for ev in events])
+                    changed = True
+
+            if changed or self._columns is None:
+                rows = [row for cid in sorted(self._case_rows) for row in self._case_rows[cid][1]]
+                versions = {cid: v for cid, (v, _) in self._case_rows.items()}
+                self._columns = EventColumns.build(rows, versions)
+            return self._columns
+
+    def query(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        case_prefix: Optional[str] = None,
+        categories: Optional[Sequence[str]] = None,
+        title_contains: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Filtered, paginated events in (date, case, id) order."""
+        cols = self.columns()
+        hits = np.flatnonzero(cols.mask(start, end, case_prefix, categories, title_contains))
+        page = hits[offset:offset + limit]
+        next_offset = offset + len(page) if offset + len(page) < len(hits) else None
+        return {
+            "total": int(len(hits)),
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset,
+            "events": cols.rows(page),
+        }
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._checked_at = float("-inf")
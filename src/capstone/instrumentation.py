@@ -0,0 +1,324 @@
+"""
+Hot-path counters/timers, pipeline stage spans and opt-in per-request profiling.
+
+Both are off by default and can be switched at runtime (see the
+`/v1/admin/instrumentation` endpoint in src/api.py) without a restart:
+
+    from capstone.instrumentation import INSTRUMENTATION, PROFILER
+
+    with INSTRUMENTATION.timed("walk"):
+        ...
+    INSTRUMENTATION.incr("walk.files", n)
+
+    with PROFILER.maybe_profile(requested=True, label="CC02") as capture:
+        ...
+    capture.path  # -> Path of the .prof dump, or None if not sampled
+
+When disabled, `timed()` and `incr()` cost one attribute check.
+
+Stage spans are always recorded (one perf_counter pair per stage): each
+`analyze_case` call returns its spans, and `STAGE_METRICS` aggregates them
+into latency histograms rendered in Prometheus text format for `/metrics`.
+"""
+
+import cProfile
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# --------------------------------------------------------------------------- #
+# Counters and timers
+# --------------------------------------------------------------------------- #
+
+class Instrumentation:
+    """Thread-safe named counters and timers for hot paths."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._timers: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            t = self._timers.get(name)
+            if t is None:
+                t = self._timers[name] = {"count": 0, "total_s": 0.0, "max_s": 0.0}
+            t["count"] += 1
+            t["total_s"] += seconds
+            if seconds > t["max_s"]:
+                t["max_s"] = seconds
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            timers = {
+                name: dict(t, mean_s=(t["total_s"] / t["count"]) if t["count"] else 0.0)
+                for name, t in self._timers.items()
+            }
+            return {"enabled": self.enabled, "counters": dict(self._counters), "timers": timers}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+
+# --------------------------------------------------------------------------- #
+# Pipeline stage spans and histograms
+# --------------------------------------------------------------------------- #
+
+class SpanRecorder:
+    """
+    Collects timing spans for the stages of one pipeline run.
+
+    `span()` yields the span dict so the stage can attach `items` (how many
+    records/events it handled) and `cache` ("hit" / "miss"). Spans of
+    stages that raised (e.g. on an expired deadline) have `completed` False.
+
+    Spans may nest (the `session` stage wraps `load_evidence`,
+    `derive_timeline` and `agent_pipeline` when it builds a session);
+    `depth` is 0 for top-level spans and a span is appended when it ends,
+    so children precede their parent in `spans`.
+    """
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._depth = 0
+        self.spans: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, stage: str, items: Optional[int] = None, cache: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        record: Dict[str, Any] = {
+            "stage": stage, "items": items, "cache": cache, "completed": False, "depth": self._depth,
+        }
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+            record["completed"] = True
+        finally:
+            end = time.perf_counter()
+            self._depth -= 1
+            record["start_ms"] = round((start - self._origin) * 1000, 3)
+            record["duration_ms"] = round((end - start) * 1000, 3)
+            self.spans.append(record)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [dict(s) for s in self.spans]
+
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class StageHistograms:
+    """
+    Per-stage latency histograms and cache hit/miss counters.
+
+    `observe_spans` records each stage's self time: a span that contains
+    nested spans is observed with their durations subtracted, so no time is
+    counted twice and the stage sums add up to the top-level spans.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._hist: Dict[str, Dict[str, Any]] = {}
+        self._cache: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, stage: str, seconds: float, cache: Optional[str] = None) -> None:
+        with self._lock:
+            h = self._hist.get(stage)
+            if h is None:
+                h = self._hist[stage] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    h["counts"][i] += 1
+                    break
+            h["sum"] += seconds
+            h["count"] += 1
+            if cache:
+                key = (stage, cache)
+                self._cache[key] = self._cache.get(key, 0) + 1
+
+    def observe_spans(self, spans: Sequence[Dict[str, Any]]) -> None:
+        # Spans are in end order, so the children of a span at depth d are
+        # the depth d+1 spans that ended since the last depth d span.
+        child_ms: Dict[int, float] = {}
+        for span in spans:
+            depth = span.get("depth", 0)
+            duration_ms = span["duration_ms"]
+            self_ms = max(0.0, duration_ms - child_ms.pop(depth + 1, 0.0))
+            child_ms[depth] = child_ms.get(depth, 0.0) + duration_ms
+            self.observe(span["stage"], self_ms / 1000.0, span.get("cache"))
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP lexfabric_stage_duration_seconds Pipeline stage latency.",
+            "# TYPE lexfabric_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self._hist):
+                h = self._hist[stage]
+                cumulative = 0
+                for bound, n in zip(self.buckets, h["counts"]):
+                    cumulative += n
+                    lines.append(
+                        f'lexfabric_stage_duration_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}'
+                    )
+                lines.append(f'lexfabric_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {h["count"]}')
+                lines.append(f'lexfabric_stage_duration_seconds_sum{{stage="{stage}"}} {h["sum"]:.6f}')
+                lines.append(f'lexfabric_stage_duration_seconds_count{{stage="{stage}"}} {h["count"]}')
+
+            lines.append("# HELP lexfabric_stage_cache_total Stage cache lookups by result.")
+            lines.append("# TYPE lexfabric_stage_cache_total counter")
+            for (stage, result), n in sorted(self._cache.items()):
+                lines.append(f'lexfabric_stage_cache_total{{stage="{stage}",result="{result}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+            self._cache.clear()
+
+
+# --------------------------------------------------------------------------- #
+# Per-request profiling
+# --------------------------------------------------------------------------- #
+
+@dataclass
+class ProfileCapture:
+    """Handle yielded by `Profiler.maybe_profile`; `path` is set after the dump."""
+    active: bool = False
+    path: Optional[Path] = None
+
+
+class Profiler:
+    """
+    Captures cProfile dumps for opted-in or sampled requests.
+
+    A request is profiled when `header_enabled` is on and the caller asked
+    for it (e.g. via the X-LexFabric-Profile header), or at random with
+    probability `sample_rate`. Dumps go to `directory` as `.prof` files
+    (readable with `python -m pstats` or snakeviz); the oldest files are
+    deleted once more than `max_files` exist.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        header_enabled: bool = False,
+        sample_rate: float = 0.0,
+        max_files: int = 50,
+    ):
+        self.directory = Path(directory)
+        self.header_enabled = header_enabled
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._seq = itertools.count()
+        # cProfile cannot run two profilers at once in the same thread;
+        # a lock keeps concurrent requests from clobbering each other.
+        self._lock = threading.Lock()
+
+    def should_profile(self, requested: bool = False) -> bool:
+        if requested and self.header_enabled:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def maybe_profile(self, requested: bool = False, label: str = "request") -> Iterator[ProfileCapture]:
+        capture = ProfileCapture()
+        if not self.should_profile(requested) or not self._lock.acquire(blocking=False):
+            yield capture
+            return
+
+        capture.active = True
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield capture
+            finally:
+                profiler.disable()
+            capture.path = self._dump(profiler, label)
+        finally:
+            self._lock.release()
+
+    def _dump(self, profiler: cProfile.Profile, label: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        safe_label = re.sub(r"[^A-Za-z0-9_.-]+", "_", label)[:64]
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}_{os.getpid()}_{next(self._seq)}_{safe_label}.prof"
+        path = self.directory / name
+        profiler.dump_stats(str(path))
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        dumps = sorted(self.directory.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+        excess = len(dumps) - max(1, self.max_files)
+        for old in dumps[:max(0, excess)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "header_enabled": self.header_enabled,
+            "sample_rate": self.sample_rate,
+            "max_files": self.max_files,
+        }
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+STAGE_METRICS = StageHistograms()
+
+INSTRUMENTATION = Instrumentation(enabled=_env_flag("LEXFABRIC_INSTRUMENTATION"))
+
+def _profile_dir() -> Path:
+    """LEXFABRIC_PROFILE_DIR, or <repo>/.profiles next to .timelines, .jobs and .warmup."""
+    override = os.environ.get("LEXFABRIC_PROFILE_DIR")
+    if override:
+        return Path(override).expanduser()
+    # This file is src/capstone/instrumentation.py; the repo root is two levels up.
+    return Path(__file__).resolve().parents[2] / ".profiles"
+
+
+PROFILER = Profiler(
+    directory=_profile_dir(),
+    header_enabled=_env_flag("LEXFABRIC_PROFILE_HEADER"),
+    sample_rate=float(os.environ.get("LEXFABRIC_PROFILE_SAMPLE_RATE", "0") or 0),
+    max_files=int(os.environ.get("LEXFABRIC_PROFILE_MAX_FILES", "50") or 50),
+)
@@ -0,0 +1,408 @@
+"""
+Durable background jobs for long-running case analyses.
+
+Jobs live in one SQLite table (WAL mode), so they survive restarts and can
+be submitted, claimed and cancelled from any worker process sharing the
+database file:
+
+    jobs(id, dedup_key, case_id, query, deadline_ms, priority, status,
+         created_at, started_at, heartbeat_at, finished_at, cancel_requested,
+         result, error)
+
+    status: queued -> running -> succeeded | failed | cancelled
+
+- Deduplication: submitting the same (case_id, query, deadline_ms) while an
+  identical job is still queued or running returns that job (raising its
+  priority if the new submission's is higher).
+- Priority: higher runs first, then oldest first.
+- Cancellation: a queued job is cancelled at once; a running job gets
+  `cancel_requested` and its CancellableDeadline is expired, so the
+  pipeline stops at its next deadline check.
+
+A `JobRunner` executes jobs on a few local threads, outside the HTTP
+request workers, and heartbeats the jobs it is running. A running job whose
+heartbeat is older than STALE_AFTER_S (its process died) is put back in the
+queue by any runner, or finished as cancelled if a cancel was requested.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .deadline import CancellableDeadline
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+FINAL_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Finished jobs (and their results) are deleted after this many seconds.
+DEFAULT_RETENTION_S = 7 * 24 * 3600
+
+# A running job without a heartbeat for this long is re-queued.
+STALE_AFTER_S = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id               TEXT PRIMARY KEY,
+    dedup_key        TEXT NOT NULL,
+    case_id          TEXT NOT NULL,
+    query            TEXT,
+    deadline_ms      INTEGER,
+    priority         INTEGER NOT NULL DEFAULT 0,
+    status           TEXT NOT NULL,
+    created_at       REAL NOT NULL,
+    started_at       REAL,
+    heartbeat_at     REAL,
+    finished_at      REAL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    result           TEXT,
+    error            TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_dedup ON jobs (dedup_key)
+    WHERE status IN ('queued', 'running');
+"""
+
+_PUBLIC_COLUMNS = (
+    "id", "case_id", "query", "deadline_ms", "priority", "status",
+    "created_at", "started_at", "finished_at", "cancel_requested", "error",
+)
+
+
+class JobNotFound(KeyError):
+    """Raised for unknown job ids."""
+
+
+def dedup_key(case_id: str, query: Optional[str], deadline_ms: Optional[int]) -> str:
+    """Identity of a submission: same case, query and deadline -> same key."""
+    canonical = json.dumps([case_id, query or None, deadline_ms or None], separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """SQLite-backed job table; safe to share across threads and processes."""
+
+    def __init__(self, path: Path, retention_s: float = DEFAULT_RETENTION_S):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_s = retention_s
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def _tx(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run `fn` in a write transaction (BEGIN IMMEDIATE serialises writers)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return out
+
+    # ------------------------------------------------------------------ #
+    # Client side
+    # ------------------------------------------------------------------ #
+
+    def submit(
+        self,
+        case_id: str,
+        query: Optional[str] = None,
+        deadline_ms: Optional[int] = None,
+        priority: int = 0,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Queue a job; returns (job, deduplicated)."""
+        key = dedup_key(case_id, query, deadline_ms)
+
+        def op(conn: sqlite3.Connection) -> Tuple[str, bool]:
+            row = conn.execute(
+                "SELECT id, priority FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                if priority > row["priority"]:
+                    conn.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, row["id"]))
+                return row["id"], True
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, dedup_key, case_id, query, deadline_ms, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, key, case_id, query, deadline_ms, priority, QUEUED, time.time()),
+            )
+            return job_id, False
+
+        job_id, deduplicated = self._tx(op)
+        return self.get(job_id), deduplicated
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Job status (without the result)."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_PUBLIC_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            raise JobNotFound(job_id)
+        job = dict(row)
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Stored result of a finished job, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise JobNotFound(job_id)
+        return json.loads(row["result"]) if row["result"] else None
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued job now, or flag a running one; final jobs are left as they are."""
+
+        def op(conn: sqlite3.Connection) -> None:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                raise JobNotFound(job_id)
+            if row["status"] == QUEUED:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ? WHERE id = ?",
+                    (CANCELLED, time.time(), job_id),
+                )
+            elif row["status"] == RUNNING:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+
+        self._tx(op)
+        return self.get(job_id)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    # ------------------------------------------------------------------ #
+    # Runner side
+    # ------------------------------------------------------------------ #
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the highest-priority queued job to running."""
+
+        def op(conn: sqlite3.Connection) -> Optional[str]:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, now, now, row["id"]),
+            )
+            return row["id"]
+
+        job_id = self._tx(op)
+        return self.get(job_id) if job_id else None
+
+    def finish(
+        self,
+        job: Dict[str, Any],
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """
+        Record the outcome of a claimed `job`. Returns False (and writes
+        nothing) if the job is no longer this claim's, e.g. it was re-queued
+        as stale and claimed by another runner.
+        """
+        payload = json.dumps(result, ensure_ascii=False, separators=(",", ":")) if result is not None else None
+        return self._tx(lambda conn: conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? "
+            "WHERE id = ? AND status = ? AND started_at = ?",
+            (status, time.time(), payload, error, job["id"], RUNNING, job["started_at"]),
+        ).rowcount) == 1
+
+    def release(self, job: Dict[str, Any]) -> bool:
+        """
+        Put a claimed `job` back in the queue (runner shutting down). Jobs with
+        a pending cancel request are not released; returns True if re-queued.
+        """
+        return self._tx(lambda conn: conn.execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL "
+            "WHERE id = ? AND status = ? AND started_at = ? AND cancel_requested = 0",
+            (QUEUED, job["id"], RUNNING, job["started_at"]),
+        ).rowcount) == 1
+
+    def heartbeat(self, job_ids: List[str]) -> List[str]:
+        """Mark `job_ids` as alive; returns those with a pending cancel request."""
+        if not job_ids:
+            return []
+        marks = ", ".join("?" * len(job_ids))
+
+        def op(conn: sqlite3.Connection) -> List[str]:
+            conn.execute(f"UPDATE jobs SET heartbeat_at = ? WHERE id IN ({marks})", (time.time(), *job_ids))
+            rows = conn.execute(f"SELECT id FROM jobs WHERE cancel_requested = 1 AND id IN ({marks})", job_ids)
+            return [row["id"] for row in rows.fetchall()]
+
+        return self._tx(op)
+
+    def requeue_stale(self, older_than_s: float = STALE_AFTER_S) -> int:
+        """
+        Put running jobs without a heartbeat for `older_than_s` back in the
+        queue; those with a pending cancel request are finished as cancelled
+        instead. Returns the number of jobs recovered either way.
+        """
+        now = time.time()
+        return self._tx(lambda conn: conn.execute(
+            "UPDATE jobs SET "
+            "status = CASE WHEN cancel_requested THEN ? ELSE ? END, "
+            "finished_at = CASE WHEN cancel_requested THEN ? ELSE NULL END, "
+            "started_at = CASE WHEN cancel_requested THEN started_at ELSE NULL END, "
+            "heartbeat_at = NULL "
+            "WHERE status = ? AND heartbeat_at <= ?",
+            (CANCELLED, QUEUED, now, RUNNING, now - older_than_s),
+        ).rowcount)
+
+    def prune(self) -> int:
+        cutoff = time.time() - self.retention_s
+        return self._tx(lambda conn: conn.execute(
+            "DELETE FROM jobs WHERE status IN ('succeeded', 'failed', 'cancelled') AND finished_at < ?",
+            (cutoff,),
+        ).rowcount)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobRunner:
+    """
+    Runs queued jobs on `workers` threads.
+
+    `run(job, deadline)` does the work and returns the result dict; raising
+    FileNotFoundError or any other exception marks the job failed. Each job
+    gets a CancellableDeadline (bounded by its deadline_ms, if any) that is
+    cancelled when a cancel request is seen in the table, or when the runner
+    stops (the job is then re-queued rather than cancelled).
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        run: Callable[[Dict[str, Any], CancellableDeadline], Dict[str, Any]],
+        workers: int = 2,
+        poll_interval: float = 0.5,
+    ):
+        self.store = store
+        self._run = run
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._wake = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[str, CancellableDeadline] = {}
+        self._running_lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._threads)
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self.store.requeue_stale()
+        self.store.prune()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"lexfabric-job-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        watcher = threading.Thread(target=self._watch, name="lexfabric-job-watch", daemon=True)
+        watcher.start()
+        self._threads.append(watcher)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers. Running jobs are interrupted at their next stage and
+        put back in the queue (unless a cancel was requested), so a restart
+        does not lose or cancel them.
+        """
+        self._stop.set()
+        with self._running_lock:
+            for deadline in self._running.values():
+                deadline.cancel()
+        self.notify()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers (called after a submission in this process)."""
+        with self._wake:
+            self._wake.notify_all()
+
+    def running(self) -> int:
+        with self._running_lock:
+            return len(self._running)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            job = self.store.claim()
+            if job is None:
+                # Submissions from other processes are picked up by polling.
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+            self._execute(job)
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        seconds = job["deadline_ms"] / 1000.0 if job["deadline_ms"] else None
+        deadline = CancellableDeadline(seconds)
+        with self._running_lock:
+            self._running[job["id"]] = deadline
+        try:
+            result = self._run(job, deadline)
+        except Exception as e:
+            if not (deadline.cancelled and self._requeue_on_stop(job)):
+                status = CANCELLED if deadline.cancelled else FAILED
+                self.store.finish(job, status, error=f"{type(e).__name__}: {e}")
+        else:
+            interrupted = deadline.cancelled and bool(result.get("truncated"))
+            if not (interrupted and self._requeue_on_stop(job)):
+                self.store.finish(job, CANCELLED if interrupted else SUCCEEDED, result=result)
+        finally:
+            with self._running_lock:
+                self._running.pop(job["id"], None)
+
+    def _requeue_on_stop(self, job: Dict[str, Any]) -> bool:
+        """True if `job` was interrupted by stop() and has been re-queued."""
+        return self._stop.is_set() and self.store.release(job)
+
+    def _watch(self) -> None:
+        """Heartbeat running jobs, apply cancel requests, recover stale jobs."""
+        last_recovery = time.monotonic()
+        while not self._stop.wait(self.poll_interval):
+            with self._running_lock:
+                ids = list(self._running)
+            for job_id in self.store.heartbeat(ids):
+                with self._running_lock:
+                    deadline = self._running.get(job_id)
+                if deadline is not None:
+                    deadline.cancel()
+            if time.monotonic() - last_recovery >= STALE_AFTER_S:
+                last_recovery = time.monotonic()
+                if self.store.requeue_stale():
+                    self.notify()
@@ -0,0 +1,467 @@
+"""
+Memory-mapped, per-case index over the evidence manifest.
+
+`scripts/generate_manifest.py` writes `manifest.jsonl` (or the legacy
+`manifest.json`). Parsing that whole file to serve one case is as wasteful as
+walking the tree, so this module compiles it into `manifest.idx`:
+
+    header     : magic (4s) | version (H) | flags (H) | case count (I) | manifest mtime_ns (q)
+    case table : per case -> id length (H) | case_id | offset (Q) | length (Q) | record count (I)
+    blocks     : one zlib-compressed JSON block per case:
+                 {"dirs": [...], "records": [[rel_path, category, title, ext, size], ...]}
+
+Fetching one case is a dictionary lookup, an mmap slice and a small decode.
+
+A case is considered stale when any of its directories has been modified
+after the manifest was written; callers then fall back to walking the case.
+
+With several worker processes (`uvicorn --workers N`), `SharedManifestIndex`
+lets one process build and publish the index while the others attach to
+the same read-only mapping instead of each building their own copy:
+
+    manifest.idx.gen   8-byte generation counter, mmap'd by every worker
+    manifest.idx.<g>   index file of generation g (same format as above)
+
+A publisher takes an exclusive lock, writes generation g+1 in full and only
+then bumps the counter, so readers always see a complete index. Readers
+compare the shared counter with the generation they hold on every lookup
+(a memory read) and re-attach when it moved. Whether the manifest itself
+changed, which needs a stat, is checked at most every `check_interval`
+seconds.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: publishing is not serialised
+    fcntl = None  # type: ignore
+
+INDEX_MAGIC = b"LXMI"
+INDEX_VERSION = 1
+INDEX_FILENAME = "manifest.idx"
+GENERATION_FILENAME = "manifest.idx.gen"
+LOCK_FILENAME = "manifest.idx.lock"
+MANIFEST_CANDIDATES = ("manifest.jsonl", "manifest.json")
+
+_HEADER = struct.Struct("<4sHHIq")
+_ID_LEN = struct.Struct("<H")
+_ENTRY = struct.Struct("<QQI")
+_GENERATION = struct.Struct("<Q")
+
+# Attempts to open the generation named by the counter; a reader that fell
+# more than `keep` generations behind can find its file already pruned.
+ATTACH_ATTEMPTS = 3
+
+
+class ManifestIndexError(ValueError):
+    """Raised when a manifest index is missing, corrupt or of an unknown version."""
+
+
+def iter_manifest_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream records from a JSONL manifest (or load a legacy JSON array)."""
+    with path.open("r", encoding="utf-8") as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def find_manifest(evidence_root: Path) -> Optional[Path]:
+    for name in MANIFEST_CANDIDATES:
+        candidate = evidence_root / name
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def build_manifest_index(manifest_path: Path, index_path: Path) -> Path:
+    """
+    Compile `manifest_path` into a binary per-case index at `index_path`.
+
+    Records are grouped by case_id; the manifest does not need to be sorted,
+    but each case's records are held in memory while the index is built.
+    """
+    cases: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    for rec in iter_manifest_records(manifest_path):
+        case_id = rec["case_id"]
+        rel_global = rec["relative_path"].replace("\\", "/")
+        rel_case = rel_global[len(case_id) + 1:] if rel_global.startswith(case_id + "/") else rel_global
+
+        block = cases.setdefault(case_id, {"dirs": {case_id}, "records": []})
+        parent = rel_global.rpartition("/")[0]
+        while parent and parent not in block["dirs"]:
+            block["dirs"].add(parent)
+            parent = parent.rpartition("/")[0]
+        block["records"].append([
+            rel_case,
+            rec.get("category", "uncategorized"),
+            rec.get("title", ""),
+            rec.get("ext", ""),
+            rec.get("size_bytes", 0),
+        ])
+
+    blobs: List[Tuple[bytes, bytes, int]] = []
+    for case_id in sorted(cases):
+        block = cases[case_id]
+        payload = {"dirs": sorted(block["dirs"]), "records": block["records"]}
+        raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        blobs.append((case_id.encode("utf-8"), zlib.compress(raw, 6), len(block["records"])))
+
+    table_size = sum(_ID_LEN.size + len(cid) + _ENTRY.size for cid, _, _ in blobs)
+    offset = _HEADER.size + table_size
+
+    table = bytearray()
+    for cid, blob, count in blobs:
+        table += _ID_LEN.pack(len(cid)) + cid + _ENTRY.pack(offset, len(blob), count)
+        offset += len(blob)
+
+    manifest_mtime = manifest_path.stat().st_mtime_ns
+    tmp_path = index_path.with_name(f"{index_path.name}.tmp.{os.getpid()}")
+    with tmp_path.open("wb") as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(blobs), manifest_mtime))
+        f.write(table)
+        for _, blob, _ in blobs:
+            f.write(blob)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+class ManifestIndex:
+    """
+    Read-only, mmap-backed view over a `manifest.idx` file.
+
+    `close()` may be called while other threads still hold the index: block
+    reads are serialised with it, and after it callers see unknown/stale
+    cases and fall back to walking the case.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with self.path.open("rb") as f:
+                self._inode = os.fstat(f.fileno()).st_ino
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ManifestIndexError(f"Cannot open manifest index {self.path}: {e}") from e
+
+        self._cases: Dict[str, Tuple[int, int, int]] = {}
+        try:
+            self._read_table()
+        except Exception:
+            self._buf.close()
+            raise
+
+    def _read_table(self) -> None:
+        if len(self._buf) < _HEADER.size:
+            raise ManifestIndexError(f"Manifest index {self.path} is truncated")
+        magic, version, _flags, count, manifest_mtime = _HEADER.unpack_from(self._buf, 0)
+        if magic != INDEX_MAGIC:
+            raise ManifestIndexError(f"{self.path} is not a manifest index")
+        if version != INDEX_VERSION:
+            raise ManifestIndexError(f"Unsupported manifest index version {version} in {self.path}")
+        self.manifest_mtime_ns = manifest_mtime
+
+        pos = _HEADER.size
+        try:
+            for _ in range(count):
+                (id_len,) = _ID_LEN.unpack_from(self._buf, pos)
+                pos += _ID_LEN.size
+                case_id = bytes(self._buf[pos:pos + id_len]).decode("utf-8")
+                pos += id_len
+                self._cases[case_id] = _ENTRY.unpack_from(self._buf, pos)
+                pos += _ENTRY.size
+        except struct.error as e:
+            raise ManifestIndexError(f"Manifest index {self.path} has a truncated case table") from e
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def case_ids(self) -> List[str]:
+        return list(self._cases)
+
+    def has_case(self, case_id: str) -> bool:
+        return case_id in self._cases
+
+    def record_count(self, case_id: str) -> int:
+        return self._cases[case_id][2] if case_id in self._cases else 0
+
+    def _block(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """Decoded block of a known case, or None once the index is closed."""
+        offset, length, _ = self._cases[case_id]
+        with self._lock:
+            if self._buf.closed:
+                return None
+            blob = self._buf[offset:offset + length]
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def case_dirs(self, case_id: str) -> List[str]:
+        """Evidence-root-relative directories of the case, as listed in the manifest."""
+        block = self._block(case_id) if case_id in self._cases else None
+        return list(block["dirs"]) if block is not None else []
+
+    def is_stale(self, case_id: str, evidence_root: Path, block: Optional[Dict[str, Any]] = None) -> bool:
+        """True if any directory of the case changed after the manifest was written."""
+        if case_id not in self._cases:
+            return True
+        block = block if block is not None else self._block(case_id)
+        if block is None:
+            return True
+        for rel_dir in block["dirs"]:
+            try:
+                if (evidence_root / rel_dir).stat().st_mtime_ns > self.manifest_mtime_ns:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def records_for(
+        self,
+        case_id: str,
+        evidence_root: Path,
+        check_stale: bool = True,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Evidence records for `case_id`, shaped like `load_evidence_for_case`.
+
+        Returns None when the case is unknown or stale, so callers can fall
+        back to walking the directory.
+        """
+        if case_id not in self._cases:
+            return None
+        block = self._block(case_id)
+        if block is None:
+            return None
+        if check_stale and self.is_stale(case_id, evidence_root, block):
+            return None
+
+        case_dir = evidence_root / case_id
+        return [
+            {
+                "id": rel_case,
+                "case_id": case_id,
+                "category": category,
+                "title": title,
+                "path": str(case_dir / rel_case),
+                "ext": ext,
+            }
+            for rel_case, category, title, ext, _size in block["records"]
+        ]
+
+    def is_current(self) -> bool:
+        """False once the index file was replaced or the manifest rewritten."""
+        try:
+            if self.path.stat().st_ino != self._inode:
+                return False
+            manifest = find_manifest(self.path.parent)
+            return manifest is not None and manifest.stat().st_mtime_ns <= self.manifest_mtime_ns
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._buf.close()
+
+
+def open_manifest_index(evidence_root: Path, rebuild: bool = True) -> Optional[ManifestIndex]:
+    """
+    Open `<evidence_root>/manifest.idx`, (re)building it from the manifest
+    when it is missing or older than the manifest. Returns None if there is
+    no manifest or the index cannot be built or read.
+    """
+    manifest = find_manifest(evidence_root)
+    if manifest is None:
+        return None
+
+    index_path = evidence_root / INDEX_FILENAME
+    try:
+        needs_build = (
+            not index_path.exists()
+            or index_path.stat().st_mtime_ns < manifest.stat().st_mtime_ns
+        )
+        if needs_build:
+            if not rebuild:
+                return None
+            build_manifest_index(manifest, index_path)
+        return ManifestIndex(index_path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class SharedManifestIndex:
+    """
+    Manifest index shared by all worker processes of one evidence root.
+
+    `current()` returns the ManifestIndex of the latest published generation,
+    publishing a new one first when there is none yet or the manifest changed.
+    Only one process builds at a time; the others keep serving the previous
+    generation (or, on first start, wait for the builder) and attach to the
+    new file once the generation counter moves. Old generations are unlinked
+    after `keep` newer ones exist; processes still mapping them are unaffected.
+    """
+
+    def __init__(self, evidence_root: Path, keep: int = 2, check_interval: float = 1.0):
+        self.evidence_root = Path(evidence_root)
+        self.keep = max(1, keep)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._index: Optional[ManifestIndex] = None
+        self._checked_at = float("-inf")
+
+        gen_path = self.evidence_root / GENERATION_FILENAME
+        with self._file_lock(blocking=True):
+            if not gen_path.exists() or gen_path.stat().st_size < _GENERATION.size:
+                gen_path.write_bytes(_GENERATION.pack(0))
+        with gen_path.open("r+b") as f:
+            self._gen_map = mmap.mmap(f.fileno(), _GENERATION.size)
+
+    @property
+    def generation(self) -> int:
+        """Latest generation published by any process (0 = none yet)."""
+        return _GENERATION.unpack_from(self._gen_map, 0)[0]
+
+    def index_path(self, generation: int) -> Path:
+        return self.evidence_root / f"{INDEX_FILENAME}.{generation}"
+
+    def current(self, rebuild: bool = True) -> Optional[ManifestIndex]:
+        with self._lock:
+            self._attach()
+            if rebuild and self._check_due() and self._needs_publish():
+                # The first build blocks (nothing to serve yet); later rebuilds
+                # are left to whichever process gets the lock.
+                try:
+                    self.publish(blocking=self._index is None)
+                except (OSError, ValueError, KeyError):
+                    return self._index
+                self._attach()
+            return self._index
+
+    def _attach(self) -> None:
+        for _ in range(ATTACH_ATTEMPTS):
+            generation = self.generation
+            if generation == 0 or (generation == self._generation and self._index is not None):
+                return
+            try:
+                index = ManifestIndex(self.index_path(generation))
+            except (OSError, ManifestIndexError):
+                if self.generation == generation:
+                    return  # unreadable, not pruned: keep serving what we have
+                continue  # pruned under us: attach to the newer generation
+            old, self._index, self._generation = self._index, index, generation
+            if old is not None:
+                old.close()  # threads still holding it fall back to walking
+            return
+
+    def _check_due(self) -> bool:
+        """True at most once per `check_interval` (always before the first attach)."""
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        return True
+
+    def _needs_publish(self) -> bool:
+        manifest = find_manifest(self.evidence_root)
+        if manifest is None:
+            return False
+        if self._index is None:
+            return True
+        try:
+            return manifest.stat().st_mtime_ns > self._index.manifest_mtime_ns
+        except OSError:
+            return False
+
+    def publish(self, blocking: bool = False) -> Optional[int]:
+        """
+        Build the next generation from the manifest and publish it.
+
+        Returns the new generation, or None if another process holds the
+        lock (non-blocking) or already published an up-to-date generation.
+        """
+        manifest = find_manifest(self.evidence_root)
+        if manifest is None:
+            return None
+        with self._file_lock(blocking) as acquired:
+            if not acquired:
+                return None
+            current = self.generation
+            if current:
+                try:
+                    latest = ManifestIndex(self.index_path(current))
+                    up_to_date = latest.manifest_mtime_ns >= manifest.stat().st_mtime_ns
+                    latest.close()
+                    if up_to_date:
+                        return None
+                except ManifestIndexError:
+                    pass
+
+            new_generation = current + 1
+            build_manifest_index(manifest, self.index_path(new_generation))
+            _GENERATION.pack_into(self._gen_map, 0, new_generation)
+            self._gen_map.flush()
+            self._prune(new_generation)
+            return new_generation
+
+    def _prune(self, generation: int) -> None:
+        for path in self.evidence_root.glob(f"{INDEX_FILENAME}.*"):
+            suffix = path.name[len(INDEX_FILENAME) + 1:]
+            if suffix.isdigit() and int(suffix) <= generation - self.keep:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _file_lock(self, blocking: bool):
+        return FileLock(self.evidence_root / LOCK_FILENAME, blocking)
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        self._gen_map.close()
+
+
+class FileLock:
+    """Exclusive flock on `path`; `__enter__` returns whether it was acquired."""
+
+    def __init__(self, path: Path, blocking: bool):
+        self.path = path
+        self.blocking = blocking
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> bool:
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is None:
+            return True
+        flags = fcntl.LOCK_EX | (0 if self.blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(self._fd, flags)
+        except BlockingIOError:
+            os.close(self._fd)
+            self._fd = None
+            return False
+        return True
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._fd is not None:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
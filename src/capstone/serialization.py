@@ -0,0 +1,108 @@
+"""
+Fast JSON encoding and timeline paging for pipeline output.
+
+`analyze_case` already returns dicts in the exact AnalysisResponse shape, so
+validating them into Pydantic models and serializing them again costs more
+than the analysis itself once a timeline reaches tens of thousands of
+events. The API instead encodes the trusted dict once with `dumps()`, which
+uses orjson when it is installed and the stdlib encoder otherwise.
+
+Large timelines can be fetched in pages:
+
+    page, next_cursor = paginate_timeline(events, version=7, fields=["date"], limit=500)
+
+Cursors are opaque to clients. They encode the timeline version and an
+offset, so a cursor minted for an older version is rejected with
+StaleCursorError instead of silently skipping or repeating events.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - optional fast encoder
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+TIMELINE_FIELDS = ("date", "event", "message_id", "in_reply_to", "thread_id")
+
+
+class CursorError(ValueError):
+    """Raised for malformed cursors or unknown timeline fields."""
+
+
+class StaleCursorError(CursorError):
+    """Raised when a cursor was issued for another timeline version."""
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON for plain dict/list/str/number/bool/None data."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """`"date,event"` -> ["date", "event"]; None or empty selects every field."""
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in TIMELINE_FIELDS]
+    if unknown:
+        raise CursorError(
+            f"Unknown timeline field(s): {', '.join(unknown)}; expected any of {', '.join(TIMELINE_FIELDS)}"
+        )
+    return selected or None
+
+
+def encode_cursor(version: Optional[int], offset: int) -> str:
+    raw = f"{'' if version is None else version}:{offset}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[int], int]:
+    """(timeline version, offset) from a cursor produced by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        version, _, offset = raw.partition(":")
+        parsed = (int(version) if version else None, int(offset))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CursorError(f"Malformed cursor {cursor!r}") from None
+    if parsed[1] < 0:
+        raise CursorError(f"Malformed cursor {cursor!r}")
+    return parsed
+
+
+def paginate_timeline(
+    events: Sequence[Dict[str, Any]],
+    version: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of `events` with only `fields` kept; returns (page, next_cursor).
+
+    Without `limit` the page runs to the end of the timeline. Events are
+    copied only when `fields` is given.
+    """
+    offset = 0
+    if cursor:
+        cursor_version, offset = decode_cursor(cursor)
+        if cursor_version != version:
+            raise StaleCursorError(
+                f"Cursor is for timeline version {cursor_version}, current version is {version}; "
+                "restart from the first page"
+            )
+
+    end = len(events) if limit is None else min(len(events), offset + limit)
+    page = events[offset:end]
+    if fields is not None:
+        # Email-only fields are simply absent from timeline-file events.
+        page = [{f: ev[f] for f in fields if f in ev} for ev in page]
+    next_cursor = encode_cursor(version, end) if end < len(events) else None
+    return list(page), next_cursor
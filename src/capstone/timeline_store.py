@@ -0,0 +1,446 @@
+"""
+Incremental, versioned timeline per case.
+
+`_build_naive_timeline` used to re-read every `timeline/*.txt` file on every
+build. The store instead remembers which events each source file
+contributed, together with the file's size and mtime, and persists that
+state per case:
+
+    <store>/<case_id>.json
+        {"version": 7,
+         "sources": {"timeline/01_initial_filing.txt": {"size": .., "mtime_ns": ..,
+                                                        "events": [{"id", "date", "event"}]}},
+         "changes": [{"version": 7, "added": [...events], "removed": [...ids]}, ...]}
+
+`refresh()` stats the case's timeline sources and only re-reads files that
+were added or changed; removed files drop their events. Each refresh that
+changes anything bumps the version and records what changed, so clients
+can ask for `diff(since=N)` instead of re-downloading the whole timeline.
+The first build is not recorded as a change (a reset carries the same
+events), and history is trimmed to the last `max_history` changes and to no
+more added events than the timeline itself holds; older `since` values get
+a full reset.
+
+A refresh never modifies a `CaseTimeline` it has handed out: it builds the
+next version on a copy and swaps it in, so callers can keep iterating the
+object they got. Load-modify-save runs under a per-case file lock
+(`<store>/<case_id>.lock`), so processes sharing the store do not lose each
+other's updates.
+
+Cases may be directories or zip/tar archives (see case_archive.py).
+
+Listing a big mailbox costs a stat per message, so a refresh first checks
+the mtimes of the directories seen by the previous full scan (and of an
+archive file). When none moved, the persisted state is returned without
+listing anything. That catches files added, removed or renamed at once;
+a file edited in place leaves its directory's mtime alone and is picked
+up by the next full scan, at most `rescan_interval` seconds later.
+
+`emails/**/*.eml` files are sources too: each contributes one dated event
+built from its headers only (see email_ingest.py). Changed messages are
+parsed in bulk, on a process pool for large batches. Email events follow
+the timeline files, ordered by timestamp.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from functools import cached_property
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .case_archive import CaseArchive, is_case_archive, open_case_archive
+from .deadline import Deadline, DeadlineExceeded
+from .email_ingest import EMAIL_SUFFIX, email_event, parse_many, read_header_stream, resolve_thread_roots
+from .instrumentation import INSTRUMENTATION
+from .manifest_index import FileLock
+
+# (case-relative path, size, mtime_ns, reader returning the file's text (an
+#  email's header block may be all it returns),
+#  filesystem path or None for archive members)
+TimelineSource = Tuple[str, int, int, Callable[[], str], Optional[Path]]
+
+MAX_HISTORY = 100
+RESCAN_INTERVAL = 30.0
+
+
+def is_email_source(rel_path: str) -> bool:
+    return rel_path.startswith("emails/") and rel_path.endswith(EMAIL_SUFFIX)
+
+
+def list_timeline_sources(
+    case_id: str,
+    case_path: Path,
+    include_emails: bool = True,
+    dir_mtimes: Optional[Dict[str, int]] = None,
+) -> List[TimelineSource]:
+    """
+    `timeline/*.txt` (and `emails/**/*.eml`) of a case directory or archive,
+    sorted by path. Raises FileNotFoundError when the case has neither.
+
+    `dir_mtimes`, if given, receives the mtime of every directory listed
+    (or of the archive), taken before listing it.
+    """
+    dir_mtimes = dir_mtimes if dir_mtimes is not None else {}
+    if is_case_archive(case_path):
+        archive_mtime = case_path.stat().st_mtime_ns
+        dir_mtimes[str(case_path)] = archive_mtime
+        archive = open_case_archive(case_path)
+        members = [
+            m for m in archive.members("timeline")
+            if "/" not in m[len("timeline/"):] and m.endswith(".txt")
+        ]
+        if include_emails:
+            members += [m for m in archive.members("emails") if m.endswith(EMAIL_SUFFIX)]
+        if not members:
+            raise FileNotFoundError(f"Timeline folder not found for case {case_id}: {case_path}/timeline")
+        return [
+            (m, archive.size(m), archive_mtime, _archive_reader(archive, m), None)
+            for m in sorted(members)
+        ]
+
+    timeline_dir = case_path / "timeline"
+    emails_dir = case_path / "emails"
+    _record_mtime(dir_mtimes, case_path)
+    has_emails = include_emails and emails_dir.is_dir()
+    if not timeline_dir.exists() and not has_emails:
+        raise FileNotFoundError(f"Timeline folder not found for case {case_id}: {timeline_dir}")
+
+    sources: List[TimelineSource] = []
+    if has_emails:
+        sources.extend(_email_file_sources(case_path, emails_dir, dir_mtimes))
+    _record_mtime(dir_mtimes, timeline_dir)
+    for txt_file in sorted(timeline_dir.glob("*.txt")):
+        st = txt_file.stat()
+        sources.append((
+            f"timeline/{txt_file.name}",
+            st.st_size,
+            st.st_mtime_ns,
+            lambda p=txt_file: p.read_text(encoding="utf-8"),
+            txt_file,
+        ))
+    return sources
+
+
+def _archive_reader(archive: CaseArchive, member: str) -> Callable[[], str]:
+    """Whole text of a timeline member; only the header block of an email."""
+    if is_email_source(member):
+        def read_headers() -> str:
+            with archive.open(member) as f:
+                return read_header_stream(f)
+        return read_headers
+    return lambda: archive.read_text(member)
+
+
+def _record_mtime(dir_mtimes: Dict[str, int], path: Path) -> None:
+    try:
+        dir_mtimes[str(path)] = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        dir_mtimes[str(path)] = 0  # missing; creating it later changes this
+
+
+def _email_file_sources(case_path: Path, emails_dir: Path, dir_mtimes: Dict[str, int]) -> List[TimelineSource]:
+    """Every .eml under `emails_dir`, found with scandir (one stat per file)."""
+    sources: List[TimelineSource] = []
+    stack = [emails_dir]
+    while stack:
+        directory = stack.pop()
+        _record_mtime(dir_mtimes, directory)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.name.endswith(EMAIL_SUFFIX) and entry.is_file():
+                    path = Path(entry.path)
+                    st = entry.stat()
+                    sources.append((
+                        path.relative_to(case_path).as_posix(),
+                        st.st_size,
+                        st.st_mtime_ns,
+                        lambda p=path: p.read_text(encoding="utf-8", errors="replace"),
+                        path,
+                    ))
+    sources.sort(key=lambda src: src[0])
+    return sources
+
+
+def events_from_source(rel_path: str, text: str) -> List[Dict[str, str]]:
+    """Events contributed by one timeline file (one per file for now)."""
+    return [{
+        "id": rel_path,
+        "date": PurePosixPath(rel_path).stem,   # e.g. "01_initial_filing"
+        "event": text.strip(),
+    }]
+
+
+class CaseTimeline:
+    """
+    In-memory state of one case's versioned timeline. Treated as immutable
+    once returned by TimelineStore; `copy()` gives a version to modify.
+    """
+
+    def __init__(self, case_id: str, state: Optional[Dict[str, Any]] = None):
+        state = state or {}
+        self.case_id = case_id
+        self.version: int = state.get("version", 0)
+        self.sources: Dict[str, Dict[str, Any]] = state.get("sources", {})
+        self.changes: List[Dict[str, Any]] = state.get("changes", [])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": self.version, "sources": self.sources, "changes": self.changes}
+
+    @cached_property
+    def last_modified_ns(self) -> int:
+        """Newest mtime among the sources (0 when there are none)."""
+        return max((src["mtime_ns"] for src in self.sources.values()), default=0)
+
+    def copy(self) -> "CaseTimeline":
+        """Shallow copy; per-source entries are shared and must be replaced, not edited."""
+        return CaseTimeline(self.case_id, {
+            "version": self.version,
+            "sources": dict(self.sources),
+            "changes": list(self.changes),
+        })
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Timeline-file events in path order, then email events by timestamp."""
+        files: List[Dict[str, Any]] = []
+        emails: List[Dict[str, Any]] = []
+        for rel in sorted(self.sources):
+            (emails if is_email_source(rel) else files).extend(self.sources[rel]["events"])
+        emails.sort(key=lambda ev: (ev["date"], ev["id"]))
+        return files + emails
+
+    def public_events(self) -> List[Dict[str, Any]]:
+        """Events in the AnalysisResponse.timeline shape (no internal id)."""
+        events = self.events()
+        roots = resolve_thread_roots([ev for ev in events if "thread_id" in ev])
+        out: List[Dict[str, Any]] = []
+        for ev in events:
+            public = {"date": ev["date"], "event": ev["event"]}
+            if "thread_id" in ev:
+                public["message_id"] = ev["message_id"]
+                public["in_reply_to"] = ev["in_reply_to"]
+                public["thread_id"] = roots.get(ev["thread_id"], ev["thread_id"])
+            out.append(public)
+        return out
+
+    def diff(self, since: int) -> Dict[str, Any]:
+        """
+        Net changes after version `since`. `reset` is True (and `added` holds
+        the full timeline) when `since` is unknown or older than the history.
+        """
+        oldest = self.changes[0]["version"] if self.changes else self.version + 1
+        if since > self.version or since < oldest - 1:
+            return {"from_version": since, "to_version": self.version, "reset": True,
+                    "added": self.events(), "removed": []}
+
+        added: Dict[str, Dict[str, str]] = {}
+        removed: Dict[str, None] = {}
+        for change in self.changes:
+            if change["version"] <= since:
+                continue
+            for ev_id in change["removed"]:
+                added.pop(ev_id, None)
+                removed[ev_id] = None
+            for ev in change["added"]:
+                added[ev["id"]] = ev
+        # An event replaced within the window is reported in both lists, so
+        # clients apply "removed" first and then "added".
+        return {"from_version": since, "to_version": self.version, "reset": False,
+                "added": sorted(added.values(), key=lambda ev: ev["id"]),
+                "removed": sorted(removed)}
+
+
+class TimelineStore:
+    """
+    Persisted CaseTimeline objects, one JSON file per case under `directory`.
+
+    State is cached per process and reloaded when the file on disk was
+    rewritten by another process. Cached objects are never modified.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_history: int = MAX_HISTORY,
+        include_emails: bool = True,
+        rescan_interval: float = RESCAN_INTERVAL,
+    ):
+        self.directory = Path(directory)
+        self.max_history = max_history
+        self.include_emails = include_emails
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        self._case_locks: Dict[str, threading.Lock] = {}
+        self._cache: Dict[str, Tuple[int, CaseTimeline]] = {}
+        # case_id -> (case path, directory mtimes, monotonic time) of the last full scan
+        self._scans: Dict[str, Tuple[Path, Dict[str, int], float]] = {}
+
+    def _path(self, case_id: str) -> Path:
+        return self.directory / f"{case_id}.json"
+
+    def _case_lock(self, case_id: str) -> threading.Lock:
+        with self._lock:
+            return self._case_locks.setdefault(case_id, threading.Lock())
+
+    def _file_lock(self, case_id: str) -> FileLock:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return FileLock(self.directory / f"{case_id}.lock", blocking=True)
+
+    def load(self, case_id: str) -> CaseTimeline:
+        path = self._path(case_id)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return CaseTimeline(case_id)
+        cached = self._cache.get(case_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            timeline = CaseTimeline(case_id, json.loads(path.read_text(encoding="utf-8")))
+        except ValueError:
+            timeline = CaseTimeline(case_id)  # corrupt state: rebuild from scratch
+        self._cache[case_id] = (mtime, timeline)
+        return timeline
+
+    def _save(self, timeline: CaseTimeline) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(timeline.case_id)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(timeline.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        self._cache[timeline.case_id] = (path.stat().st_mtime_ns, timeline)
+
+    def refresh(
+        self,
+        case_id: str,
+        case_path: Path,
+        deadline: Optional[Deadline] = None,
+    ) -> CaseTimeline:
+        """
+        Bring the case's timeline up to date with its sources, re-reading
+        only added or changed files.
+
+        If `deadline` expires part-way, the files processed so far are
+        committed as a new version and DeadlineExceeded carries the
+        resulting timeline.
+        """
+        if self._unchanged(case_id, case_path):
+            timeline = self.load(case_id)
+            if timeline.version:
+                INSTRUMENTATION.incr("timeline.scans_skipped")
+                return timeline
+        # The thread lock keeps this process's threads from queueing on the
+        # file lock; the file lock serialises processes sharing the store.
+        with self._case_lock(case_id), self._file_lock(case_id):
+            return self._refresh_locked(case_id, case_path, deadline)
+
+    def _unchanged(self, case_id: str, case_path: Path) -> bool:
+        """True if no directory seen by the last full scan has moved since."""
+        scan = self._scans.get(case_id)
+        if scan is None or scan[0] != case_path:
+            return False
+        _, dir_mtimes, scanned_at = scan
+        # An archive's mtime covers its members; directories miss in-place edits.
+        if not is_case_archive(case_path) and time.monotonic() - scanned_at >= self.rescan_interval:
+            return False
+        for path, mtime_ns in dir_mtimes.items():
+            try:
+                current = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                current = 0
+            if current != mtime_ns:
+                return False
+        return True
+
+    def _refresh_locked(
+        self,
+        case_id: str,
+        case_path: Path,
+        deadline: Optional[Deadline],
+    ) -> CaseTimeline:
+        previous = self.load(case_id)
+        timeline = previous.copy()
+        scanned_at = time.monotonic()
+        dir_mtimes: Dict[str, int] = {}
+        self._scans.pop(case_id, None)
+        sources = list_timeline_sources(case_id, case_path, self.include_emails, dir_mtimes)
+        current = {src[0] for src in sources}
+
+        added: List[Dict[str, Any]] = []
+        removed: List[str] = []
+        for rel in [r for r in timeline.sources if r not in current]:
+            removed.extend(ev["id"] for ev in timeline.sources.pop(rel)["events"])
+
+        def commit(rel: str, size: int, mtime_ns: int, events: List[Dict[str, Any]]) -> None:
+            prev = timeline.sources.get(rel)
+            if prev:
+                removed.extend(ev["id"] for ev in prev["events"])
+            timeline.sources[rel] = {"size": size, "mtime_ns": mtime_ns, "events": events}
+            added.extend(events)
+
+        files_read = 0
+        expired = False
+        changed_emails: Dict[str, TimelineSource] = {}
+        with INSTRUMENTATION.timed("timeline.read_files"):
+            for src in sources:
+                rel, size, mtime_ns, read, _path = src
+                prev = timeline.sources.get(rel)
+                if prev and prev["size"] == size and prev["mtime_ns"] == mtime_ns:
+                    continue
+                if is_email_source(rel):
+                    changed_emails[rel] = src
+                    continue
+                if deadline is not None and deadline.expired():
+                    expired = True
+                    break
+                commit(rel, size, mtime_ns, events_from_source(rel, read()))
+                files_read += 1
+        INSTRUMENTATION.incr("timeline.files_read", files_read)
+
+        if changed_emails and not expired:
+            with INSTRUMENTATION.timed("timeline.parse_emails"):
+                parsed, expired = parse_many(
+                    [(rel, path, read) for rel, _, _, read, path in changed_emails.values()],
+                    deadline,
+                )
+            for rel, fields in sorted(parsed.items()):
+                _, size, mtime_ns, _, _ = changed_emails[rel]
+                commit(rel, size, mtime_ns, [email_event(rel, fields)])
+            INSTRUMENTATION.incr("timeline.emails_parsed", len(parsed))
+
+        if added or removed:
+            timeline.version += 1
+            if previous.version:
+                timeline.changes.append({"version": timeline.version, "added": added, "removed": removed})
+                self._trim_history(timeline)
+            self._save(timeline)
+        else:
+            timeline = previous
+
+        if expired:
+            raise DeadlineExceeded("read_timeline_files", timeline=timeline.public_events())
+        self._scans[case_id] = (case_path, dir_mtimes, scanned_at)
+        return timeline
+
+    def _trim_history(self, timeline: CaseTimeline) -> None:
+        """
+        Keep the last `max_history` changes, and stop once they add up to
+        more events than the timeline holds: a reset is smaller from there.
+        """
+        del timeline.changes[:-self.max_history]
+        budget = sum(len(src["events"]) for src in timeline.sources.values())
+        for i in range(len(timeline.changes) - 1, -1, -1):
+            budget -= len(timeline.changes[i]["added"])
+            if budget < 0:
+                del timeline.changes[:i + 1]
+                break
+
+    def diff(self, case_id: str, case_path: Path, since: int) -> Dict[str, Any]:
+        """Refresh the case, then return the changes after version `since`."""
+        return self.refresh(case_id, case_path).diff(since)
+
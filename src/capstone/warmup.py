@@ -0,0 +1,186 @@
+"""
+Startup warm-up, and the per-case access log that decides what to warm.
+
+A fresh process pays for evidence-root resolution, the manifest index and
+each case's first timeline build and agent session on its first requests.
+`Warmup.run()` does that work before the process reports ready:
+
+    1. case_index      resolve the evidence root, open/build the manifest index
+    2. intent_matcher  compile the Q&A intent matcher
+    3. hot_cases       preload the `hot_cases` most requested cases
+
+Which cases are hot comes from an `AccessLog`: a small SQLite table of
+per-case hit counts, shared by every process using the same file and kept
+across restarts. Hits are buffered in memory and written every
+`flush_interval` seconds, so recording an access costs a dict update.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Container, Dict, List, Optional
+
+from . import demo
+from .agents.qa_agent import get_intent_matcher
+from .deadline import Deadline, DeadlineExceeded
+from .instrumentation import SpanRecorder
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS case_access (
+    case_id     TEXT PRIMARY KEY,
+    hits        INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+
+
+class AccessLog:
+    """Persisted per-case hit counts; `hottest(n)` ranks cases by hits."""
+
+    def __init__(self, path: Path, flush_interval: float = 10.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[float]] = {}  # case_id -> [hits, last access]
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._db_lock = threading.Lock()
+        with self._db_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def record(self, case_id: str) -> None:
+        with self._lock:
+            entry = self._pending.setdefault(case_id, [0, 0.0])
+            entry[0] += 1
+            entry[1] = time.time()
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered hits; returns the number of cases written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        rows = [(case_id, int(hits), last) for case_id, (hits, last) in pending.items()]
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO case_access (case_id, hits, last_access) VALUES (?, ?, ?) "
+                    "ON CONFLICT(case_id) DO UPDATE SET hits = hits + excluded.hits, "
+                    "last_access = MAX(last_access, excluded.last_access)",
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def hottest(self, n: int, known: Optional[Container[str]] = None) -> List[str]:
+        """
+        Up to `n` case_ids, most hits first (ties: most recently used first),
+        skipping cases not in `known` (e.g. cases since removed).
+        """
+        if n <= 0:
+            return []
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT case_id FROM case_access ORDER BY hits DESC, last_access DESC"
+            )
+            hot: List[str] = []
+            for (case_id,) in rows:
+                if known is None or case_id in known:
+                    hot.append(case_id)
+                    if len(hot) == n:
+                        break
+        return hot
+
+    def close(self) -> None:
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+
+class Warmup:
+    """
+    Warm-up state of this process. `ready` turns True once `run()` has
+    finished, including when it ran out of time preloading hot cases.
+    """
+
+    def __init__(self, access_log: Optional[AccessLog] = None, hot_cases: int = 8, timeout: Optional[float] = None):
+        self.access_log = access_log
+        self.hot_cases = hot_cases
+        self.timeout = timeout
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.preloaded: List[str] = []
+        self.skipped: List[str] = []
+        self._spans = SpanRecorder()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def mark_ready(self) -> None:
+        """Report ready without warming up (warm-up disabled)."""
+        self.state = READY
+
+    def run(self) -> None:
+        """Run every step in the calling thread; failures leave the process not ready."""
+        self.state = RUNNING
+        deadline = Deadline(self.timeout) if self.timeout else None
+        try:
+            with self._spans.span("case_index") as sp:
+                case_ids = set(demo.load_case_index())
+                sp["items"] = len(case_ids)
+
+            with self._spans.span("intent_matcher") as sp:
+                sp["items"] = len(get_intent_matcher().intents)
+
+            with self._spans.span("hot_cases") as sp:
+                self._preload(case_ids, deadline)
+                sp["items"] = len(self.preloaded)
+        except Exception as e:
+            self.state = FAILED
+            self.error = f"{type(e).__name__}: {e}"
+        else:
+            self.state = READY
+
+    def _preload(self, case_ids: Container[str], deadline: Optional[Deadline]) -> None:
+        wanted = self.access_log.hottest(self.hot_cases, known=case_ids) if self.access_log is not None else []
+        for case_id in wanted:
+            if deadline is not None and deadline.expired():
+                self.skipped.append(case_id)
+                continue
+            try:
+                demo.preload_case(case_id, deadline)
+            except (DeadlineExceeded, TimeoutError):
+                self.skipped.append(case_id)
+            except Exception as e:
+                # One broken case should not keep the process unready.
+                self.skipped.append(case_id)
+                self.error = f"{case_id}: {type(e).__name__}: {e}"
+            else:
+                self.preloaded.append(case_id)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "preloaded": list(self.preloaded),
+            "skipped": list(self.skipped),
+            "error": self.error,
+            "steps": self._spans.to_list(),
+        }
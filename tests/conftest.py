@@ -0,0 +1,38 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Same layout the scripts and the Docker image use: `capstone` lives in src/.
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+
+@pytest.fixture
+def evidence_root(tmp_path, monkeypatch):
+    """A private copy of synthetic case CC02, with all state kept under tmp_path."""
+    root = tmp_path / "evidence"
+    shutil.copytree(REPO_ROOT / "capstone" / "synthetic_evidence" / "CC02", root / "CC02")
+    monkeypatch.setenv("LEXFABRIC_EVIDENCE_ROOT", str(root))
+    monkeypatch.setenv("LEXFABRIC_TIMELINE_DIR", str(tmp_path / "timelines"))
+    monkeypatch.setenv("LEXFABRIC_JOB_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setenv("LEXFABRIC_ACCESS_LOG", str(tmp_path / "access_log.sqlite3"))
+    return root
+
+
+@pytest.fixture
+def api_client(evidence_root, monkeypatch):
+    """TestClient for the app as uvicorn serves it (`src.api:app`), without the lifespan."""
+    from fastapi.testclient import TestClient
+
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    from src.api import app
+    from src.capstone import demo
+
+    if demo.SESSION_POOL is not None:
+        demo.SESSION_POOL.clear()
+    yield TestClient(app)
+    if demo.SESSION_POOL is not None:
+        demo.SESSION_POOL.clear()
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from capstone.admission import AdmissionController, ClientRateLimiter, Overloaded, retry_after_header
+
+
+def test_full_queue_sheds_immediately():
+    async def scenario():
+        ctl = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with ctl.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        assert (ctl.in_flight, ctl.queued) == (1, 1) and ctl.saturated()
+
+        with pytest.raises(Overloaded) as exc:
+            async with ctl.admit():
+                pass
+        assert exc.value.retry_after > 0
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+        return ctl.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["admitted"] == 2 and stats["rejected"] == 1
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+
+def test_queue_wait_times_out():
+    async def scenario():
+        ctl = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with ctl.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded, match="Timed out"):
+            async with ctl.admit(timeout=0.05):
+                pass
+        assert ctl.queued == 0
+
+        release.set()
+        await holder
+        return ctl.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["timed_out"] == 1 and stats["in_flight"] == 0
+
+
+def test_waiters_are_served_in_arrival_order():
+    async def scenario():
+        ctl = AdmissionController(max_in_flight=1, max_queue=8)
+        order = []
+
+        async def run(name):
+            async with ctl.admit():
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(run(i) for i in range(5)))
+        return order
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3, 4]
+
+
+def test_rate_limiter_per_client_buckets():
+    now = [0.0]
+    limiter = ClientRateLimiter(rate=2.0, burst=2, clock=lambda: now[0])
+
+    assert limiter.check("a") == 0.0
+    assert limiter.check("a") == 0.0
+    assert limiter.check("a") == pytest.approx(0.5)
+    assert limiter.check("b") == 0.0
+
+    now[0] = 0.5
+    assert limiter.check("a") == 0.0
+    assert limiter.stats()["limited"] == 1
+
+
+def test_rate_limiter_disabled_and_bounded():
+    assert ClientRateLimiter(rate=0).check("a") == 0.0
+
+    limiter = ClientRateLimiter(rate=1.0, burst=1, max_clients=2, clock=lambda: 0.0)
+    for client in ("a", "b", "c"):
+        limiter.check(client)
+    assert limiter.stats()["clients"] == 2
+    # "a" was dropped, so it starts again with a full bucket.
+    assert limiter.check("a") == 0.0
+
+
+def test_retry_after_header_rounds_up():
+    assert retry_after_header(0.2) == "1"
+    assert retry_after_header(2.1) == "3"
+
+
+def _analyze_while_busy(api_client, monkeypatch, deadline_ms, queue_timeout):
+    import httpx
+    import src.api as api
+    from src.capstone.admission import AdmissionController  # the module copy the app uses
+
+    ctl = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=queue_timeout)
+    monkeypatch.setattr(api, "ADMISSION", ctl)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with ctl.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/v1/agent/analyze", json={"case_id": "CC02", "deadline_ms": deadline_ms})
+        release.set()
+        await holder
+        return response
+
+    return asyncio.run(scenario())
+
+
+def test_deadline_expiring_in_the_queue_returns_truncated_result(api_client, monkeypatch):
+    r = _analyze_while_busy(api_client, monkeypatch, deadline_ms=50, queue_timeout=5)
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["truncated"] and body["status"] == "partial"
+    assert any("stage 'admission'" in step for step in body["steps"])
+    assert r.headers["cache-control"] == "no-store"
+
+
+def test_queue_timeout_shorter_than_deadline_is_503(api_client, monkeypatch):
+    r = _analyze_while_busy(api_client, monkeypatch, deadline_ms=5000, queue_timeout=0.05)
+
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
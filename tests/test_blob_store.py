@@ -0,0 +1,75 @@
+import os
+
+from capstone.blob_store import BlobStore
+
+
+def test_hash_manifest_drops_changed_files(tmp_path):
+    case = tmp_path / "CC01"
+    (case / "docs").mkdir(parents=True)
+    (case / "docs" / "a.txt").write_text("alpha")
+    (case / "docs" / "b.txt").write_text("beta")
+    store = BlobStore(tmp_path / "store")
+    stats = store.ingest_case("CC01", case)
+    assert stats.files == 2 and stats.new_blobs == 2
+
+    hashes = store.hash_manifest("CC01", case)
+    assert set(hashes) == {str(case / "docs" / "a.txt"), str(case / "docs" / "b.txt")}
+
+    (case / "docs" / "a.txt").write_text("alpha, edited")
+    (case / "docs" / "b.txt").unlink()
+    assert store.hash_manifest("CC01", case) == {}
+
+    store.ingest_case("CC01", case)
+    assert list(store.hash_manifest("CC01", case)) == [str(case / "docs" / "a.txt")]
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    for case_id in ("CC01", "CC02"):
+        (tmp_path / case_id).mkdir()
+        (tmp_path / case_id / "contract.txt").write_text("same exhibit")
+    store = BlobStore(tmp_path / "store")
+    store.ingest_case("CC01", tmp_path / "CC01")
+    stats = store.ingest_case("CC02", tmp_path / "CC02")
+    assert stats.deduplicated == 1 and stats.new_blobs == 0
+    assert store.stats()["blobs"] == 1
+    os.utime(tmp_path / "CC02" / "contract.txt", ns=(1, 1))
+    assert store.hash_manifest("CC02", tmp_path / "CC02") == {}
+
+
+def test_shared_blob_is_derived_once(tmp_path, monkeypatch):
+    import capstone.blob_store as blob_store
+    from capstone.demo import derive_timeline_events
+
+    calls = []
+    real = blob_store.derive_artifacts
+    monkeypatch.setattr(blob_store, "derive_artifacts", lambda data: calls.append(data) or real(data))
+
+    for case_id in ("CC01", "CC02"):
+        (tmp_path / case_id / "timeline").mkdir(parents=True)
+        (tmp_path / case_id / "timeline" / "filing.txt").write_text("Filed 2023-04-02 by Dana Whitfield.")
+    store = BlobStore(tmp_path / "store")
+    first = store.ingest_case("CC01", tmp_path / "CC01")
+    second = store.ingest_case("CC02", tmp_path / "CC02")
+    assert (first.derived_computed, second.derived_computed) == (1, 0)
+
+    for case_id in ("CC01", "CC02"):
+        path = tmp_path / case_id / "timeline" / "filing.txt"
+        records = [{"category": "timeline", "title": "filing", "path": str(path)}]
+        [event] = derive_timeline_events(records, store.hash_manifest(case_id, tmp_path / case_id), store)
+        assert event["timestamp"] == "2023-04-02"
+        assert event["entities"] == ["Dana Whitfield"]
+    assert len(calls) == 1
+
+
+def test_hash_manifest_does_not_walk_the_case(tmp_path, monkeypatch):
+    case = tmp_path / "CC01"
+    case.mkdir()
+    (case / "a.txt").write_text("alpha")
+    store = BlobStore(tmp_path / "store")
+    store.ingest_case("CC01", case)
+
+    def no_walk(self, pattern):
+        raise AssertionError("hash_manifest walked the case directory")
+
+    monkeypatch.setattr(type(case), "rglob", no_walk)
+    assert store.hash_manifest("CC01", case) == {str(case / "a.txt"): store.case_manifest("CC01")[0]["sha256"]}
@@ -0,0 +1,75 @@
+import gc
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from capstone import case_archive
+from capstone.case_archive import CaseArchiveError, open_case_archive
+
+MEMBERS = {
+    "CC07/timeline/01_filing.txt": b"Filed",
+    "CC07/emails/a/msg_1.eml": b"Subject: hi\n\nbody",
+}
+
+
+def make_zip(path, members=MEMBERS):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path
+
+
+def make_tar(path, mode, members=MEMBERS):
+    with tarfile.open(path, mode) as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    case_archive._CACHE.clear()
+    yield
+    case_archive._CACHE.clear()
+
+
+@pytest.mark.parametrize("name,mode", [("CC07.zip", None), ("CC07.tar", "w"), ("CC07.tar.gz", "w:gz")])
+def test_members_are_read_in_place(tmp_path, name, mode):
+    path = make_zip(tmp_path / name) if mode is None else make_tar(tmp_path / name, mode)
+    archive = open_case_archive(path)
+    assert archive.case_id == "CC07"
+    assert archive.members() == ["emails/a/msg_1.eml", "timeline/01_filing.txt"]
+    assert archive.read_text("timeline/01_filing.txt") == "Filed"
+    with archive.open("emails/a/msg_1.eml") as f:
+        assert f.readline() == b"Subject: hi\n"
+    with pytest.raises(CaseArchiveError):
+        archive.read_bytes("timeline/missing.txt")
+
+
+def test_cache_reuses_and_reindexes_replaced_archives(tmp_path):
+    path = make_zip(tmp_path / "CC07.zip")
+    first = open_case_archive(path)
+    assert open_case_archive(path) is first
+
+    make_zip(path, {**MEMBERS, "CC07/timeline/02_hearing.txt": b"Hearing"})
+    os.utime(path, ns=(path.stat().st_mtime_ns + 1_000_000_000,) * 2)
+    second = open_case_archive(path)
+    assert second is not first
+    assert "timeline/02_hearing.txt" in second.members()
+    # The replaced archive stays readable for whoever still holds it.
+    assert first.read_text("timeline/01_filing.txt") == "Filed"
+
+
+def test_evicted_archive_stays_readable(tmp_path, monkeypatch):
+    monkeypatch.setattr(case_archive, "MAX_OPEN_ARCHIVES", 1)
+    held = open_case_archive(make_zip(tmp_path / "CC07.zip"))
+    open_case_archive(make_zip(tmp_path / "CC08.zip"))
+    assert len(case_archive._CACHE) == 1
+    assert held.read_text("timeline/01_filing.txt") == "Filed"
+    del held
+    gc.collect()
@@ -0,0 +1,109 @@
+import asyncio
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from capstone.compression import CompressionMiddleware, negotiate_encoding
+
+BIG = {"events": ["the same timeline text"] * 200}
+
+
+@pytest.mark.parametrize("header, supported, expected", [
+    ("gzip", ("gzip",), "gzip"),
+    ("gzip;q=0", ("gzip",), None),
+    ("*", ("gzip",), "gzip"),
+    ("gzip;q=0, *", ("gzip",), None),
+    ("identity", ("gzip",), None),
+    ("zstd;q=0.5, gzip;q=0.8", ("zstd", "gzip"), "gzip"),
+    ("gzip, zstd", ("zstd", "gzip"), "zstd"),
+    ("gzip;q=bogus", ("gzip",), None),
+])
+def test_negotiate_encoding(header, supported, expected):
+    assert negotiate_encoding(header, supported) == expected
+
+
+def _stream():
+    for i in range(3):
+        yield f"chunk {i}\n".encode()
+
+
+app = Starlette(routes=[
+    Route("/big", lambda request: JSONResponse(BIG)),
+    Route("/small", lambda request: JSONResponse({"ok": True})),
+    Route("/stream", lambda request: StreamingResponse(_stream(), media_type="application/x-ndjson")),
+    Route("/encoded", lambda request: Response(
+        zlib.compress(b"x" * 4096), media_type="application/json", headers={"Content-Encoding": "deflate"},
+    )),
+])
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+client = TestClient(app)
+
+
+def test_large_body_is_compressed_with_vary():
+    r = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert int(r.headers["content-length"]) < len(r.content)
+    assert r.json() == BIG
+
+
+def test_refused_or_absent_encoding_is_identity():
+    for accept in ("gzip;q=0", "identity"):
+        r = client.get("/big", headers={"Accept-Encoding": accept})
+        assert "content-encoding" not in r.headers
+        assert r.json() == BIG
+
+
+def test_body_under_threshold_is_sent_as_is():
+    r = client.get("/small", headers={"Accept-Encoding": "*"})
+    assert "content-encoding" not in r.headers
+    assert r.json() == {"ok": True}
+
+
+def test_already_encoded_response_is_untouched():
+    r = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "deflate"
+
+
+def test_streamed_body_is_compressed_chunk_by_chunk():
+    sent = []
+
+    async def receive():
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream", "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")], "root_path": "", "scheme": "http",
+        "server": ("testserver", 80), "client": ("testclient", 1), "http_version": "1.1",
+    }
+    asyncio.run(CompressionMiddleware(app.router, minimum_size=1024)(scope, receive, send))
+
+    start, *bodies = sent
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+    decoder = zlib.decompressobj(31)
+    decoded = [decoder.decompress(m["body"]) for m in bodies]
+    # Each chunk decodes as soon as it arrives.
+    assert decoded[:3] == [b"chunk 0\n", b"chunk 1\n", b"chunk 2\n"]
+    assert not bodies[-1].get("more_body") and decoder.eof
+
+
+def test_not_modified_analysis(api_client):
+    first = api_client.get("/v1/cases/CC02/analysis", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers["vary"] == "Accept-Encoding"
+
+    again = api_client.get(
+        "/v1/cases/CC02/analysis",
+        headers={"Accept-Encoding": "gzip", "If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert again.status_code == 304
+    assert again.content == b"" and "content-encoding" not in again.headers
+    assert again.headers["last-modified"] == first.headers["last-modified"]
@@ -0,0 +1,118 @@
+import re
+from datetime import date
+
+import pytest
+
+from capstone.event_store import CrossCaseEventStore, event_category
+
+CASES = {
+    "RH01": [
+        {"id": "timeline/01_incident_occurs.txt", "date": "01_incident_occurs", "event": "Spill on 2023-03-04"},
+        {"id": "timeline/02_initial_filing.txt", "date": "02_initial_filing", "event": "Filed 2023-04-01"},
+        {"id": "timeline/03_notes.txt", "date": "03_notes", "event": "no date here"},
+    ],
+    "RH02": [
+        {"id": "timeline/01_incident_occurs.txt", "date": "01_incident_occurs", "event": "Fall on 2023-03-04"},
+        {"id": "emails/a.eml", "date": "2023-03-20T09:00:00", "event": "Re: claim",
+         "title": "Re: claim", "category": "email"},
+    ],
+    "CC07": [
+        {"id": "timeline/01_incident_occurs.txt", "date": "01_incident_occurs", "event": "Breach 2023-02-28"},
+        {"id": "timeline/02_initial_filing.txt", "date": "2023-03-15_initial_filing", "event": "Filed"},
+    ],
+}
+
+
+def _expected_date(ev):
+    texts = [ev["date"]] if "category" in ev else [ev["event"], ev["date"]]
+    for text in texts:
+        m = re.search(r"(?<!\d)(\d{4}-\d{2}-\d{2})(?!\d)", text)
+        if m:
+            return m.group(1)
+    return None
+
+
+def _reference(start=None, end=None, case_prefix=None, categories=None, title_contains=None):
+    """Plain-Python filter and sort over CASES."""
+    rows = []
+    for case_id, events in CASES.items():
+        for ev in events:
+            row = {
+                "case_id": case_id,
+                "category": ev.get("category") or event_category(ev["date"]),
+                "title": ev.get("title", ev["date"]),
+                "date": _expected_date(ev),
+                "event": ev["event"],
+                "id": ev["id"],
+            }
+            d = date.fromisoformat(row["date"]) if row["date"] else None
+            if start and (d is None or d < start):
+                continue
+            if end and (d is None or d > end):
+                continue
+            if case_prefix and not case_id.startswith(case_prefix):
+                continue
+            if categories and row["category"] not in categories:
+                continue
+            if title_contains and title_contains.lower() not in row["title"].lower():
+                continue
+            rows.append(row)
+    rows.sort(key=lambda r: (r["date"] is None, r["date"] or "", r["case_id"], r["id"]))
+    return rows
+
+
+def _store(versions, calls=None, clock=lambda: 0.0, max_staleness=0.0):
+    def load_case(case_id):
+        if calls is not None:
+            calls.append(case_id)
+        return versions[case_id], CASES[case_id]
+    return CrossCaseEventStore(lambda: sorted(CASES), load_case, max_staleness=max_staleness, clock=clock)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"start": date(2023, 3, 1), "end": date(2023, 3, 31)},
+    {"case_prefix": "RH"},
+    {"categories": ["incident_occurs"]},
+    {"categories": ["email", "initial_filing"], "case_prefix": "RH"},
+    {"title_contains": "FILING"},
+    {"start": date(2023, 3, 4), "end": date(2023, 3, 4), "case_prefix": "RH"},
+    {"case_prefix": "XX"},
+])
+def test_query_matches_plain_filter(filters):
+    store = _store({case_id: 1 for case_id in CASES})
+    result = store.query(**filters, limit=100)
+
+    expected = _reference(**filters)
+    assert result["events"] == expected
+    assert result["total"] == len(expected) and result["next_offset"] is None
+
+
+def test_query_pages_in_order():
+    store = _store({case_id: 1 for case_id in CASES})
+    first = store.query(limit=3)
+    second = store.query(offset=first["next_offset"], limit=100)
+    assert first["events"] + second["events"] == _reference()
+
+
+def test_rebuilds_only_when_a_version_changes():
+    versions = {case_id: 1 for case_id in CASES}
+    now = [0.0]
+    calls = []
+    store = _store(versions, calls, clock=lambda: now[0], max_staleness=2.0)
+
+    cols = store.columns()
+    assert store.columns() is cols and len(calls) == len(CASES)  # within max_staleness: no reload
+
+    now[0] = 5.0
+    assert store.columns() is cols  # reloaded, same versions: no rebuild
+
+    versions["RH02"] = 2
+    CASES["RH02"].append({"id": "timeline/09_settlement.txt", "date": "09_settlement", "event": "2023-05-01"})
+    try:
+        now[0] = 10.0
+        rebuilt = store.columns()
+        assert rebuilt is not cols and rebuilt.versions["RH02"] == 2
+        assert store.query(categories=["settlement"])["events"][0]["date"] == "2023-05-01"
+    finally:
+        CASES["RH02"].pop()
@@ -0,0 +1,58 @@
+from collections import Counter
+
+from capstone.agents.evidence_agent import EvidenceAgent
+from capstone.agents.memory import Memory
+
+
+def _records(*categories):
+    return [{"id": f"{cat}/{i}", "category": cat} for i, cat in enumerate(categories)]
+
+
+def _from_scratch(records):
+    """(summary, counts) of a fresh agent counting `records` in one pass."""
+    agent = EvidenceAgent(Memory())
+    return agent.summarize("CC01", records), dict(Counter(r["category"] for r in records))
+
+
+def test_add_remove_and_delta_match_a_recount():
+    agent = EvidenceAgent(Memory())
+    initial = _records("emails", "emails", "pleadings", "timeline")
+    agent.summarize("CC01", iter(initial))
+
+    added = _records("emails", "notes")
+    assert agent.add_records("CC01", added) == 2
+    assert agent.remove_records("CC01", initial[:1]) == 1
+    current = initial[1:] + added
+    summary, counts = _from_scratch(current)
+    assert agent.counts("CC01") == counts
+    assert agent.summarize("CC01") == summary
+
+    delta_added, delta_removed = _records("exhibits"), [initial[2], added[1]]
+    summary = agent.apply_delta("CC01", added=delta_added, removed=delta_removed)
+    current = [r for r in current if r not in delta_removed] + delta_added
+    expected_summary, expected_counts = _from_scratch(current)
+    assert agent.counts("CC01") == expected_counts
+    assert summary == expected_summary
+    assert "pleadings" not in agent.counts("CC01")
+
+
+def test_removing_uncounted_records_is_ignored():
+    agent = EvidenceAgent(Memory())
+    agent.summarize("CC01", _records("emails"))
+
+    assert agent.remove_records("CC01", _records("pleadings", "emails", "emails")) == 1
+    assert agent.counts("CC01") == {}
+    assert "Total records: 0" in agent.summarize("CC01")
+
+
+def test_counters_are_kept_per_case():
+    memory = Memory()
+    agent = EvidenceAgent(memory)
+    agent.summarize("CC01", _records("emails", "emails"))
+    agent.summarize("CC02", _records("pleadings"))
+    agent.apply_delta("CC02", added=_records("emails"), removed=_records("pleadings"))
+
+    assert agent.counts("CC01") == {"emails": 2}
+    assert agent.counts("CC02") == {"emails": 1}
+    # The counters live in Memory, so another agent on the same Memory sees them.
+    assert EvidenceAgent(memory).counts("CC01") == {"emails": 2}
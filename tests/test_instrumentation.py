@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from capstone.instrumentation import SpanRecorder, StageHistograms, _profile_dir
+
+
+def _spans(*records):
+    return [dict(stage=s, depth=d, duration_ms=ms, cache=None) for s, d, ms in records]
+
+
+def test_span_recorder_marks_depth():
+    spans = SpanRecorder()
+    with spans.span("session"):
+        with spans.span("load_evidence"):
+            pass
+        with spans.span("agent_pipeline"):
+            pass
+    with spans.span("qa"):
+        pass
+
+    assert [(s["stage"], s["depth"]) for s in spans.spans] == [
+        ("load_evidence", 1), ("agent_pipeline", 1), ("session", 0), ("qa", 0),
+    ]
+
+
+def test_observe_spans_subtracts_nested_time():
+    metrics = StageHistograms()
+    metrics.observe_spans(_spans(
+        ("load_evidence", 1, 30.0),
+        ("agent_pipeline", 1, 50.0),
+        ("session", 0, 100.0),
+        ("qa", 0, 10.0),
+    ))
+
+    sums = {stage: h["sum"] for stage, h in metrics._hist.items()}
+    assert sums["session"] == 0.02
+    assert sums["load_evidence"] == 0.03
+    assert sums["qa"] == 0.01
+    assert abs(sum(sums.values()) - 0.11) < 1e-9
+
+
+def test_observe_spans_keeps_siblings_separate():
+    metrics = StageHistograms()
+    metrics.observe_spans(_spans(
+        ("inner", 2, 5.0),
+        ("middle", 1, 20.0),
+        ("session", 0, 40.0),
+        ("middle", 1, 7.0),
+        ("session", 0, 10.0),
+    ))
+
+    sums = {stage: round(h["sum"], 6) for stage, h in metrics._hist.items()}
+    assert sums == {"inner": 0.005, "middle": 0.022, "session": 0.023}
+
+
+def test_profile_dir_is_anchored_at_the_repo_root(monkeypatch, tmp_path):
+    monkeypatch.delenv("LEXFABRIC_PROFILE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+    assert _profile_dir() == Path(__file__).resolve().parents[1] / ".profiles"
+
+    monkeypatch.setenv("LEXFABRIC_PROFILE_DIR", str(tmp_path / "dumps"))
+    assert _profile_dir() == tmp_path / "dumps"
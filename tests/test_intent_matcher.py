@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from capstone.agents.qa_agent import INTENTS, IntentMatcher
+
+
+def _if_chain(question):
+    """The substring if-chain QnAAgent dispatched with before IntentMatcher."""
+    q_lower = (question or "").lower().strip()
+    if "earliest event" in q_lower:
+        return "earliest_event"
+    if "emails contradict" in q_lower or "contradict the initial filing" in q_lower:
+        return "contradictions"
+    if "between the first email and the filing" in q_lower:
+        return "actor_between_email_and_filing"
+    if "incomplete dates" in q_lower or "uncertain ordering" in q_lower:
+        return "missing_info"
+    if "dispute escalation" in q_lower:
+        return "escalation"
+    if "4-sentence overview" in q_lower or "four-sentence overview" in q_lower:
+        return "overview"
+    if "on the date of the initial filing" in q_lower:
+        return "initial_filing_day"
+    if "operations manager" in q_lower:
+        return "operations_manager"
+    if "logical gaps" in q_lower:
+        return "gaps"
+    if "hash of the file" in q_lower or "hash-provenance" in q_lower:
+        return "hash_provenance"
+    return None
+
+
+PHRASES = [phrase for _, phrases in INTENTS for phrase in phrases]
+FILLERS = ["what is the", "show me", "?", "the", "and", "please list", "", " ", "e", "email", "filing"]
+
+
+def _random_question(rng):
+    parts = []
+    for _ in range(rng.randint(0, 4)):
+        piece = rng.choice(PHRASES + FILLERS)
+        if piece in PHRASES and rng.random() < 0.3:
+            # Truncated or fused phrases exercise overlapping matches.
+            piece = piece[:rng.randint(1, len(piece))] if rng.random() < 0.5 else piece.replace(" ", "")
+        if rng.random() < 0.3:
+            piece = piece.upper()
+        parts.append(piece)
+    return rng.choice([" ", "", "-"]).join(parts)
+
+
+@pytest.mark.parametrize("question", [
+    None,
+    "",
+    "What was the EARLIEST EVENT?",
+    "Give me a 4-sentence overview and the logical gaps",
+    "logical gaps before the earliest event",
+    "Do the emails contradict the initial filing?",
+    "What happened on the date of the initial filing, per the operations manager?",
+    "hash-provenance of the file; hash of the file",
+    "contradict the initial filing on the date of the initial filing",
+    "earliest eventlogical gaps",
+])
+def test_matches_the_if_chain_on_known_questions(question):
+    assert IntentMatcher().match(question) == _if_chain(question)
+
+
+def test_matches_the_if_chain_on_generated_questions():
+    rng = random.Random(49)
+    matcher = IntentMatcher()
+    for _ in range(20_000):
+        question = _random_question(rng)
+        assert matcher.match(question) == _if_chain(question), question
@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+
+from capstone.deadline import DeadlineExceeded
+from capstone.jobs import CANCELLED, QUEUED, RUNNING, SUCCEEDED, JobNotFound, JobRunner, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = JobStore(tmp_path / "jobs.sqlite3")
+    yield s
+    s.close()
+
+
+def _wait_for(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.01)
+
+
+def test_submit_deduplicates_active_jobs(store):
+    job, dup = store.submit("CC01", "q", priority=0)
+    again, dup_again = store.submit("CC01", "q", priority=5)
+
+    assert not dup and dup_again
+    assert again["id"] == job["id"] and again["priority"] == 5
+    assert not store.submit("CC01", "other")[1]
+
+
+def test_claim_takes_highest_priority_then_oldest(store):
+    low, _ = store.submit("CC01")
+    first, _ = store.submit("CC02", priority=1)
+    second, _ = store.submit("CC03", priority=1)
+
+    claimed = [store.claim()["id"] for _ in range(3)]
+
+    assert claimed == [first["id"], second["id"], low["id"]]
+    assert store.claim() is None
+    assert store.get(low["id"])["status"] == RUNNING
+
+
+def test_cancel_queued_and_running(store):
+    queued, _ = store.submit("CC01")
+    running, _ = store.submit("CC02", priority=1)
+    store.claim()
+
+    assert store.cancel(queued["id"])["status"] == CANCELLED
+    flagged = store.cancel(running["id"])
+    assert flagged["status"] == RUNNING and flagged["cancel_requested"]
+    assert store.heartbeat([running["id"]]) == [running["id"]]
+    with pytest.raises(JobNotFound):
+        store.cancel("missing")
+
+
+def test_release_requeues_unless_cancel_requested(store):
+    store.submit("CC01")
+    store.submit("CC02")
+    job = store.claim()
+    other = store.claim()
+    store.cancel(other["id"])
+
+    assert store.release(job)
+    assert store.get(job["id"])["status"] == QUEUED
+    assert not store.release(other)
+    assert store.get(other["id"])["status"] == RUNNING
+
+
+def test_finish_ignores_a_stale_claim(store):
+    store.submit("CC01")
+    job = store.claim()
+    assert store.requeue_stale(older_than_s=-1) == 1
+    time.sleep(0.001)
+    reclaimed = store.claim()
+
+    assert reclaimed["id"] == job["id"]
+    assert not store.finish(job, SUCCEEDED, result={"by": "old"})
+    assert store.finish(reclaimed, SUCCEEDED, result={"by": "new"})
+    assert store.result(job["id"]) == {"by": "new"}
+
+
+def test_requeue_stale_keeps_fresh_jobs(store):
+    store.submit("CC01")
+    job = store.claim()
+
+    assert store.requeue_stale(older_than_s=60) == 0
+    assert store.get(job["id"])["status"] == RUNNING
+
+    store.submit("CC02")
+    doomed = store.claim()
+    store.cancel(doomed["id"])
+    assert store.requeue_stale(older_than_s=-1) == 2
+
+    assert store.get(job["id"])["status"] == QUEUED
+    cancelled = store.get(doomed["id"])
+    assert cancelled["status"] == CANCELLED and cancelled["finished_at"] is not None
+    assert store.claim()["id"] == job["id"]
+    assert store.claim() is None
+
+
+def test_runner_stop_requeues_running_job(store):
+    started = threading.Event()
+
+    def run(job, deadline):
+        started.set()
+        while True:
+            deadline.check("agent_pipeline")
+            time.sleep(0.01)
+
+    job, _ = store.submit("CC01")
+    runner = JobRunner(store, run, workers=1, poll_interval=0.05)
+    runner.start()
+    assert started.wait(5)
+    runner.stop(timeout=5)
+
+    assert store.get(job["id"])["status"] == QUEUED
+
+
+def test_runner_applies_cancel_request(store):
+    started = threading.Event()
+
+    def run(job, deadline):
+        started.set()
+        while True:
+            deadline.check("agent_pipeline")
+            time.sleep(0.01)
+
+    job, _ = store.submit("CC01")
+    runner = JobRunner(store, run, workers=1, poll_interval=0.05)
+    runner.start()
+    try:
+        assert started.wait(5)
+        store.cancel(job["id"])
+        _wait_for(lambda: store.get(job["id"])["status"] == CANCELLED)
+    finally:
+        runner.stop(timeout=5)
+    assert DeadlineExceeded.__name__ in store.get(job["id"])["error"]
@@ -0,0 +1,71 @@
+import importlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Worker processes are spawned and re-import the script by module name.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+lvt = importlib.import_module("local_video_transcribe")
+
+RATE = lvt.SAMPLE_RATE
+
+
+def _pcm(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * 32767 * np.sin(2 * np.pi * 440 * t)).astype(np.int16).tobytes()
+
+
+def _blocks(pcm, size):
+    return [pcm[i:i + size] for i in range(0, len(pcm), size)]
+
+
+def test_iter_chunks_offsets_and_last_flag():
+    pcm = _pcm(10)
+    chunks = list(lvt.iter_chunks(_blocks(pcm, 4096), chunk_seconds=4, overlap_seconds=1))
+
+    assert [(i, off, last) for i, off, _, last in chunks] == [(0, 0.0, False), (1, 3.0, False), (2, 6.0, True)]
+    step = 3 * RATE * lvt.BYTES_PER_SAMPLE
+    for index, _, data, _ in chunks:
+        assert data == pcm[index * step:index * step + 4 * RATE * lvt.BYTES_PER_SAMPLE]
+
+
+def test_iter_chunks_independent_of_block_size():
+    pcm = _pcm(7.3)
+    a = list(lvt.iter_chunks(_blocks(pcm, 1000), 2, 0.5))
+    b = list(lvt.iter_chunks([pcm], 2, 0.5))
+
+    assert a == b
+    assert a[-1][3] and not any(last for *_, last in a[:-1])
+
+
+def test_iter_chunks_rejects_overlap_not_shorter_than_chunk():
+    with pytest.raises(ValueError):
+        list(lvt.iter_chunks([_pcm(1)], 2, 2))
+
+
+def _transcript(pcm, workers):
+    chunks = lvt.iter_chunks(_blocks(pcm, 4096), chunk_seconds=4, overlap_seconds=1)
+    results = lvt.transcribe_chunks(chunks, "stub", "", "en", workers)
+    return list(lvt.stitch(results, chunk_seconds=4, overlap_seconds=1))
+
+
+def test_stub_transcript_is_ordered_and_covers_the_audio():
+    segments = _transcript(_pcm(10), workers=1)
+
+    assert segments[0]["start"] == 0.0
+    assert segments[-1]["end"] == 10.0
+    for prev, seg in zip(segments, segments[1:]):
+        assert prev["end"] <= seg["start"] <= seg["end"]
+    assert all(seg["text"].startswith("[speech") for seg in segments)
+
+
+def test_stub_transcript_skips_silence():
+    assert _transcript(_pcm(6, amplitude=0.0), workers=1) == []
+
+
+def test_process_pool_matches_in_process():
+    pcm = _pcm(10)
+
+    assert _transcript(pcm, workers=2) == _transcript(pcm, workers=1)
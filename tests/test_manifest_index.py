@@ -0,0 +1,128 @@
+import json
+import os
+
+import pytest
+
+from capstone.manifest_index import (
+    ManifestIndex,
+    ManifestIndexError,
+    build_manifest_index,
+    iter_manifest_records,
+    open_manifest_index,
+)
+
+RECORDS = [
+    {"case_id": "CC01", "relative_path": "CC01/docs/a.pdf", "category": "docs", "title": "a", "ext": ".pdf", "size_bytes": 10},
+    {"case_id": "CC02", "relative_path": "CC02/b.txt", "category": "uncategorized", "title": "b", "ext": ".txt", "size_bytes": 3},
+    {"case_id": "CC01", "relative_path": "CC01/mail/x/c.eml", "category": "mail", "title": "c", "ext": ".eml", "size_bytes": 7},
+]
+
+
+@pytest.fixture
+def root(tmp_path):
+    with (tmp_path / "manifest.jsonl").open("w", encoding="utf-8") as f:
+        for rec in RECORDS:
+            f.write(json.dumps(rec) + "\n")
+    for rec in RECORDS:
+        (tmp_path / rec["relative_path"]).parent.mkdir(parents=True, exist_ok=True)
+    return tmp_path
+
+
+def test_reader_handles_jsonl_and_legacy_json(root):
+    assert list(iter_manifest_records(root / "manifest.jsonl")) == RECORDS
+    (root / "manifest.json").write_text(json.dumps(RECORDS), encoding="utf-8")
+    assert list(iter_manifest_records(root / "manifest.json")) == RECORDS
+
+
+def test_round_trip(root):
+    index = open_manifest_index(root)
+    try:
+        assert index.case_ids() == ["CC01", "CC02"]
+        assert index.record_count("CC01") == 2
+        assert index.case_dirs("CC01") == ["CC01", "CC01/docs", "CC01/mail", "CC01/mail/x"]
+        records = index.records_for("CC01", root, check_stale=False)
+        assert [(r["id"], r["category"], r["title"], r["ext"]) for r in records] == [
+            ("docs/a.pdf", "docs", "a", ".pdf"),
+            ("mail/x/c.eml", "mail", "c", ".eml"),
+        ]
+        assert index.records_for("CC03", root) is None
+    finally:
+        index.close()
+
+
+def test_directory_change_makes_case_stale(root):
+    index = open_manifest_index(root)
+    try:
+        assert index.records_for("CC02", root) is not None
+        (root / "CC02" / "new.txt").write_text("x")
+        assert index.is_stale("CC02", root)
+        assert index.records_for("CC02", root) is None
+    finally:
+        index.close()
+
+
+@pytest.mark.parametrize("keep", [0, 10, 30])
+def test_truncated_index_is_rejected(root, keep):
+    path = build_manifest_index(root / "manifest.jsonl", root / "manifest.idx")
+    path.write_bytes(path.read_bytes()[:keep])
+    with pytest.raises(ManifestIndexError):
+        ManifestIndex(path)
+
+
+def test_closed_index_falls_back(root):
+    index = open_manifest_index(root)
+    index.close()
+    assert index.records_for("CC01", root, check_stale=False) is None
+    assert index.case_dirs("CC01") == []
+    assert index.is_stale("CC01", root)
+
+
+def test_shared_index_skips_a_pruned_generation(root, monkeypatch):
+    from capstone import manifest_index
+    from capstone.manifest_index import SharedManifestIndex
+
+    publisher = SharedManifestIndex(root, keep=1)
+    reader = SharedManifestIndex(root, keep=1)
+    assert publisher.current().case_ids() == ["CC01", "CC02"]
+    assert reader.current().case_ids() == ["CC01", "CC02"]
+
+    # While the reader opens generation 2, the publisher moves on to 3 and
+    # (keep=1) prunes 2; the reader must retry with the new counter.
+    real = manifest_index.ManifestIndex
+    manifest = root / "manifest.jsonl"
+    calls = []
+
+    def bump_manifest():
+        mtime = manifest.stat().st_mtime_ns + 1_000_000_000
+        os.utime(manifest, ns=(mtime, mtime))
+
+    def racing_open(path):
+        calls.append(path.name)
+        if len(calls) == 1:
+            bump_manifest()
+            publisher.publish(blocking=True)
+        return real(path)
+
+    bump_manifest()
+    publisher.publish(blocking=True)
+    monkeypatch.setattr(manifest_index, "ManifestIndex", racing_open)
+    index = reader.current(rebuild=False)
+    assert reader._generation == publisher.generation == 3
+    assert calls[0] == "manifest.idx.2" and calls[-1] == "manifest.idx.3"
+    assert not (root / "manifest.idx.2").exists()
+    assert index.case_ids() == ["CC01", "CC02"]
+    reader.close()
+    publisher.close()
+
+
+def test_shared_index_rate_limits_the_manifest_check(root, monkeypatch):
+    from capstone.manifest_index import SharedManifestIndex
+
+    shared = SharedManifestIndex(root, check_interval=3600)
+    first = shared.current()
+    checks = []
+    monkeypatch.setattr(shared, "_needs_publish", lambda: checks.append(1) or False)
+    for _ in range(5):
+        assert shared.current() is first
+    assert checks == []
+    shared.close()
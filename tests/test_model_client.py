@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from capstone.agents.model_client import ModelBackend, ModelClient, ResponseCache, StubBackend, stub_output
+
+
+def test_backend_must_implement_generate():
+    class Incomplete(ModelBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_identical_prompts_are_coalesced_and_cached(tmp_path):
+    async def scenario():
+        backend = StubBackend()
+        client = ModelClient(backend, cache=ResponseCache(directory=tmp_path))
+        outputs = await client.complete_many(["Summarize A", "Summarize A", "Summarize B"])
+        assert outputs == [stub_output("Summarize A")] * 2 + [stub_output("Summarize B")]
+        assert backend.calls == 1 and client.stats["coalesced"] == 1
+
+        # A fresh client over the same directory answers from disk.
+        fresh = ModelClient(StubBackend(), cache=ResponseCache(directory=tmp_path))
+        assert await fresh.complete("Summarize B") == stub_output("Summarize B")
+        assert fresh.backend.calls == 0 and fresh.stats["cache_hits"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+
+from capstone.agents.router import RouterAgent
+
+EVIDENCE = [{"id": "a.txt", "category": "pleadings", "title": "a", "path": "/c/a.txt"}]
+TIMELINE = [{"title": "filing", "timestamp": "2023-04-02", "source_path": "/c/timeline/filing.txt"}]
+
+
+class SlowAgent:
+    """Thread-backed agent that writes to Memory after `delay` seconds."""
+
+    def __init__(self, memory, delay=0.0, fail=False):
+        self.memory = memory
+        self.delay = delay
+        self.fail = fail
+
+    def summarize(self, case_id, events):
+        time.sleep(self.delay)
+        self.memory.set("timeline_summary", f"late summary for {case_id}")
+        self.memory.add_message("slow agent finished")
+        if self.fail:
+            raise RuntimeError("boom")
+        return "slow summary"
+
+
+def test_all_agents_ok_merge_and_record_timings():
+    router = RouterAgent()
+    results = asyncio.run(router.arun_case_pipeline("CC01", EVIDENCE, TIMELINE, timeout=5))
+
+    assert results["evidence"] and results["timeline"]
+    assert router.memory.get("timeline_summary")
+    timings = router.memory.get("agent_timings")
+    assert {name: t["status"] for name, t in timings.items()} == {"evidence": "ok", "timeline": "ok"}
+    assert all(t["seconds"] >= 0 for t in timings.values())
+    assert router.case_state("CC01")["timeline"] == TIMELINE
+
+
+def test_timed_out_thread_never_writes_shared_memory():
+    router = RouterAgent()
+    router.timeline_agent = SlowAgent(router.memory, delay=0.3)
+    messages_before = router.memory.history()
+
+    results = asyncio.run(router.arun_case_pipeline("CC01", EVIDENCE, TIMELINE, timeouts={"timeline": 0.05}))
+    time.sleep(0.5)  # let the abandoned thread finish its writes
+
+    assert results["timeline"] is None and results["evidence"]
+    timings = router.memory.get("agent_timings")
+    assert timings["timeline"]["status"] == "timeout"
+    assert timings["timeline"]["seconds"] < 0.3
+    assert timings["evidence"]["status"] == "ok"
+    assert router.memory.get("timeline_summary") is None
+    assert "slow agent finished" not in router.memory.history()
+    assert router.memory.get("evidence_summary")
+    assert len(router.memory.history()) > len(messages_before)
+
+
+def test_failed_agent_is_not_merged_and_error_is_raised():
+    router = RouterAgent()
+    router.timeline_agent = SlowAgent(router.memory, fail=True)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(router.arun_case_pipeline("CC01", EVIDENCE, TIMELINE, timeout=5))
+
+    assert router.memory.get("agent_timings")["timeline"]["status"] == "error"
+    assert router.memory.get("timeline_summary") is None
+    assert router.memory.get("evidence_summary")
+    assert router.case_state("CC01") is None
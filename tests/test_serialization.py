@@ -0,0 +1,99 @@
+import base64
+
+import pytest
+
+from capstone.serialization import (
+    CursorError,
+    StaleCursorError,
+    decode_cursor,
+    encode_cursor,
+    paginate_timeline,
+    parse_fields,
+)
+
+EVENTS = [{"date": f"2023-01-{i:02d}", "event": f"event {i}", "thread_id": "t1"} for i in range(1, 8)]
+
+
+def test_pages_round_trip():
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate_timeline(EVENTS, version=3, limit=3, cursor=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [ev for p in pages for ev in p] == EVENTS
+    assert decode_cursor(encode_cursor(3, 6)) == (3, 6)
+    assert decode_cursor(encode_cursor(None, 2)) == (None, 2)
+
+
+def test_without_limit_returns_everything_without_cursor():
+    page, cursor = paginate_timeline(EVENTS, version=1)
+    assert page == EVENTS and cursor is None
+
+
+def test_cursor_from_older_version_is_stale():
+    _, cursor = paginate_timeline(EVENTS, version=3, limit=2)
+    with pytest.raises(StaleCursorError):
+        paginate_timeline(EVENTS, version=4, limit=2, cursor=cursor)
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",
+    "bm90LWEtY3Vyc29y",                                     # "not-a-cursor"
+    base64.urlsafe_b64encode(b"3:-1").decode().rstrip("="),  # negative offset
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+])
+def test_malformed_cursors(cursor):
+    with pytest.raises(CursorError) as exc:
+        decode_cursor(cursor)
+    assert not isinstance(exc.value, StaleCursorError)
+
+
+def test_field_selection():
+    assert parse_fields(None) is None
+    assert parse_fields(" , ") is None
+    assert parse_fields("date, event") == ["date", "event"]
+    page, _ = paginate_timeline(EVENTS[:2], fields=["date", "message_id"])
+    assert page == [{"date": "2023-01-01"}, {"date": "2023-01-02"}]
+    with pytest.raises(CursorError, match="bogus"):
+        parse_fields("date,bogus")
+
+
+@pytest.fixture
+def client(api_client, evidence_root):
+    for i in range(2, 7):
+        (evidence_root / "CC02" / "timeline" / f"0{i}_event_{i}.txt").write_text(f"event {i}")
+    return api_client
+
+
+def test_analyze_response_validates_and_pages(client):
+    from src.api import AnalysisResponse
+
+    seen, cursor = [], None
+    while True:
+        url = "/v1/agent/analyze?limit=4" + (f"&cursor={cursor}" if cursor else "")
+        r = client.post(url, json={"case_id": "CC02", "query": "What is the earliest event?"})
+        assert r.status_code == 200
+        body = AnalysisResponse.model_validate(r.json())
+        # Nothing the model would drop or coerce: the unchecked fast path sends the same shape.
+        assert body.model_dump(mode="json", exclude_unset=True) == r.json()
+        assert body.timeline_total == 6
+        seen += r.json()["timeline"]
+        cursor = body.next_cursor
+        if cursor is None:
+            break
+    assert [ev["event"] for ev in seen] == ["sample timeline file"] + [f"event {i}" for i in range(2, 7)]
+
+
+def test_analyze_rejects_bad_fields_and_stale_cursor(client):
+    r = client.post("/v1/agent/analyze?fields=date,bogus", json={"case_id": "CC02"})
+    assert r.status_code == 400
+
+    stale = encode_cursor(999, 2)
+    r = client.post(f"/v1/agent/analyze?limit=2&cursor={stale}", json={"case_id": "CC02"})
+    assert r.status_code == 409
+
+    r = client.post("/v1/agent/analyze?fields=date", json={"case_id": "CC02"})
+    assert all(set(ev) == {"date"} for ev in r.json()["timeline"])
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from capstone import demo
+
+
+@pytest.fixture
+def root(evidence_root):
+    if demo.SESSION_POOL is None or not demo.HAS_QA:
+        pytest.skip("agent sessions unavailable")
+    demo.SESSION_POOL.clear()
+    yield evidence_root
+    demo.SESSION_POOL.clear()
+
+
+def _bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+def test_new_evidence_outside_timeline_rebuilds_the_session(root):
+    demo.analyze_case("CC02")
+    warm = demo.analyze_case("CC02")
+    assert "Reused warm agent session for case CC02" in warm["steps"]
+    before = demo.case_last_modified("CC02")
+
+    (root / "CC02" / "pleadings").mkdir()
+    (root / "CC02" / "pleadings" / "new_motion.txt").write_text("Motion to compel.")
+    _bump_mtime(root / "CC02")
+
+    assert demo.case_last_modified("CC02") > before
+    result = demo.analyze_case("CC02")
+    assert "Case evidence changed; rebuilt agent session" in result["steps"]
+    session = demo.SESSION_POOL.peek("CC02")
+    expected = demo.load_evidence_for_case(demo.CaseChoice(case_id="CC02", path=root / "CC02"))
+    assert len(session.qna.evidence) == len(expected) == 3
+
+    again = demo.analyze_case("CC02")
+    assert "Reused warm agent session for case CC02" in again["steps"]
+    assert not any("rebuilt" in step for step in again["steps"])
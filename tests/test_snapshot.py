@@ -0,0 +1,72 @@
+import pytest
+
+from capstone.agents import Memory, RouterAgent, Snapshot, SnapshotError, load_snapshot, save_snapshot
+
+
+def make_memory(messages=3):
+    memory = Memory()
+    memory.set("evidence_summary", "3 records")
+    for i in range(messages):
+        memory.add_message(f"message {i}")
+    return memory
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip(tmp_path, compress):
+    path = tmp_path / "agents.snap"
+    cases = {"CC01": {"evidence": [{"id": "a.pdf"}], "timeline": []}, "CC02": {"evidence": [], "timeline": []}}
+    save_snapshot(path, make_memory(), cases, compress=compress)
+
+    with load_snapshot(path) as snap:
+        assert snap.compressed is compress
+        assert snap.memory().get("evidence_summary") == "3 records"
+        assert snap.memory().history() == ["message 0", "message 1", "message 2"]
+        assert sorted(snap.case_ids()) == ["CC01", "CC02"]
+        assert snap.case_state("CC01") == cases["CC01"]
+        assert snap.case_state("CC03") is None
+
+
+def test_messages_are_capped(tmp_path):
+    path = save_snapshot(tmp_path / "agents.snap", make_memory(10), max_messages=4)
+    with load_snapshot(path) as snap:
+        assert snap.memory().history() == ["message 6", "message 7", "message 8", "message 9"]
+
+
+@pytest.mark.parametrize("keep", [0, 3, 20])
+def test_truncated_file_is_rejected(tmp_path, keep):
+    path = save_snapshot(tmp_path / "agents.snap", make_memory(), {"CC01": {"evidence": [], "timeline": []}})
+    path.write_bytes(path.read_bytes()[:keep])
+    with pytest.raises(SnapshotError):
+        Snapshot(path)
+
+
+def test_truncated_payload_is_rejected(tmp_path):
+    path = save_snapshot(tmp_path / "agents.snap", make_memory(), {"CC01": {"evidence": [], "timeline": []}})
+    path.write_bytes(path.read_bytes()[:-5])
+    with pytest.raises(SnapshotError):
+        Snapshot(path)
+
+
+def test_corrupt_section_fails_its_checksum(tmp_path):
+    path = save_snapshot(tmp_path / "agents.snap", make_memory(), {"CC01": {"evidence": [], "timeline": []}})
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with load_snapshot(path) as snap:
+        snap.memory()
+        with pytest.raises(SnapshotError, match="Checksum"):
+            snap.case_state("CC01")
+
+
+def test_router_state_is_stale_when_the_case_changed(tmp_path):
+    path = tmp_path / "agents.snap"
+    router = RouterAgent()
+    router.run_case_pipeline("CC01", [{"id": "a.pdf", "category": "docs", "title": "A"}], [], source_mtime_ns=100)
+    router.save_snapshot(path)
+
+    restored = RouterAgent.from_snapshot(path)
+    try:
+        assert restored.case_state("CC01", source_mtime_ns=100) is not None
+        assert restored.case_state("CC01", source_mtime_ns=200) is None
+    finally:
+        restored.close()
@@ -0,0 +1,71 @@
+import datetime
+import random
+
+import pytest
+
+from capstone.agents.memory import Memory
+from capstone.agents.timeline_agent import TimelineAgent
+
+
+def _sorted_preview(events, k):
+    """Reference: full stable sort, dated first by date, then slice."""
+    def key(ev):
+        ts = ev.get("timestamp") or ev.get("date")
+        if ts is None:
+            return (1, "")
+        return (0, ts.isoformat() if hasattr(ts, "isoformat") else str(ts))
+    return sorted(events, key=key)[:k]
+
+
+def _events(seed, n=200):
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.3:
+            ev = {"title": f"undated {i}", "timestamp": None}
+        elif roll < 0.4:
+            ev = {"title": f"date key {i}", "date": datetime.date(2023, 1, rng.randint(1, 5))}
+        else:
+            # Few distinct days, so many events tie on the date.
+            ev = {"title": f"event {i}", "timestamp": f"2023-01-0{rng.randint(1, 5)}"}
+        events.append(ev)
+    return events
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [0, 1, 5, 50, 500])
+def test_preview_matches_sort_then_slice(seed, k):
+    events = _events(seed)
+    agent = TimelineAgent(Memory())
+    agent.summarize("CC01", iter(events), k=k)
+
+    expected = _sorted_preview(events, k)
+    summary = agent.memory.get("timeline_summary")
+    preview_lines = [line for line in summary.splitlines() if line.startswith("  • ")]
+    assert preview_lines == [
+        f"  • {ev.get('timestamp') or ev.get('date') or 'unknown-date'}: {ev['title']}" for ev in expected
+    ]
+
+    dated = [
+        ev["timestamp"] if ev.get("timestamp") else ev["date"].isoformat()
+        for ev in events if ev.get("timestamp") or ev.get("date")
+    ]
+    stats = agent.memory.get("timeline_stats")
+    assert stats == {
+        "case_id": "CC01",
+        "total": len(events),
+        "dated": len(dated),
+        "undated": len(events) - len(dated),
+        "earliest": min(dated),
+        "latest": max(dated),
+    }
+
+
+def test_undated_only_keeps_input_order():
+    events = [{"title": f"e{i}"} for i in range(8)]
+    agent = TimelineAgent(Memory(), preview_size=3)
+    summary = agent.summarize("CC01", events)
+
+    assert "  • unknown-date: e0\n  • unknown-date: e1\n  • unknown-date: e2" in summary
+    assert agent.memory.get("timeline_stats")["earliest"] is None
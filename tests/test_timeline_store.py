@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from capstone.timeline_store import TimelineStore
+
+
+def write_event(case_path, name, text, mtime_ns=None):
+    path = case_path / "timeline" / f"{name}.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+@pytest.fixture
+def case(tmp_path):
+    case_path = tmp_path / "CC01"
+    write_event(case_path, "01_filing", "Filed", 1_000)
+    write_event(case_path, "02_hearing", "Hearing", 1_000)
+    return case_path
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TimelineStore(tmp_path / "store", include_emails=False, rescan_interval=0)
+
+
+def test_first_build_is_not_recorded_as_a_change(store, case):
+    timeline = store.refresh("CC01", case)
+    assert timeline.version == 1
+    assert timeline.changes == []
+    diff = timeline.diff(0)
+    assert diff["reset"] is True
+    assert [ev["id"] for ev in diff["added"]] == ["timeline/01_filing.txt", "timeline/02_hearing.txt"]
+
+
+def test_diff_window_edges(store, case):
+    store.refresh("CC01", case)                               # v1, not recorded
+    write_event(case, "03_ruling", "Ruling", 2_000)
+    store.refresh("CC01", case)                               # v2
+    (case / "timeline" / "01_filing.txt").unlink()
+    timeline = store.refresh("CC01", case)                    # v3
+
+    assert timeline.version == 3
+    assert timeline.diff(3) == {"from_version": 3, "to_version": 3, "reset": False, "added": [], "removed": []}
+    assert timeline.diff(2)["removed"] == ["timeline/01_filing.txt"]
+    assert timeline.diff(2)["added"] == []
+    since_1 = timeline.diff(1)
+    assert since_1["reset"] is False
+    assert [ev["id"] for ev in since_1["added"]] == ["timeline/03_ruling.txt"]
+    assert since_1["removed"] == ["timeline/01_filing.txt"]
+    # Older than the history, or from the future: full reset.
+    assert timeline.diff(0)["reset"] is True
+    assert timeline.diff(4)["reset"] is True
+
+
+def test_history_is_trimmed(tmp_path, case):
+    store = TimelineStore(tmp_path / "store", max_history=2, include_emails=False, rescan_interval=0)
+    store.refresh("CC01", case)
+    for i in range(4):
+        write_event(case, "02_hearing", f"Hearing {i}", 2_000 + i)
+        timeline = store.refresh("CC01", case)
+    assert [c["version"] for c in timeline.changes] == [4, 5]
+    assert timeline.diff(3)["reset"] is False
+    assert timeline.diff(2)["reset"] is True
+
+
+def test_refresh_does_not_modify_returned_timeline(store, case):
+    first = store.refresh("CC01", case)
+    sources = dict(first.sources)
+    write_event(case, "03_ruling", "Ruling", 2_000)
+    second = store.refresh("CC01", case)
+    assert second is not first
+    assert first.version == 1 and first.sources == sources
+    assert second.version == 2 and "timeline/03_ruling.txt" in second.sources
+    # Nothing changed: the cached object is returned as is.
+    assert store.refresh("CC01", case) is second
+
+
+def test_state_is_shared_through_disk(tmp_path, case):
+    a = TimelineStore(tmp_path / "store", include_emails=False, rescan_interval=0)
+    b = TimelineStore(tmp_path / "store", include_emails=False, rescan_interval=0)
+    a.refresh("CC01", case)
+    write_event(case, "03_ruling", "Ruling", 2_000)
+    assert b.refresh("CC01", case).version == 2
+    assert a.load("CC01").version == 2
+
+
+def test_unchanged_directories_skip_the_scan(tmp_path, case):
+    store = TimelineStore(tmp_path / "store", include_emails=False, rescan_interval=3600)
+    first = store.refresh("CC01", case)
+    # Edited in place: the directory mtime does not move, so no rescan yet.
+    write_event(case, "01_filing", "Filed again", 2_000)
+    assert store.refresh("CC01", case) is first
+    # A new file bumps the directory mtime and triggers a full scan.
+    write_event(case, "03_ruling", "Ruling", 3_000)
+    os.utime(case / "timeline", ns=(4_000, 4_000))
+    second = store.refresh("CC01", case)
+    assert second.version == 2
+    assert {ev["id"] for ev in second.diff(1)["added"]} == {"timeline/01_filing.txt", "timeline/03_ruling.txt"}
+
+
+def test_last_modified_covers_every_source(store, case):
+    assert store.refresh("CC01", case).last_modified_ns == 1_000
+    write_event(case, "01_filing", "Filed again", 5_000)
+    assert store.refresh("CC01", case).last_modified_ns == 5_000